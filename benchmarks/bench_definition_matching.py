@@ -0,0 +1,131 @@
+import sys
+import json
+import time
+import random
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.taint_definitions.definition_matcher import get_matcher
+
+DATA_TYPES = ['I', 'J', 'Z', 'V', 'Ljava/lang/String;', 'Landroid/content/Intent;', '[B', 'Ljava/lang/Object;']
+
+
+def legacy_detect_source(class_name, method_name, taint_sources):
+    """
+    SourceApiDetector.detect_sources before the matcher was introduced.
+    """
+    candidate_apis = taint_sources.get(class_name)
+    if (candidate_apis is not None and method_name in candidate_apis.keys()):
+        return candidate_apis[method_name]
+    return None
+
+def legacy_detect_sink(class_name, method_name, taint_sinks):
+    """
+    SinkApiDetector.detect_sink_api before the matcher was introduced, without combinations.
+    """
+    if (class_name in taint_sinks.keys()):
+        for sink_method, sink_type in taint_sinks[class_name].items():
+            if (method_name.find(sink_method) > -1):
+                if (sink_type == 'sink'):
+                    return True
+    return False
+
+def detect_source(class_name, method_name, taint_sources):
+    return get_matcher(taint_sources, 'exact').find(class_name, method_name)
+
+def detect_sink(class_name, method_name, taint_sinks):
+    for sink_type in get_matcher(taint_sinks, 'substring').find_all(class_name, method_name):
+        if (sink_type == 'sink'):
+            return True
+    return False
+
+def generate_signature(rand):
+    name = ''.join(rand.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rand.randint(3, 12)))
+    arguments = ''.join(rand.choice(DATA_TYPES[:2] + DATA_TYPES[4:]) for _ in range(rand.randint(0, 4)))
+    return f'{name}({arguments}){rand.choice(DATA_TYPES)}'
+
+def generate_definitions(path, entry_num):
+    """
+    Write SuSi-scale taint definitions with the given number of entries in total.
+    As in SuSi, most classes have a few entries, and some classes have hundreds.
+    """
+    rand = random.Random(0)
+    definitions = {'sources': {}, 'sinks': {}}
+    for kind in definitions.keys():
+        i = 0
+        remaining = entry_num // 2
+        while (remaining > 0):
+            method_num = min(remaining, int(rand.paretovariate(1.0)) * 3)
+            definitions[kind][f'Landroid/{kind}/Api{i};'] = {
+                generate_signature(rand): 'sink' if (kind == 'sinks') else f'SOURCE_{i}' for _ in range(method_num)
+            }
+            remaining -= method_num
+            i += 1
+
+    with open(path, 'w') as f:
+        json.dump(definitions, f)
+
+def generate_invokes(definitions, invoke_num):
+    """
+    Create invoked methods, a half of which are defined classes' methods.
+    """
+    rand = random.Random(1)
+    app_methods = [ (f'Lcom/example/C{i};', generate_signature(rand)) for i in range(2000) ]
+
+    # API methods invoked by the app, including undefined methods of the defined classes
+    api_methods = []
+    for kind in definitions.keys():
+        for clss, methods in definitions[kind].items():
+            api_methods.extend( (clss, method) for method in methods.keys() )
+            api_methods.extend( (clss, generate_signature(rand)) for _ in methods.keys() )
+
+    invokes = []
+    for _ in range(invoke_num):
+        if (rand.random() < 0.5):
+            invokes.append(rand.choice(app_methods))
+        else:
+            invokes.append(rand.choice(api_methods))
+    return invokes
+
+def measure(name, detect_source, detect_sink, invokes, definitions):
+    """
+    Print throughput of detecting sources and sinks, and return the results.
+    """
+    start = time.perf_counter()
+    results = [ (detect_source(clss, method, definitions['sources']), detect_sink(clss, method, definitions['sinks']))
+                for clss, method in invokes ]
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:<24} {elapsed:8.2f} s {len(invokes) / elapsed:12,.0f} invokes/s')
+
+    return results
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    entry_num = int(sys.argv[1]) if (len(sys.argv) > 1) else 10000
+    invoke_num = int(sys.argv[2]) if (len(sys.argv) > 2) else 200000
+
+    with tempfile.TemporaryDirectory() as workspace:
+        path = pathlib.Path(workspace) / 'definitions.json'
+        generate_definitions(path, entry_num)
+        with open(path) as f:
+            definitions = json.load(f)
+
+    invokes = generate_invokes(definitions, invoke_num)
+
+    legacy = measure('legacy detectors', legacy_detect_source, legacy_detect_sink, invokes, definitions)
+
+    start = time.perf_counter()
+    get_matcher(definitions['sources'], 'exact')
+    get_matcher(definitions['sinks'], 'substring')
+    print(f'{"compiling matchers":<24} {time.perf_counter() - start:8.2f} s')
+
+    matched = measure('compiled matchers', detect_source, detect_sink, invokes, definitions)
+    assert legacy == matched, 'results differ'
+
+if __name__ == '__main__':
+    run_benchmark()
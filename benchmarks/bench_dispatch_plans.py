@@ -0,0 +1,35 @@
+import sys
+import logging
+import tempfile
+
+from bench_emulation_loop import parse_app, measure
+from smalien.emulator.interpreter.dispatch_plans import DispatchPlans
+
+
+def unfiltered_plan(self, kind):
+    """
+    Plan every handler for every kind, as all modules and taint logics ran before the dispatch plans.
+    """
+    plan = tuple( handler.run for handler in self.handlers )
+    self[kind] = plan
+    return plan
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    iterations = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+
+    with tempfile.TemporaryDirectory() as workspace:
+        app = parse_app(workspace, iterations)
+
+        missing = DispatchPlans.__missing__
+        DispatchPlans.__missing__ = unfiltered_plan
+        try:
+            measure('all handlers', app, workspace)
+        finally:
+            DispatchPlans.__missing__ = missing
+
+        measure('dispatch plans', app, workspace)
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,131 @@
+import sys
+import time
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.parsers.parser_manager import ParserManager
+from smalien.emulator.emulator import Emulator
+from smalien.emulator.vm_manager import pc_controller
+from smalien.emulator.vm_manager.vm_runner import VMRunner
+from smalien.emulator.vm_manager.structures import VMOrder
+from smalien.emulator.interpreter.value_manager import value_resolvers
+from smalien.taint_definitions.sources import taint_sources
+from smalien.taint_definitions.sinks import taint_sinks
+
+# A loop-heavy method computing pi by the Leibniz formula, similar to DroidBench's computePi()D
+SMALI = '''.class public Lbench/Pi;
+.super Ljava/lang/Object;
+.source "Pi.java"
+
+
+# direct methods
+.method public static computePi()D
+    .locals 8
+
+    const-wide/16 v0, 0x0
+
+    const/4 v2, 0x0
+
+    :goto_0
+    const v3, ITERATIONS
+
+    if-ge v2, v3, :cond_0
+
+    mul-int/lit8 v3, v2, 0x2
+
+    add-int/lit8 v3, v3, 0x1
+
+    int-to-double v4, v3
+
+    const-wide/high16 v6, 0x4010000000000000L    # 4.0
+
+    div-double/2addr v6, v4
+
+    rem-int/lit8 v3, v2, 0x2
+
+    if-nez v3, :cond_1
+
+    add-double/2addr v0, v6
+
+    goto :goto_1
+
+    :cond_1
+    sub-double/2addr v0, v6
+
+    :goto_1
+    add-int/lit8 v2, v2, 0x1
+
+    goto :goto_0
+
+    :cond_0
+    return-wide v0
+.end method
+'''
+
+def legacy_get_evaluator(expression, parameters):
+    """
+    Evaluate the expression string every time, as before the evaluators were introduced.
+    """
+    names = [ name.strip() for name in parameters.split(',') ]
+    return lambda *args: eval(expression, dict(zip(names, args)))
+
+def parse_app(workspace, iterations):
+    """
+    Parse an app only containing the loop-heavy method.
+    """
+    unpackaged = pathlib.Path(workspace) / 'app'
+    (unpackaged / 'smali' / 'bench').mkdir(parents=True)
+    (unpackaged / 'smali' / 'bench' / 'Pi.smali').write_text(SMALI.replace('ITERATIONS', hex(iterations)))
+
+    app = App(unpackaged=unpackaged)
+    ParserManager(app, [], [], taint_sources, taint_sinks).run()
+
+    return app
+
+def measure(name, app, workspace):
+    """
+    Emulate the method statically, and print the number of emulated steps per second.
+    """
+    emulator = Emulator(app, pathlib.Path(workspace), taint_sources, taint_sinks)
+
+    steps = 0
+    run_single_step = VMRunner.run_single_step
+    def count_single_step(self, inst, sf):
+        nonlocal steps
+        steps += 1
+        return run_single_step(self, inst, sf)
+    VMRunner.run_single_step = count_single_step
+
+    line = app.classes['Lbench/Pi;'].methods['computePi()D'].start_at
+    start = time.perf_counter()
+    try:
+        emulator.run(VMOrder(clss='Lbench/Pi;', method='computePi()D', line=line, pid=0, tid=0))
+    finally:
+        VMRunner.run_single_step = run_single_step
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:<24} {elapsed:8.2f} s {steps / elapsed:12,.0f} steps/s')
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    iterations = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+
+    with tempfile.TemporaryDirectory() as workspace:
+        app = parse_app(workspace, iterations)
+
+        get_evaluator = pc_controller.get_evaluator
+        pc_controller.get_evaluator = value_resolvers.get_evaluator = legacy_get_evaluator
+        try:
+            measure('eval per step', app, workspace)
+        finally:
+            pc_controller.get_evaluator = value_resolvers.get_evaluator = get_evaluator
+
+        measure('compiled evaluators', app, workspace)
+
+if __name__ == '__main__':
+    run_benchmark()
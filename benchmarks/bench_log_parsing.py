@@ -0,0 +1,121 @@
+import re
+import sys
+import json
+import time
+import random
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.emulator.log_decoder import BINARY_HEADER
+from smalien.emulator.runtime_log_manager import RuntimeLogManager
+
+
+def legacy_parse_logs(manager):
+    """
+    RuntimeLogManager.parse_logs before the log decoder was introduced.
+    """
+    for log_list in manager.read_logs():
+        for log in log_list:
+            assert log is not None, 'a log is none, meaning null is logged by the app'
+
+            assert re.match(r'^\d{13}:\d+:\d+:\d+_\d+', log) is not None, f'Corrupted, {log = }'
+
+            time = int(log.split(':')[0])
+            pid = int(log.split(':')[1])
+            tid = int(log.split(':')[2])
+
+            smalien_id = log.split(':')[3]
+            cid = int(smalien_id.split('_')[0])
+            line = int(smalien_id.split('_')[1])
+
+            reg = smalien_id.split('_')[-1] if (len(smalien_id.split('_')) > 2) else None
+            value = ':'.join(log.split(':')[4:]) if (reg is not None) else None
+
+            yield time, pid, tid, cid, line, reg, value
+
+def generate_logs(path, record_num, list_size=1000):
+    """
+    Write a synthetic smalien log.
+    """
+    rand = random.Random(0)
+    timestamp = 1700000000000
+    with open(path, 'w') as f:
+        for i in range(0, record_num, list_size):
+            log_list = []
+            for _ in range(min(list_size, record_num - i)):
+                timestamp += rand.randint(0, 2)
+                head = f'{timestamp}:{rand.randint(1000, 30000)}:{rand.randint(1, 40)}:{rand.randint(0, 20000)}_{rand.randint(1, 3000)}'
+                kind = rand.random()
+                if (kind < 0.3):
+                    log_list.append(head)
+                elif (kind < 0.8):
+                    log_list.append(f'{head}_v{rand.randint(0, 15)}:{rand.randint(-2**31, 2**31)}')
+                else:
+                    log_list.append(f'{head}_p{rand.randint(0, 5)}:https://example.com:8080/path?q={rand.random()}')
+            f.write(json.dumps(log_list) + '\n')
+
+def convert_to_binary(manager, path):
+    """
+    Write the records of a JSON log in the format of SmalienBinaryWriter.
+    """
+    with open(path, 'wb') as f:
+        for time, pid, tid, cid, line, reg, value in legacy_parse_logs(manager):
+            if (reg is None):
+                f.write(BINARY_HEADER.pack(time, pid, tid, cid, line, 0, -1))
+            else:
+                number = int(reg[1:]) + 1
+                value = value.encode('utf-8')
+                f.write(BINARY_HEADER.pack(time, pid, tid, cid, line, number if (reg[0] == 'v') else -number, len(value)))
+                f.write(value)
+
+def measure(name, count_records, record_num):
+    """
+    Print throughput of the given function returning the number of parsed records.
+    """
+    start = time.perf_counter()
+    count = count_records()
+    elapsed = time.perf_counter() - start
+
+    assert count == record_num, f'{count = }'
+    print(f'{name:<24} {elapsed:8.2f} s {record_num / elapsed:12,.0f} records/s')
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    record_num = int(sys.argv[1]) if (len(sys.argv) > 1) else 1000000
+
+    with tempfile.TemporaryDirectory() as workspace:
+        path = pathlib.Path(workspace) / 'SmalienLog.txt'
+        generate_logs(path, record_num)
+
+        manager = RuntimeLogManager(App(smalien_log_local=path), workspace, False)
+
+        # Check that both parsers return the same records
+        for legacy, decoded in zip(legacy_parse_logs(manager), manager.parse_logs()):
+            assert legacy == decoded, f'{legacy = }, {decoded = }'
+
+        # Reading JSON arrays is included in all parsers
+        measure('read_logs only', lambda: sum(len(l) for l in manager.read_logs()), record_num)
+        measure('legacy parse_logs', lambda: sum(1 for _ in legacy_parse_logs(manager)), record_num)
+        measure('parse_logs', lambda: sum(1 for _ in manager.parse_logs()), record_num)
+        measure('parse_log_columns', lambda: sum(len(c['time']) for c in manager.parse_log_columns()), record_num)
+
+        # Binary logs of the same records
+        binary_path = pathlib.Path(workspace) / 'SmalienLog.bin'
+        convert_to_binary(manager, binary_path)
+
+        binary_manager = RuntimeLogManager(App(smalien_log_local=binary_path, log_format='binary'), workspace, False)
+        for decoded, binary in zip(manager.parse_logs(), binary_manager.parse_logs()):
+            assert decoded == binary, f'{decoded = }, {binary = }'
+
+        print(f'{"json size":<24} {path.stat().st_size:12,} bytes')
+        print(f'{"binary size":<24} {binary_path.stat().st_size:12,} bytes')
+        measure('binary parse_logs', lambda: sum(1 for _ in binary_manager.parse_logs()), record_num)
+        measure('binary parse_log_columns', lambda: sum(len(c['time']) for c in binary_manager.parse_log_columns()), record_num)
+
+if __name__ == '__main__':
+    run_benchmark()
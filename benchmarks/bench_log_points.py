@@ -0,0 +1,198 @@
+"""
+Report log points placed by the instrumentation modes on an unpackaged app.
+
+Usage: python benchmarks/bench_log_points.py [<unpackaged_app_dir> [<ignored_package>...]]
+
+Without arguments, a synthetic app with the patterns LogPointMinimizer removes is generated and measured.
+"""
+import sys
+import time
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.parsers.parser_manager import ParserManager
+from smalien.instrumentator.generator.generator import Generator
+from smalien.analyzers.reachability_analyzer import ReachabilityAnalyzer
+from smalien.analyzers.log_point_minimizer import LogPointMinimizer
+from smalien.taint_definitions.sources import taint_sources
+from smalien.taint_definitions.sinks import taint_sinks
+
+# A method with the patterns whose log points are removed by minimization:
+# array-length of a constant-size new-array, iget and sget after put in the method, and sput and new-instance of initialized classes
+M_SMALI = '''.class public Lcom/m/M;
+.super Ljava/lang/Object;
+
+.field public static total:I
+
+.field public size:I
+
+.method public constructor <init>()V
+    .locals 0
+
+    invoke-direct {p0}, Ljava/lang/Object;-><init>()V
+
+    return-void
+.end method
+
+.method public run(I)I
+    .locals 4
+
+    new-instance v0, Ljava/lang/StringBuilder;
+
+    invoke-direct {v0}, Ljava/lang/StringBuilder;-><init>()V
+
+    const/4 v1, 0x3
+
+    new-array v2, v1, [I
+
+    array-length v3, v2
+
+    iput v3, p0, Lcom/m/M;->size:I
+
+    iget v3, p0, Lcom/m/M;->size:I
+
+    sput v3, Lcom/m/M;->total:I
+
+    sget v3, Lcom/m/M;->total:I
+
+    new-array v2, p1, [I
+
+    array-length v3, v2
+
+    sput v3, Lcom/m/Holder;->count:I
+
+    sput v3, Lcom/m/Holder;->count:I
+
+    if-eqz p1, :cond_0
+
+    iput v3, p0, Lcom/m/M;->size:I
+
+    :cond_0
+    iget v3, p0, Lcom/m/M;->size:I
+
+    iput v3, p0, Lcom/m/M;->size:I
+
+    invoke-virtual {v0}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    iget v3, p0, Lcom/m/M;->size:I
+
+    packed-switch p1, :pswitch_data_0
+
+    :pswitch_0
+    iput v3, p0, Lcom/m/M;->size:I
+
+    :try_start_0
+    iget v3, p0, Lcom/m/M;->size:I
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    new-instance v0, Lcom/m/Holder;
+
+    return v3
+
+    :catch_0
+    move-exception v0
+
+    iget v3, p0, Lcom/m/M;->size:I
+
+    return v3
+
+    :pswitch_data_0
+    .packed-switch 0x0
+        :pswitch_0
+    .end packed-switch
+.end method
+'''
+
+HOLDER_SMALI = '''.class public Lcom/m/Holder;
+.super Ljava/lang/Object;
+
+.field public static count:I
+
+.method static constructor <clinit>()V
+    .locals 1
+
+    const/4 v0, 0x1
+
+    sput v0, Lcom/m/Holder;->count:I
+
+    return-void
+.end method
+
+.method public constructor <init>()V
+    .locals 0
+
+    invoke-direct {p0}, Ljava/lang/Object;-><init>()V
+
+    return-void
+.end method
+'''
+
+
+def generate_app(directory):
+    """
+    Write the synthetic app, and return its unpackaged directory.
+    """
+    unpackaged = pathlib.Path(directory) / 'app'
+    (unpackaged / 'smali' / 'com' / 'm').mkdir(parents=True)
+    (unpackaged / 'smali' / 'com' / 'm' / 'M.smali').write_text(M_SMALI)
+    (unpackaged / 'smali' / 'com' / 'm' / 'Holder.smali').write_text(HOLDER_SMALI)
+
+    return unpackaged
+
+def parse_app(unpackaged, ignore_list):
+    app = App(unpackaged=pathlib.Path(unpackaged))
+    ParserManager(app, ignore_list, [], taint_sources, taint_sinks).run()
+
+    return app
+
+def measure(name, unpackaged, ignore_list, selective, minimize):
+    """
+    Generate payloads without injecting them, and print the number of log points.
+    """
+    app = parse_app(unpackaged, ignore_list)
+
+    start = time.perf_counter()
+    methods = None
+    if (selective):
+        methods = ReachabilityAnalyzer(app, taint_sources, taint_sinks).run()
+    redundant = None
+    if (minimize):
+        redundant = LogPointMinimizer(app).run()
+    generator = Generator(app, False, False, set(), taint_sources, None, methods, redundant)
+    generator.run()
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:<24} {elapsed:8.2f} s {generator.log_point_num:10,} log points')
+
+    return generator.log_point_num
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    if (len(sys.argv) > 1):
+        report(sys.argv[1], sys.argv[2:])
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        print('measuring the synthetic app')
+        report(generate_app(directory), [])
+
+def report(unpackaged, ignore_list):
+    """
+    Measure the modes, and print the reductions of log points.
+    """
+    full = measure('all methods', unpackaged, ignore_list, False, False)
+    selective = measure('selective', unpackaged, ignore_list, True, False)
+    minimized = measure('minimized', unpackaged, ignore_list, False, True)
+    both = measure('selective and minimized', unpackaged, ignore_list, True, True)
+    print(f'selective instrumentation removed {1 - selective / full:.1%} of log points')
+    print(f'minimization removed {1 - minimized / full:.1%} of log points')
+    print(f'both removed {1 - both / full:.1%} of log points')
+
+if __name__ == '__main__':
+    run_benchmark()
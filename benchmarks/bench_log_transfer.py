@@ -0,0 +1,62 @@
+"""
+Measure collecting a runtime log from a stand-in of adb and reading it, with and without compression.
+
+Usage: python benchmarks/bench_log_transfer.py [<record_num>] [<bandwidth in MB/s>]
+"""
+import sys
+import time
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.definitions import SMALIEN_LOG
+from smalien.exerciser.exerciser import Exerciser
+from smalien.emulator.runtime_log_manager import RuntimeLogManager
+
+from bench_log_parsing import generate_logs
+
+ADB_STUB = pathlib.Path(__file__).resolve().parent.parent / 'smalien' / 'utils' / 'adb_stub.py'
+
+def measure(name, root, workspace, bandwidth, log_compression, record_num):
+    """
+    Collect the log with the stand-in of adb, read it, and print the elapsed times and the size of the collected copy.
+    """
+    local = workspace / pathlib.PurePosixPath(SMALIEN_LOG).name
+    app = App(smalien_log=SMALIEN_LOG, smalien_log_local=local, logcat_log=workspace / 'logcat.log')
+    adb = [sys.executable, str(ADB_STUB), '--root', str(root), '--bandwidth', str(bandwidth)]
+    exerciser = Exerciser(app, workspace, None, adb, log_compression)
+
+    start = time.perf_counter()
+    assert exerciser.collect()
+    collected = time.perf_counter()
+    count = sum(len(records) for records in RuntimeLogManager(app, workspace, False).read_records())
+    read = time.perf_counter()
+
+    assert count == record_num, f'{count = }'
+    size = sum( path.stat().st_size for path in workspace.glob(f'{local.name}*') )
+    print(f'{name:<12} collect {collected - start:8.2f} s  read {read - collected:8.2f} s  '
+          f'total {read - start:8.2f} s  {size:14,} bytes on the server')
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    record_num = int(sys.argv[1]) if (len(sys.argv) > 1) else 1000000
+    bandwidth = float(sys.argv[2]) * 1024**2 if (len(sys.argv) > 2) else 30 * 1024**2
+
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as workspace:
+        root = pathlib.Path(root)
+        workspace = pathlib.Path(workspace)
+
+        device_log = pathlib.Path(f'{root}{SMALIEN_LOG}')
+        device_log.parent.mkdir(parents=True)
+        generate_logs(device_log, record_num)
+        print(f'{"log size":<12} {device_log.stat().st_size:,} bytes, {bandwidth / 1024**2:.0f} MB/s')
+
+        measure('pull', root, workspace, bandwidth, None, record_num)
+        measure('gzip', root, workspace, bandwidth, 'gzip', record_num)
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,69 @@
+import sys
+import time
+import random
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import AppClass, AppMethod, MethodIndex
+
+
+def legacy_get_method_of_line(cdata, line):
+    """
+    RuntimeLogManager.get_method_of_line before the method index was introduced.
+    """
+    for method, mdata in cdata.methods.items():
+        if (mdata.start_at <= line <= mdata.end_at):
+            return method
+    raise Exception(f'Failed to find method of {line = } in {cdata.name = }')
+
+def generate_class(method_num, method_size=20):
+    """
+    Create a synthetic class with the given number of methods.
+    """
+    methods = {}
+    line = 10
+    for i in range(method_num):
+        name = f'm{i}()V'
+        methods[name] = AppMethod(name=name, start_at=line, end_at=line + method_size)
+        line += method_size + 2
+
+    cdata = AppClass(name='LSynthetic;', methods=methods)
+    cdata.method_index = MethodIndex.build(methods)
+
+    return cdata
+
+def measure(name, lookup, lines):
+    """
+    Print throughput of the given lookup function.
+    """
+    start = time.perf_counter()
+    for line in lines:
+        lookup(line)
+    elapsed = time.perf_counter() - start
+
+    print(f'{name:<24} {elapsed:8.3f} s {len(lines) / elapsed:12,.0f} lookups/s')
+
+def run_benchmark():
+    method_num = int(sys.argv[1]) if (len(sys.argv) > 1) else 1000
+    lookup_num = int(sys.argv[2]) if (len(sys.argv) > 2) else 100000
+
+    cdata = generate_class(method_num)
+
+    # Lines inside methods, as logged at runtime
+    rand = random.Random(0)
+    mdatas = list(cdata.methods.values())
+    lines = []
+    for _ in range(lookup_num):
+        mdata = rand.choice(mdatas)
+        lines.append(rand.randint(mdata.start_at, mdata.end_at))
+
+    # Check that both lookups return the same methods
+    for line in lines[:1000]:
+        assert legacy_get_method_of_line(cdata, line) == cdata.get_method_of_line(line), f'{line = }'
+
+    measure('linear scan', lambda line: legacy_get_method_of_line(cdata, line), lines)
+    measure('method index', cdata.get_method_of_line, lines)
+
+if __name__ == '__main__':
+    run_benchmark()
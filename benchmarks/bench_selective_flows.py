@@ -0,0 +1,163 @@
+"""
+Check that selective instrumentation keeps flows of patterns passing taints through app methods.
+Each pattern's entry method is statically emulated with all methods instrumented and with only relevant methods instrumented,
+and the numbers of found sources and sinks are compared.
+
+Usage: python benchmarks/bench_selective_flows.py
+"""
+import sys
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.parsers.parser_manager import ParserManager
+from smalien.emulator.emulator import Emulator
+from smalien.emulator.vm_manager.structures import VMOrder
+from smalien.analyzers.reachability_analyzer import ReachabilityAnalyzer
+from smalien.taint_definitions.sources import taint_sources
+from smalien.taint_definitions.sinks import taint_sinks
+
+# Holder of a tainted value, whose getter is invoked through another method by the leaking method
+HOLDER_SMALI = '''.class public Lbench/Holder;
+.super Ljava/lang/Object;
+
+.field private static secret:Ljava/lang/String;
+
+.method public static getSecret()Ljava/lang/String;
+    .locals 1
+    sget-object v0, Lbench/Holder;->secret:Ljava/lang/String;
+    return-object v0
+.end method
+
+.method public static getWrapped()Ljava/lang/String;
+    .locals 1
+    invoke-static {}, Lbench/Holder;->getSecret()Ljava/lang/String;
+    move-result-object v0
+    return-object v0
+.end method
+'''
+
+LEAK_SMALI = '''.class public Lbench/Leak;
+.super Ljava/lang/Object;
+
+.field public static f:Ljava/lang/String;
+.field public static g:Ljava/lang/String;
+
+.method public static wrap(Ljava/lang/String;)Ljava/lang/String;
+    .locals 1
+    const-string v0, "x"
+    invoke-virtual {p0, v0}, Ljava/lang/String;->concat(Ljava/lang/String;)Ljava/lang/String;
+    move-result-object v0
+    return-object v0
+.end method
+
+.method public static copy()V
+    .locals 1
+    sget-object v0, Lbench/Leak;->f:Ljava/lang/String;
+    sput-object v0, Lbench/Leak;->g:Ljava/lang/String;
+    return-void
+.end method
+
+.method public static unrelated()I
+    .locals 1
+    const/4 v0, 0x1
+    return v0
+.end method
+
+.method public static leakViaHelper(Landroid/telephony/TelephonyManager;)V
+    .locals 3
+    invoke-virtual {p0}, Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+    move-result-object v0
+    invoke-static {v0}, Lbench/Leak;->wrap(Ljava/lang/String;)Ljava/lang/String;
+    move-result-object v0
+    invoke-static {}, Lbench/Leak;->unrelated()I
+    const-string v2, "tag"
+    invoke-static {v2, v0}, Landroid/util/Log;->i(Ljava/lang/String;Ljava/lang/String;)I
+    return-void
+.end method
+
+.method public static leakViaFieldCopy(Landroid/telephony/TelephonyManager;)V
+    .locals 2
+    invoke-virtual {p0}, Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+    move-result-object v0
+    sput-object v0, Lbench/Leak;->f:Ljava/lang/String;
+    invoke-static {}, Lbench/Leak;->copy()V
+    sget-object v0, Lbench/Leak;->g:Ljava/lang/String;
+    const-string v1, "tag"
+    invoke-static {v1, v0}, Landroid/util/Log;->i(Ljava/lang/String;Ljava/lang/String;)I
+    return-void
+.end method
+
+.method public static leakViaGetter(Landroid/telephony/TelephonyManager;)V
+    .locals 2
+    invoke-virtual {p0}, Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+    move-result-object v0
+    sput-object v0, Lbench/Holder;->secret:Ljava/lang/String;
+    const/4 v0, 0x0
+    invoke-static {}, Lbench/Holder;->getWrapped()Ljava/lang/String;
+    move-result-object v0
+    const-string v1, "tag"
+    invoke-static {v1, v0}, Landroid/util/Log;->i(Ljava/lang/String;Ljava/lang/String;)I
+    return-void
+.end method
+'''
+
+# Entry methods of the patterns
+PATTERNS = {
+    'helper': 'leakViaHelper(Landroid/telephony/TelephonyManager;)V',
+    'field copy': 'leakViaFieldCopy(Landroid/telephony/TelephonyManager;)V',
+    'getter': 'leakViaGetter(Landroid/telephony/TelephonyManager;)V',
+}
+
+
+def parse_app(workspace):
+    unpackaged = workspace / 'app'
+    (unpackaged / 'smali' / 'bench').mkdir(parents=True)
+    (unpackaged / 'smali' / 'bench' / 'Holder.smali').write_text(HOLDER_SMALI)
+    (unpackaged / 'smali' / 'bench' / 'Leak.smali').write_text(LEAK_SMALI)
+
+    app = App(unpackaged=unpackaged)
+    ParserManager(app, [], [], taint_sources, taint_sinks).run()
+
+    return app
+
+def emulate(method, selective):
+    """
+    Emulate the entry method, and return the numbers of found sources and sinks, and the relevant methods.
+    """
+    with tempfile.TemporaryDirectory() as workspace:
+        workspace = pathlib.Path(workspace)
+        app = parse_app(workspace)
+
+        relevant = None
+        if (selective):
+            relevant = ReachabilityAnalyzer(app, taint_sources, taint_sinks).run()
+
+        emulator = Emulator(app, workspace, taint_sources, taint_sinks)
+        start_at = app.classes['Lbench/Leak;'].methods[method].start_at
+        emulator.run(VMOrder(clss='Lbench/Leak;', method=method, line=start_at, pid=0, tid=0, values={'p0': 'tm'}))
+
+        return len(emulator.get_found_sources()), len(emulator.get_found_sinks()), relevant
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    failures = 0
+    for name, method in PATTERNS.items():
+        full = emulate(method, False)
+        selective = emulate(method, True)
+        kept = full[:2] == selective[:2]
+        failures += not kept
+
+        print(f'{name:<12} all methods {full[0]} sources {full[1]} sinks, '
+              f'selective {selective[0]} sources {selective[1]} sinks, {"kept" if kept else "LOST"}')
+
+    print(f'relevant methods: {sorted( method for _, method in selective[2] )}')
+
+    return failures
+
+if __name__ == '__main__':
+    sys.exit(run_benchmark())
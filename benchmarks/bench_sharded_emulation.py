@@ -0,0 +1,120 @@
+"""
+Compare sinks found by the serial emulation and the sharded emulation of threads sharing a static field.
+A thread reads the field before, while, and after another thread taints it, and a third thread taints it last.
+The sharded emulation must find the leaks that the serial emulation finds, without leaks of writes that have not happened yet.
+
+Usage: python benchmarks/bench_sharded_emulation.py [<workers>]
+"""
+import sys
+import time
+import logging
+import pathlib
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from smalien.structures import App
+from smalien.parsers.parser_manager import ParserManager
+from smalien.emulator.emulator import Emulator
+from smalien.emulator.sharded_emulator import ShardedEmulator
+from smalien.emulator.vm_manager.structures import VMOrder
+from smalien.taint_definitions.sources import taint_sources
+from smalien.taint_definitions.sinks import taint_sinks
+
+SHARED_SMALI = '''.class public Lbench/Shared;
+.super Ljava/lang/Object;
+
+.field public static secret:Ljava/lang/String;
+
+.method public static write(Landroid/telephony/TelephonyManager;)V
+    .locals 1
+    invoke-virtual {p0}, Landroid/telephony/TelephonyManager;->getDeviceId()Ljava/lang/String;
+    move-result-object v0
+    sput-object v0, Lbench/Shared;->secret:Ljava/lang/String;
+    return-void
+.end method
+
+.method public static clear()V
+    .locals 1
+    const-string v0, "cleared"
+    sput-object v0, Lbench/Shared;->secret:Ljava/lang/String;
+    return-void
+.end method
+
+.method public static leak()V
+    .locals 2
+    sget-object v0, Lbench/Shared;->secret:Ljava/lang/String;
+    const-string v1, "tag"
+    invoke-static {v1, v0}, Landroid/util/Log;->i(Ljava/lang/String;Ljava/lang/String;)I
+    return-void
+.end method
+'''
+
+# Methods run by each thread, and their timestamps
+SCHEDULE = [
+    (1000, 1, 'leak()V'),
+    (2000, 2, 'write(Landroid/telephony/TelephonyManager;)V'),
+    (3000, 1, 'leak()V'),
+    (4000, 2, 'clear()V'),
+    (5000, 1, 'leak()V'),
+    (6000, 3, 'write(Landroid/telephony/TelephonyManager;)V'),
+]
+
+
+def parse_app(workspace):
+    unpackaged = workspace / 'app'
+    (unpackaged / 'smali' / 'bench').mkdir(parents=True)
+    (unpackaged / 'smali' / 'bench' / 'Shared.smali').write_text(SHARED_SMALI)
+
+    app = App(unpackaged=unpackaged)
+    ParserManager(app, [], [], taint_sources, taint_sinks).run()
+
+    return app
+
+def get_vm_orders(app):
+    """
+    Return VM orders of the schedule, in the order of timestamps.
+    """
+    methods = app.classes['Lbench/Shared;'].methods
+    return [ VMOrder(clss='Lbench/Shared;', method=method, line=methods[method].start_at, pid=0, tid=tid,
+                     values={'p0': 'tm'} if (method.startswith('write')) else {}, timestamp=timestamp)
+             for timestamp, tid, method in SCHEDULE ]
+
+def emulate(workers):
+    """
+    Emulate the schedule, and return timestamps of VM orders in that leaks are found, and the elapsed time.
+    """
+    with tempfile.TemporaryDirectory() as workspace:
+        workspace = pathlib.Path(workspace)
+        app = parse_app(workspace)
+        vm_orders = get_vm_orders(app)
+
+        emulator = Emulator(app, workspace, taint_sources, taint_sinks, calculate_coverage=False)
+
+        start = time.perf_counter()
+        if (workers > 1):
+            # VM orders of the synthetic log
+            emulator.runtime_log_manager.run = lambda: iter(vm_orders)
+            ShardedEmulator(emulator, workspace, taint_sources, taint_sinks, True, workers).run()
+        else:
+            emulator.run_vm_orders(vm_orders)
+        elapsed = time.perf_counter() - start
+
+        return len(emulator.get_found_sinks()), elapsed
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    workers = int(sys.argv[1]) if (len(sys.argv) > 1) else 3
+
+    serial = emulate(1)
+    sharded = emulate(workers)
+
+    print(f'{"serial":<12} {serial[0]} sinks in {serial[1]:.2f} s')
+    print(f'{"sharded":<12} {sharded[0]} sinks in {sharded[1]:.2f} s with {workers} workers')
+    print('same sinks' if (serial[0] == sharded[0]) else 'DIFFERENT sinks')
+
+    return int(serial[0] != sharded[0])
+
+if __name__ == '__main__':
+    sys.exit(run_benchmark())
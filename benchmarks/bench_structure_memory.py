@@ -0,0 +1,85 @@
+import sys
+import pickle
+import logging
+import pathlib
+import tempfile
+import tracemalloc
+
+from bench_emulation_loop import SMALI
+from smalien.structures import App
+from smalien.parsers.parser_manager import ParserManager
+from smalien.emulator.interpreter.value_manager.structures import PrimitiveValue, ClassInstanceValue, ArrayInstanceValue
+from smalien.taint_definitions.sources import taint_sources
+from smalien.taint_definitions.sinks import taint_sinks
+
+
+def parse_app(workspace, class_num):
+    """
+    Parse an app containing copies of the loop-heavy class.
+    """
+    unpackaged = pathlib.Path(workspace) / 'app'
+    (unpackaged / 'smali' / 'bench').mkdir(parents=True)
+    for i in range(class_num):
+        smali = SMALI.replace('ITERATIONS', '0x10').replace('Lbench/Pi;', f'Lbench/Pi{i};')
+        (unpackaged / 'smali' / 'bench' / f'Pi{i}.smali').write_text(smali)
+
+    return parse_unpackaged(unpackaged)
+
+def parse_unpackaged(unpackaged):
+    app = App(unpackaged=pathlib.Path(unpackaged))
+    ParserManager(app, [], [], taint_sources, taint_sinks).run()
+
+    return app
+
+def get_size(obj):
+    """
+    Return the size of the object itself and its attribute dictionary, excluding the attribute values.
+    """
+    size = sys.getsizeof(obj)
+    if (hasattr(obj, '__dict__')):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def measure_instructions(app):
+    """
+    Print memory and pickle size per instruction.
+    """
+    instructions = [ inst for cdata in app.classes.values()
+                     for mdata in cdata.methods.values()
+                     for inst in mdata.instructions.values() ]
+    size = sum(get_size(inst) for inst in instructions)
+    pickled = len(pickle.dumps(app.classes, protocol=pickle.HIGHEST_PROTOCOL))
+
+    print(f'{"instructions":<24} {len(instructions):12,}')
+    print(f'{"memory per instruction":<24} {size / len(instructions):12.1f} bytes')
+    print(f'{"pickle per instruction":<24} {pickled / len(instructions):12.1f} bytes')
+
+def measure_values(name, create, value_num=100000):
+    """
+    Print memory allocated per value.
+    """
+    tracemalloc.start()
+    values = [ create(i) for i in range(value_num) ]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f'{name:<24} {allocated / len(values):12.1f} bytes')
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    with tempfile.TemporaryDirectory() as workspace:
+        if (len(sys.argv) > 1):
+            app = parse_unpackaged(sys.argv[1])
+        else:
+            app = parse_app(workspace, 1000)
+
+        measure_instructions(app)
+
+    # Values allocated per register write, including their fields' containers
+    measure_values('PrimitiveValue', lambda i: PrimitiveValue(value=i, data_type='I'))
+    measure_values('ClassInstanceValue', lambda i: ClassInstanceValue(value=i, data_type='Ljava/lang/Object;'))
+    measure_values('ArrayInstanceValue', lambda i: ArrayInstanceValue(value=i, data_type='[I', element_data_type='I'))
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,28 @@
+import sys
+import logging
+import tempfile
+
+from bench_emulation_loop import parse_app, measure
+from smalien.utils.loggers import Trace
+
+
+def run_benchmark():
+    logging.getLogger('smalien').setLevel('ERROR')
+
+    iterations = int(sys.argv[1]) if (len(sys.argv) > 1) else 20000
+
+    with tempfile.TemporaryDirectory() as workspace:
+        app = parse_app(workspace, iterations)
+
+        # Before the trace switch, per-step logs were formatted regardless of the log level
+        update = Trace.update
+        Trace.update = staticmethod(lambda: setattr(Trace, 'enabled', True))
+        try:
+            measure('per-step logging', app, workspace)
+        finally:
+            Trace.update = update
+
+        measure('trace switch', app, workspace)
+
+if __name__ == '__main__':
+    run_benchmark()
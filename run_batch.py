@@ -0,0 +1,35 @@
+import smalien
+import sys
+import logging
+
+
+def run_batch():
+    # Setup the log level
+    logging.getLogger('smalien').setLevel('INFO')
+
+    # Setup ignore package list
+    # ignore_list = []
+    ignore_list = [ 'android', 'androidx' ]
+
+    processor = smalien.BatchProcessor(sys.argv[2:],
+                                       journal=sys.argv[1],
+                                       workers=4,
+                                       timeout=3600,
+                                       memory_cap=8 * 1024 ** 3,
+                                       project_options={'ignore_list': ignore_list,
+                                                        # Skip the trial build at unpackaging, and unpackage again only if the final build fails
+                                                        'trial_build': False},
+                                       keystore={'keystore': '<path_to_your_key>',
+                                                 'storepass': '<keystore_password>',
+                                                 'keypass': '<key_password>',
+                                                 'alias': '<key_alias_name>'},
+                                       # Run apktool, aapt, xml2axml, and signers of each apk on a long-lived worker
+                                       # tool_worker={'cmd': ['<worker_command>'], 'tools': ['apktool', 'aapt', 'xml2axml', 'jarsigner']},
+                                       # For real-world apps, it's better to use these options for instrumentator
+                                       instrument_options={'log_buff_size': 5000,
+                                                           'register_reassignment': True})
+
+    processor.run()
+
+if __name__ == '__main__':
+    run_batch()
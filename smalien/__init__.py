@@ -1,5 +1,6 @@
 
 from .project import *
+from .batch import BatchProcessor
 
 
 # Setup loggers
@@ -0,0 +1,130 @@
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(name=__name__)
+
+
+# Invoke instructions dispatched by the runtime class of the base object
+VIRTUAL_INVOCATIONS = [
+    'invoke-virtual',
+    'invoke-virtual/range',
+    'invoke-interface',
+    'invoke-interface/range',
+]
+
+class CallGraph:
+    """
+    Whole-app call graph over the parsed invoke instructions.
+
+    Nodes are (class, method) pairs of methods implemented in classes not ignored.
+    An invocation targets the method found by searching the invoked class and its ancestors.
+    A virtual invocation also targets the overriding methods of the invoked class's descendants, which are found in AppClass.family.
+    Field accesses of each method are also collected, keyed by field names.
+    """
+
+    def __init__(self, app):
+        logger.debug('initializing')
+
+        self.classes = app.classes
+
+        # Invoke instructions of each method and their target methods
+        self.sites = defaultdict(list)
+        # Methods invoking each method, and the targets of the invocations
+        self.sites_by_target = defaultdict(list)
+
+        # Field names read and written by each method
+        self.reads = defaultdict(set)
+        self.writes = defaultdict(set)
+        # Methods writing each field
+        self.writers = defaultdict(set)
+
+        self.build()
+
+    def build(self):
+        """
+        Build the call graph.
+        """
+        logger.debug('building the call graph')
+
+        for clss, cdata in self.classes.items():
+            if (cdata.ignore):
+                continue
+
+            for method, mdata in cdata.methods.items():
+                if (not mdata.implemented):
+                    continue
+
+                caller = (clss, method)
+                for inst in mdata.instructions.values():
+                    if (inst.kind == 'invoke'):
+                        targets = self.get_targets(inst)
+                        self.sites[caller].append((inst, targets))
+                        for target in targets:
+                            self.sites_by_target[target].append((caller, targets))
+
+                    elif (inst.kind in ['iget', 'sget']):
+                        self.reads[caller].add(self.get_field_name(inst.field))
+
+                    elif (inst.kind in ['iput', 'sput']):
+                        field_name = self.get_field_name(inst.field)
+                        self.writes[caller].add(field_name)
+                        self.writers[field_name].add(caller)
+
+    @staticmethod
+    def get_field_name(field):
+        """
+        Return the field's name without its class name.
+        A field can be accessed through its class's descendants, so fields are conservatively identified by their names.
+        """
+        return field.split('->')[-1]
+
+    def get_targets(self, inst):
+        """
+        Return app methods possibly invoked by the invoke instruction.
+        """
+        targets = set()
+
+        target = self.resolve(inst.class_name, inst.method_name)
+        if (target is not None):
+            targets.add(target)
+
+        if (inst.instruction in VIRTUAL_INVOCATIONS and inst.class_name in self.classes.keys()):
+            # Overriding methods of descendants
+            for member in self.classes[inst.class_name].family - self.get_ancestors(inst.class_name):
+                mdata = self.classes.get(member)
+                if (mdata is not None and not mdata.ignore and
+                    inst.method_name in mdata.methods.keys() and mdata.methods[inst.method_name].implemented):
+                    targets.add((member, inst.method_name))
+
+        return tuple(sorted(targets))
+
+    def resolve(self, clss, method):
+        """
+        Return the method implemented by the class or its nearest ancestor, or None if it is not implemented in the app.
+        """
+        while (clss in self.classes.keys() and not self.classes[clss].ignore):
+            mdata = self.classes[clss].methods.get(method)
+            if (mdata is not None and mdata.implemented):
+                return (clss, method)
+            clss = self.classes[clss].parent
+
+        return None
+
+    def get_ancestors(self, clss):
+        """
+        Return the class's ancestors.
+        """
+        ancestors = set()
+        parent = self.classes[clss].parent
+        while (parent is not None and parent not in ancestors):
+            ancestors.add(parent)
+            parent = self.classes[parent].parent if (parent in self.classes.keys()) else None
+
+        return ancestors
+
+    def get_methods(self):
+        """
+        Return all nodes of the call graph.
+        """
+        return [ (clss, method) for clss, cdata in self.classes.items() if not cdata.ignore
+                                for method, mdata in cdata.methods.items() if mdata.implemented ]
@@ -1,8 +1,15 @@
 import logging
+from collections import deque
+
+from .structures import Node, Edge
 
 logger = logging.getLogger(name=__name__)
 
 
+# Instructions not continuing to the next instruction
+TERMINATORS = ['goto', 'return', 'throw', 'method_tail']
+
+
 class ControlFlowAnalyzer:
     """
     Create control flow graphs (CFGs) consisting of branches and try-catch jumps.
@@ -10,3 +17,151 @@ class ControlFlowAnalyzer:
 
     def __init__(self):
         logger.debug('initializing')
+
+    def create_cfg(self, method):
+        """
+        Create the method's CFG, which is a dict of basic blocks keyed by the line numbers of their first instructions.
+        Return None if a jump target is not resolved.
+        """
+        lines = sorted(method.instructions.keys())
+
+        jumps = {}
+        for i, num in enumerate(lines):
+            next_num = lines[i+1] if (i + 1 < len(lines)) else None
+            jumps[num] = self.get_jumps(method.instructions[num], next_num)
+            if (jumps[num] is None):
+                return None
+
+        try_blocks = self.get_try_blocks(method, lines)
+        if (try_blocks is None):
+            return None
+
+        # Find the first instructions of basic blocks
+        leaders = {lines[0]} | { handler for _, _, handler in try_blocks }
+        for i, num in enumerate(lines):
+            if (method.instructions[num].kind in TERMINATORS or
+                any( kind != 'fallthrough' for _, kind in jumps[num] )):
+                leaders |= { destination for destination, _ in jumps[num] }
+                if (i + 1 < len(lines)):
+                    leaders.add(lines[i+1])
+
+        # Create basic blocks
+        cfg = {}
+        node = None
+        for num in lines:
+            if (num in leaders):
+                node = Node(num=num, handler=(method.instructions[num].kind == 'catch_label'))
+                cfg[num] = node
+            node.lines.append(num)
+
+        # Connect basic blocks
+        for node in cfg.values():
+            edges = [ Edge(source=node.num, destination=destination, kind=kind) for destination, kind in jumps[node.lines[-1]] ]
+            edges += [ Edge(source=node.num, destination=handler, kind='exception')
+                       for start, end, handler in try_blocks if start <= node.lines[-1] and node.lines[0] <= end ]
+            for edge in edges:
+                node.successors.append(edge)
+                cfg[edge.destination].predecessors.append(edge)
+
+        return cfg
+
+    @staticmethod
+    def get_jumps(inst, next_num):
+        """
+        Return destinations of the instruction and kinds of the jumps.
+        Return None if a destination is not resolved.
+        """
+        if (inst.kind in ['if', 'ifz', 'goto']):
+            if (inst.destination is None):
+                return None
+            jumps = [(inst.destination.num, 'goto' if (inst.kind == 'goto') else 'branch')]
+        elif (inst.kind == 'switch'):
+            if (not inst.targets):
+                return None
+            jumps = [ (target.num, 'switch') for target in inst.targets.values() ]
+        else:
+            jumps = []
+
+        if (inst.kind not in TERMINATORS and next_num is not None):
+            jumps.append((next_num, 'fallthrough'))
+
+        return jumps
+
+    @staticmethod
+    def get_try_blocks(method, lines):
+        """
+        Return try blocks as tuples of line numbers of their first and last lines and their catch labels.
+        Return None if a label is missing.
+        """
+        labels = {}
+        for num in lines:
+            inst = method.instructions[num]
+            if (inst.kind in ['try_start_label', 'try_end_label']):
+                labels[inst.label] = num
+            elif (inst.kind == 'catch_label'):
+                labels[inst.instruction] = num
+
+        try_blocks = []
+        for num in lines:
+            inst = method.instructions[num]
+            if (inst.kind == 'catch_data'):
+                if (any( label not in labels.keys() for label in [inst.try_start_label, inst.try_end_label, inst.target] )):
+                    return None
+                try_blocks.append((labels[inst.try_start_label], labels[inst.try_end_label], labels[inst.target]))
+
+        return try_blocks
+
+    @staticmethod
+    def solve(method, cfg, entry_facts, transfer):
+        """
+        Solve a forward dataflow problem of facts that must hold on all paths.
+        Facts are frozensets, and they are met by intersection.
+        The method head starts with entry_facts.
+        Catch labels start with no fact because exceptions can be thrown anywhere in try blocks.
+        transfer(inst, facts) returns facts after the instruction.
+
+        Return facts before each reachable instruction, keyed by line numbers.
+        """
+        entry = min(cfg.keys())
+
+        outs = {}
+        ins = {}
+        worklist = deque(sorted(cfg.keys()))
+        queued = set(worklist)
+        while (worklist):
+            num = worklist.popleft()
+            queued.discard(num)
+            node = cfg[num]
+
+            if (num == entry):
+                facts = entry_facts
+            elif (node.handler):
+                facts = frozenset()
+            else:
+                # Predecessors not reached yet do not restrict the facts
+                reached = [ outs[edge.source] for edge in node.predecessors if edge.source in outs.keys() ]
+                if (not reached):
+                    continue
+                facts = frozenset.intersection(*reached)
+
+            if (num in ins.keys() and ins[num] == facts):
+                continue
+            ins[num] = facts
+
+            for line in node.lines:
+                facts = transfer(method.instructions[line], facts)
+            outs[num] = facts
+
+            for edge in node.successors:
+                if (edge.kind != 'exception' and edge.destination not in queued):
+                    worklist.append(edge.destination)
+                    queued.add(edge.destination)
+
+        # Replay the blocks for the facts before each instruction
+        result = {}
+        for num, facts in ins.items():
+            for line in cfg[num].lines:
+                result[line] = facts
+                facts = transfer(method.instructions[line], facts)
+
+        return result
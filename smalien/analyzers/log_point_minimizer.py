@@ -0,0 +1,218 @@
+import logging
+
+from .control_flow_analyzer import ControlFlowAnalyzer
+
+logger = logging.getLogger(name=__name__)
+
+
+# Instructions possibly waiting for a clinit's logs in the emulator
+CLINIT_TRIGGERS = ['sget', 'sput', 'new_instance']
+
+# Log points possibly recomputed by the emulator
+CANDIDATES = ['array_length', 'sput', 'new_instance', 'iget', 'sget']
+
+
+class LogPointMinimizer(ControlFlowAnalyzer):
+    """
+    Find log points whose values and timings the emulator can recompute from preceding instructions of the method.
+
+    The following facts must hold on all paths to a log point, which are found by a dataflow analysis on the method's CFG.
+      ('def', register, line): The register holds the value defined at the line.
+      ('init', class): The class has been initialized.
+      ('field', register, field): The field of the register's object holds the value put in the method.
+      ('static', field): The static field holds the value put in the method.
+
+    An array-length is redundant if its array is created with a constant size.
+    A sput or new-instance is redundant if the class has no clinit to wait for, or the class has been initialized.
+    An iget or sget is redundant if the field holds the value put in the method.
+    Invocations and monitors kill field facts, since other code can modify the fields.
+    """
+
+    def __init__(self, app):
+        logger.debug('initializing')
+
+        self.classes = app.classes
+
+    def run(self):
+        """
+        Return redundant log points as a set of class names, method names, and line numbers.
+        """
+        logger.debug('running')
+
+        redundant = set()
+        for clss, cdata in self.classes.items():
+            if (cdata.ignore):
+                continue
+
+            for method, mdata in cdata.methods.items():
+                if (not mdata.implemented or
+                    not any( inst.kind in CANDIDATES for inst in mdata.instructions.values() )):
+                    continue
+
+                cfg = self.create_cfg(mdata)
+                if (cfg is None):
+                    logger.warning(f'failed to create the cfg of {clss = } {method = }')
+                    continue
+
+                facts = self.solve(mdata, cfg, self.get_entry_facts(clss), self.transfer)
+
+                for num, inst in mdata.instructions.items():
+                    if (num in facts.keys() and self.is_redundant(inst, facts, mdata.instructions)):
+                        redundant.add((clss, method, num))
+
+        logger.info(f'{len(redundant)} log points are redundant')
+
+        return redundant
+
+    def get_entry_facts(self, clss):
+        """
+        Return facts at the method head.
+        The method's class and its ancestors have been initialized when the method is invoked.
+        """
+        return frozenset(self.get_initialized_classes(clss))
+
+    def get_initialized_classes(self, clss):
+        """
+        Return facts of the class and its ancestors in the app being initialized.
+        """
+        facts = set()
+        while (clss in self.classes.keys() and ('init', clss) not in facts):
+            facts.add(('init', clss))
+            clss = self.classes[clss].parent
+
+        return facts
+
+    def get_awaited_class(self, clss):
+        """
+        Return the class whose clinit the emulator waits for when the class is accessed, or None if there is no such class.
+        This follows ValueResolver.check_clinit_invoked.
+        """
+        while (clss in self.classes.keys() and not self.classes[clss].ignore):
+            if (self.classes[clss].clinit_implemented):
+                return clss
+            clss = self.classes[clss].parent
+
+        return None
+
+    def may_run_app_code(self, inst, facts):
+        """
+        Check whether other code can run at the instruction and modify fields.
+        """
+        if (inst.kind in ['invoke', 'monitor_enter', 'monitor_exit']):
+            return True
+
+        if (inst.kind in CLINIT_TRIGGERS):
+            awaited = self.get_awaited_class(inst.class_name)
+            return awaited is not None and ('init', awaited) not in facts
+
+        return False
+
+    def declares(self, clss, field):
+        """
+        Check whether the class declares the static field.
+        """
+        return (clss in self.classes.keys() and
+                field.split('->')[-1] in self.classes[clss].fields.get('static', {}).keys())
+
+    @staticmethod
+    def get_defined_registers(inst):
+        """
+        Return registers whose values are defined by the instruction.
+        """
+        if (inst.kind == 'new_array'):
+            return [inst.array]
+        if (inst.kind == 'check_cast'):
+            return [inst.register]
+        if (inst.kind == 'iput'):
+            return []
+
+        return [ register for register in [getattr(inst, 'destination', None), getattr(inst, 'destination_pair', None)]
+                 if isinstance(register, str) ]
+
+    @staticmethod
+    def get_neighbor_registers(register):
+        """
+        Return the register and its adjacent registers, which can be a pair of a 64-bit value.
+        """
+        prefix, index = register[0], int(register[1:])
+
+        return { f'{prefix}{index + i}' for i in [-1, 0, 1] if index + i >= 0 }
+
+    def transfer(self, inst, facts):
+        """
+        Return facts after the instruction.
+        """
+        killed = set()
+
+        if (self.may_run_app_code(inst, facts)):
+            killed |= { fact for fact in facts if fact[0] in ['field', 'static'] }
+
+        if (inst.kind in ['iput', 'sput']):
+            field_name = inst.field.split('->')[-1]
+            killed |= { fact for fact in facts if fact[0] in ['field', 'static'] and fact[-1].split('->')[-1] == field_name }
+
+        defined = self.get_defined_registers(inst)
+        overwritten = set()
+        for register in defined:
+            overwritten |= self.get_neighbor_registers(register)
+        killed |= { fact for fact in facts if fact[0] in ['def', 'field'] and fact[1] in overwritten }
+
+        generated = set()
+        if (len(defined) == 1):
+            generated.add(('def', defined[0], inst.num))
+
+        if (inst.kind == 'iput'):
+            generated.add(('field', inst.destination, inst.field))
+        elif (inst.kind == 'sput'):
+            generated.add(('static', inst.field))
+
+        # A new instance initializes its class, and a static access initializes the declaring class
+        if (inst.kind == 'new_instance' or
+            (inst.kind in ['sget', 'sput'] and self.declares(inst.class_name, inst.field))):
+            generated |= self.get_initialized_classes(inst.class_name)
+        elif (inst.kind == 'invoke' and inst.invoke_static and inst.class_name in self.classes.keys() and
+              self.classes[inst.class_name].methods.get(inst.method_name) is not None):
+            generated |= self.get_initialized_classes(inst.class_name)
+
+        if (not killed and not generated):
+            return facts
+
+        return (facts - killed) | generated
+
+    def is_redundant(self, inst, method_facts, instructions):
+        """
+        Check whether the emulator can recompute the log point's value or timing.
+
+        :param method_facts:  Facts before each instruction of the method, keyed by line numbers.
+        """
+        facts = method_facts[inst.num]
+
+        match inst.kind:
+            case 'array_length':
+                return any( self.is_constant_sized_array(instructions[fact[2]], method_facts, instructions)
+                            for fact in facts if fact[0] == 'def' and fact[1] == inst.array )
+
+            case 'sput' | 'new_instance':
+                awaited = self.get_awaited_class(inst.class_name)
+                return awaited is None or ('init', awaited) in facts
+
+            case 'iget':
+                return ('field', inst.source, inst.field) in facts
+
+            case 'sget':
+                return ('static', inst.field) in facts
+
+        return False
+
+    @staticmethod
+    def is_constant_sized_array(inst, method_facts, instructions):
+        """
+        Check whether the instruction creates an array of a constant size.
+        """
+        if (inst.kind != 'new_array'):
+            return False
+
+        facts = method_facts.get(inst.num)
+
+        return facts is not None and any( instructions[fact[2]].kind == 'const'
+                                          for fact in facts if fact[0] == 'def' and fact[1] == inst.size )
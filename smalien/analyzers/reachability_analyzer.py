@@ -0,0 +1,119 @@
+import logging
+
+from .call_graph import CallGraph
+from smalien.emulator.interpreter.call_site_classifier import CallSiteClassifier
+
+logger = logging.getLogger(name=__name__)
+
+
+class ReachabilityAnalyzer:
+    """
+    Find methods necessary for reconstructing flows from taint sources to sinks.
+
+    A method is relevant if it invokes a taint source, a sink, or a method classified specially by the emulator,
+    such as reflective calls and ICC.
+    Class initializers are relevant, because the emulator waits for their logs at sput and new-instance instructions.
+    Relevant methods' callers are relevant, because they reach the invocations.
+    Methods writing fields read by relevant methods are relevant, because taints can be transferred through the fields.
+    Methods invoked by relevant methods and reading fields written by relevant methods are relevant, such as getters,
+    because they return taints stored in the fields. So are methods invoked by relevant methods and invoking such methods.
+    If an invocation can target a relevant method, all of its targets are relevant, so that any of them is logged when executed.
+
+    Other methods are not instrumented.
+    Invocations of them from relevant methods are marked as not in-app,
+    so that their arguments and return values are logged and emulated as API calls.
+    """
+
+    def __init__(self, app, taint_sources, taint_sinks):
+        logger.debug('initializing')
+
+        self.app = app
+        self.call_graph = CallGraph(app)
+        self.classifier = CallSiteClassifier(app, taint_sources, taint_sinks)
+
+    def run(self):
+        """
+        Return the relevant methods as a set of class and method names.
+        """
+        logger.debug('running')
+
+        relevant = set()
+        worklist = self.find_seeds()
+        while (worklist):
+            self.propagate(relevant, worklist)
+
+            # Relevant methods write more fields, so getters are searched until no more is found
+            worklist = self.find_getters(relevant)
+
+        self.isolate(relevant)
+
+        logger.info(f'{len(relevant)} of {len(self.call_graph.get_methods())} methods are relevant')
+
+        return relevant
+
+    def propagate(self, relevant, worklist):
+        """
+        Add methods in the worklist, their callers, and writers of fields they read to the relevant methods.
+        """
+        while (worklist):
+            method = worklist.pop()
+            if (method in relevant):
+                continue
+            relevant.add(method)
+
+            for caller, targets in self.call_graph.sites_by_target[method]:
+                worklist.append(caller)
+                worklist.extend(targets)
+
+            for field_name in self.call_graph.reads[method]:
+                worklist.extend(self.call_graph.writers[field_name])
+
+    def find_getters(self, relevant):
+        """
+        Return irrelevant methods invoked by relevant methods, which read fields written by relevant methods or invoke such methods.
+        """
+        written = set()
+        [ written.update(self.call_graph.writes[method]) for method in relevant ]
+
+        # Methods reaching reads of the written fields, searched backward from the readers through their callers
+        reaching = set()
+        worklist = [ method for method, field_names in self.call_graph.reads.items() if not field_names.isdisjoint(written) ]
+        while (worklist):
+            method = worklist.pop()
+            if (method in reaching):
+                continue
+            reaching.add(method)
+
+            worklist.extend( caller for caller, _ in self.call_graph.sites_by_target[method] )
+
+        return [ target for method in relevant
+                        for _, targets in self.call_graph.sites[method]
+                        for target in targets
+                        if target not in relevant and target in reaching ]
+
+    def find_seeds(self):
+        """
+        Return class initializers, and methods invoking taint sources, sinks, and methods classified specially by the emulator.
+        """
+        seeds = [ (clss, method) for clss, method in self.call_graph.get_methods() if method == '<clinit>()V' ]
+        for (clss, method), sites in self.call_graph.sites.items():
+            for inst, _ in sites:
+                call_site = self.classifier.classify(inst, clss)
+                if (call_site.source is not None or
+                    call_site.sink_types or
+                    call_site.reflective_call or
+                    call_site.reflective_field_access or
+                    call_site.icc is not None):
+                    seeds.append((clss, method))
+                    break
+
+        return seeds
+
+    def isolate(self, relevant):
+        """
+        Mark invocations of only irrelevant methods in relevant methods as not in-app.
+        """
+        for method in relevant:
+            for inst, targets in self.call_graph.sites[method]:
+                if (inst.in_app and not any( target in relevant for target in targets )):
+                    inst.in_app = False
@@ -1,2 +1,24 @@
+from dataclasses import dataclass, field
 
-# TODO: Define Edge and Node for control flow analysis.
+
+@dataclass
+class Edge:
+    """
+    Store a control flow edge between basic blocks.
+    """
+    source: int = None       # Line number of the source node
+    destination: int = None  # Line number of the destination node
+    kind: str = None         # fallthrough, branch, goto, switch, or exception
+
+@dataclass
+class Node:
+    """
+    Store a basic block of a method.
+    """
+    num: int = None  # Line number of the first instruction
+    lines: list = field(default_factory=list)  # Line numbers of the instructions in the order of execution
+
+    successors: list = field(default_factory=list)    # Outgoing edges
+    predecessors: list = field(default_factory=list)  # Incoming edges
+
+    handler: bool = False  # Indicate that the block starts at a catch label
@@ -0,0 +1,303 @@
+import os
+import json
+import time
+import signal
+import logging
+import pathlib
+import multiprocessing
+from collections import Counter
+
+from .project import Project
+from .utils.tool_worker import ToolWorker
+
+logger = logging.getLogger(name=__name__)
+
+
+# Stages of processing an apk, in the order that they run
+STAGES = ['load', 'instrument', 'create_new_apk', 'save']
+
+def run_batch_job(apk, options, connection):
+    """
+    Process an apk in a child process, and send the result to the parent.
+    The child leads a new process group, so that the parent can kill it with its subprocesses, such as apktool and the tool worker.
+
+    :param apk:         Path to the apk.
+    :param options:     Options of the stages.
+    :param connection:  Connection to the parent.
+    """
+    os.setpgrp()
+
+    # The tool worker is shared by the stages of the apk
+    tool_worker = None
+    if (options['tool_worker'] is not None):
+        tool_worker = ToolWorker(**options['tool_worker'])
+
+    durations = {}
+    stage = None
+    try:
+        for stage in STAGES:
+            start = time.perf_counter()
+            if (stage == 'load'):
+                project = Project(apk, tool_worker=tool_worker, **options['project'])
+                if (options['keystore'] is not None):
+                    project.configure_keystore(**options['keystore'])
+            elif (stage == 'instrument'):
+                project.instrument(**options['instrument'])
+            elif (stage == 'create_new_apk'):
+                project.create_new_apk(options['signer'])
+            elif (stage == 'save'):
+                project.save(**options['save'])
+            durations[stage] = time.perf_counter() - start
+
+        connection.send({'status': 'done', 'stage': None, 'error': None, 'durations': durations})
+    except Exception as e:
+        connection.send({'status': 'failed', 'stage': stage, 'error': repr(e), 'durations': durations})
+    finally:
+        if (tool_worker is not None):
+            tool_worker.stop()
+        connection.close()
+
+def get_tree_rss(pid):
+    """
+    Return RSS in bytes of the process and its descendants.
+    Return 0 if /proc is unavailable.
+    """
+    rss = 0
+    pids = [pid]
+    while (pids):
+        pid = pids.pop()
+        try:
+            with open(f'/proc/{pid}/statm') as f:
+                rss += int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            for task in os.listdir(f'/proc/{pid}/task'):
+                with open(f'/proc/{pid}/task/{task}/children') as f:
+                    pids.extend( int(child) for child in f.read().split() )
+        except (OSError, ValueError):
+            # The process has exited
+            continue
+
+    return rss
+
+
+class BatchProcessor:
+    """
+    Instrument many apks over a bounded pool of child processes.
+
+    Each apk is loaded, instrumented, repackaged, and saved in its own child process.
+    A child crashing, exceeding the timeout, or exceeding the memory cap is killed without affecting the others.
+    The result of each apk is appended to a journal, which is a JSON-lines file.
+    If the batch is interrupted, running it again with the same journal skips the recorded apks.
+    """
+
+    # Seconds between checks of the running children
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, apks, journal, workers=1, timeout=3600, memory_cap=None, retry_failed=False,
+                 project_options={}, keystore=None, instrument_options={}, signer='jarsigner', save_options={},
+                 tool_worker=None):
+        """
+        :param apks:                Paths to apks.
+        :param journal:             Path to the journal.
+        :param workers:             Number of apks processed in parallel.
+        :param timeout:             Maximum seconds for processing an apk.
+        :param memory_cap:          Maximum RSS in bytes of a child process and its subprocesses. If None, memory usage is not bounded.
+        :param retry_failed:        If true, apks recorded as not done are processed again.
+        :param project_options:     Keyword arguments of Project.
+        :param keystore:            Keyword arguments of Project.configure_keystore.
+        :param instrument_options:  Keyword arguments of Project.instrument.
+        :param signer:              Signer passed to Project.create_new_apk.
+        :param save_options:        Keyword arguments of Project.save.
+        :param tool_worker:         Keyword arguments of ToolWorker, i.e., cmd and tools, or None.
+                                    If given, each child process starts a worker running the tool commands of its apk.
+        """
+        logger.debug('initializing')
+
+        self.apks = [ str(pathlib.Path(apk).resolve()) for apk in apks ]
+        self.journal = pathlib.Path(journal)
+        self.workers = workers
+        self.timeout = timeout
+        self.memory_cap = memory_cap
+        self.retry_failed = retry_failed
+
+        self.options = {
+            'project': project_options,
+            'keystore': keystore,
+            'instrument': instrument_options,
+            'signer': signer,
+            'save': save_options,
+            'tool_worker': tool_worker,
+        }
+
+    def run(self):
+        """
+        Process apks not recorded in the journal, and return the summary of all recorded apks.
+        """
+        records = self.load_journal()
+        pending = [ apk for apk in self.apks
+                    if (apk not in records.keys() or (self.retry_failed and records[apk]['status'] != 'done')) ]
+        logger.info(f'processing {len(pending)} apks, skipping {len(self.apks) - len(pending)} recorded apks')
+
+        running = {}
+        try:
+            while (pending or running):
+                while (pending and len(running) < self.workers):
+                    apk = pending.pop(0)
+                    running[apk] = self.start_job(apk)
+
+                for apk, job in list(running.items()):
+                    record = self.check_job(apk, job)
+                    if (record is not None):
+                        del running[apk]
+                        records[apk] = record
+                        self.write_journal(record)
+
+                if (running):
+                    time.sleep(self.POLL_INTERVAL)
+        finally:
+            # Interrupted, so kill the children. Their apks are processed again at the next run.
+            for apk, job in running.items():
+                self.kill_job(job)
+
+        summary = self.get_summary([ records[apk] for apk in self.apks if apk in records.keys() ])
+        self.report(summary)
+
+        return summary
+
+    def load_journal(self):
+        """
+        Return the last record of each apk in the journal.
+        """
+        records = {}
+        if (self.journal.exists()):
+            with open(self.journal, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line partially written at an interruption
+                        logger.warning(f'skipping a broken journal line {line = }')
+                        continue
+                    records[record['apk']] = record
+
+        return records
+
+    def write_journal(self, record):
+        """
+        Append the record to the journal.
+        """
+        logger.info(f'{record["apk"]} is {record["status"]}')
+
+        with open(self.journal, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def start_job(self, apk):
+        """
+        Start a child process processing the apk.
+        """
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=run_batch_job, args=(apk, self.options, sender))
+        process.start()
+        sender.close()
+
+        return {'process': process, 'connection': receiver, 'started': time.perf_counter(), 'peak_rss': 0}
+
+    def check_job(self, apk, job):
+        """
+        Return the record of the apk if the job is finished, otherwise None.
+        """
+        process = job['process']
+        elapsed = time.perf_counter() - job['started']
+
+        result = self.receive_result(job['connection'])
+
+        if (result is None):
+            if (process.is_alive()):
+                rss = get_tree_rss(process.pid)
+                job['peak_rss'] = max(job['peak_rss'], rss)
+
+                if (elapsed > self.timeout):
+                    result = {'status': 'timeout', 'error': f'{self.timeout = } exceeded'}
+                elif (self.memory_cap is not None and rss > self.memory_cap):
+                    result = {'status': 'memory', 'error': f'{rss = } exceeded {self.memory_cap = }'}
+                else:
+                    return None
+
+            else:
+                # The child may have sent the result and exited after the poll above
+                result = self.receive_result(job['connection'])
+                if (result is None):
+                    result = {'status': 'crashed', 'error': f'{process.exitcode = }'}
+
+            # Results sent by the child already have the stage and durations
+            result.setdefault('stage', None)
+            result.setdefault('durations', {})
+
+        self.kill_job(job)
+
+        return {'apk': apk, **result, 'elapsed': elapsed, 'peak_rss': job['peak_rss']}
+
+    @staticmethod
+    def receive_result(connection):
+        """
+        Return the result sent by the child, or None if it has not been sent.
+        """
+        if (connection.poll()):
+            try:
+                return connection.recv()
+            except EOFError:
+                # The child exited without sending the result
+                pass
+
+        return None
+
+    @staticmethod
+    def kill_job(job):
+        """
+        Kill the child process and its subprocesses, and release them.
+        """
+        process = job['process']
+        if (process.is_alive()):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                process.kill()
+        process.join()
+        job['connection'].close()
+
+    @staticmethod
+    def get_summary(records):
+        """
+        Return the numbers of apks per status and statistics of durations per stage.
+        """
+        summary = {
+            'apks': len(records),
+            'statuses': dict(Counter( record['status'] for record in records )),
+            'stages': {},
+        }
+
+        for stage in STAGES:
+            durations = [ record['durations'][stage] for record in records if stage in record['durations'].keys() ]
+            if (durations):
+                summary['stages'][stage] = {
+                    'count': len(durations),
+                    'total': sum(durations),
+                    'mean': sum(durations) / len(durations),
+                    'max': max(durations),
+                }
+
+        failed_stages = Counter( record['stage'] for record in records if record['status'] == 'failed' )
+        summary['failed_stages'] = dict(failed_stages)
+
+        return summary
+
+    @staticmethod
+    def report(summary):
+        """
+        Log the summary.
+        """
+        logger.info(f'{summary["apks"]} apks, {summary["statuses"] = }, {summary["failed_stages"] = }')
+        for stage, stats in summary['stages'].items():
+            logger.info(f'{stage:<16} count {stats["count"]:6}, total {stats["total"]:10.1f} s, '
+                        f'mean {stats["mean"]:8.1f} s, max {stats["max"]:8.1f} s')
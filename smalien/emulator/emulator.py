@@ -1,6 +1,7 @@
 import logging
 
 from .structures import EmulationData
+from .memory_manager import MemoryManager
 from .flow_detail_logger import FlowDetailLogger
 from .vm_manager.vm_manager import VMManager
 from .interpreter.interpreter import Interpreter
@@ -21,7 +22,7 @@ class Emulator:
     Virtual machines are created based on PID and TID.
     """
 
-    def __init__(self, app, workspace, taint_sources, taint_sinks, detect_failures=True, calculate_coverage=True):
+    def __init__(self, app, workspace, taint_sources, taint_sinks, detect_failures=True, calculate_coverage=True, memory_budget=None):
         logger.debug('initializing')
 
         self.app = app
@@ -45,9 +46,17 @@ class Emulator:
                                     self.data.instances,
                                     self.data.static_fields,
                                     self.data.intent_data,
-                                    self.interpreter.modules,
+                                    self.interpreter.plans,
                                     self.detect_failures)
 
+        # Bound memory usage if the budget is given
+        self.memory_manager = None
+        if (memory_budget is not None):
+            self.memory_manager = MemoryManager(self.data,
+                                                self.interpreter.taint_tracker.recorder,
+                                                workspace,
+                                                memory_budget)
+
         # Setup flow detail log path
         FlowDetailLogger.open_flow_detail_log_file(workspace)
 
@@ -81,8 +90,41 @@ class Emulator:
         """
         logger.debug('running with runtime logs')
 
-        for vm_order in self.runtime_log_manager.run():
-            # TODO: Implement timeout and memory limit
+        self.run_vm_orders(self.runtime_log_manager.run())
+
+    def run_with_live_logs(self, stream, on_leak=None):
+        """
+        Run the emulator with runtime logs streamed while the app is being exercised.
+        VM orders are run as records arrive, and the emulation finishes at the end of the stream.
+
+        :param stream:   Iterable of lines of the runtime log, e.g., LiveLogStream.
+        :param on_leak:  Function called with each leak as it is found.
+        """
+        logger.debug('running with live logs')
+
+        self.run_vm_orders(self.report_leaks(self.runtime_log_manager.run_live(stream), on_leak))
+
+    def report_leaks(self, vm_orders, on_leak):
+        """
+        Pass the VM orders through, and report leaks found while running each of them.
+        """
+        found_sinks = self.get_found_sinks()
+        reported = 0
+        for vm_order in vm_orders:
+            yield vm_order
+
+            for sink in found_sinks[reported:]:
+                logger.warning(f'found a leak from {sink["sources"]} at {sink["clss"]} {sink["method"]} {sink["num"]}')
+                if (on_leak is not None):
+                    on_leak(sink)
+            reported = len(found_sinks)
+
+    def run_vm_orders(self, vm_orders):
+        """
+        Run the emulator with the given VM orders.
+        """
+        for vm_order in vm_orders:
+            # TODO: Implement timeout
             try:
                 self.run(vm_order)
             except Exception as e:
@@ -91,9 +133,15 @@ class Emulator:
                 else:
                     raise e
 
+            if (self.memory_manager):
+                self.memory_manager.run()
+
         # Trigger callback methods statically
         self.vm_manager.finish_the_emulation()
 
+        if (self.memory_manager):
+            self.memory_manager.report()
+
     def get_found_sources(self):
         """
         Return results of found sources.
@@ -138,6 +186,12 @@ class Emulator:
         """
         return self.runtime_log_manager.get_coverage()
 
+    def get_peak_rss(self):
+        """
+        Returns peak RSS of the process in bytes.
+        """
+        return MemoryManager.get_peak_rss()
+
     def get_log_num(self):
         """
         Returns the number of logs.
@@ -0,0 +1,84 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+
+from .reflection_resolver import ReflectiveCallDetector, ReflectiveFieldDetector
+from smalien.taint_definitions.definition_matcher import get_matcher
+from smalien.utils.slotted_state import SlottedState
+
+logger = logging.getLogger(name=__name__)
+
+
+ICC_CLASSES = [
+    'Landroid/app/Activity;',
+    'Landroid/content/Context;',
+]
+
+@dataclass(slots=True)
+class CallSite(SlottedState):
+    """
+    Classification of an invoke instruction, which is the same at every execution.
+    """
+    digest: str                          # Digest of the taint definitions used for the classification
+    invoked_class_name: str              # Invoked class, replaced with the parent class if the class invokes its own method
+    source: str = None                   # Name of the taint source if the invoked method is a source
+    sink_types: tuple = ()               # Types of sink definitions matching the invoked method, such as sink and pre-sink
+    reflective_call: bool = False        # Indicate that the invocation is a reflective call
+    reflective_field_access: bool = False  # Indicate that the invocation is a reflective field access
+    icc: str = None                      # ICC sending an intent or a message, startactivity or send
+
+
+class CallSiteClassifier:
+    """
+    Classify invoke instructions, and cache the classification on the instructions.
+
+    The classification is computed at the first execution of each invoke instruction.
+    It is kept with a digest of the taint definitions, so it is computed again if the definitions change.
+    """
+
+    def __init__(self, app, taint_source_definition, taint_sink_definition):
+        logger.debug('initializing')
+
+        self.classes = app.classes
+        self.source_matcher = get_matcher(taint_source_definition, 'exact')
+        self.sink_matcher = get_matcher(taint_sink_definition, 'substring')
+        self.digest = hashlib.sha1(repr((taint_source_definition, taint_sink_definition)).encode()).hexdigest()
+
+    def get(self, inst, clss):
+        """
+        Return the classification of the invoke instruction.
+
+        :param inst:  Invoke instruction.
+        :param clss:  Class containing the instruction.
+        """
+        call_site = inst.call_site
+        if (call_site is None or call_site.digest != self.digest):
+            call_site = inst.call_site = self.classify(inst, clss)
+
+        return call_site
+
+    def classify(self, inst, clss):
+        """
+        Classify the invoke instruction.
+        """
+        if (inst.class_name == clss):
+            # Invoked class name matches to self class, so use self class's super class.
+            invoked_class_name = self.classes[clss].parent
+        else:
+            invoked_class_name = inst.class_name
+
+        icc = None
+        if (invoked_class_name in ICC_CLASSES and
+            inst.method_name == 'startActivity(Landroid/content/Intent;)V'):
+            icc = 'startactivity'
+        elif (inst.class_name == 'Landroid/os/Messenger;' and
+              inst.method_name == 'send(Landroid/os/Message;)V'):
+            icc = 'send'
+
+        return CallSite(digest=self.digest,
+                        invoked_class_name=invoked_class_name,
+                        source=self.source_matcher.find(inst.class_name, inst.method_name),
+                        sink_types=self.sink_matcher.find_all(invoked_class_name, inst.method_name),
+                        reflective_call=ReflectiveCallDetector.detect_reflective_calls(inst),
+                        reflective_field_access=ReflectiveFieldDetector.detect_reflective_field(inst),
+                        icc=icc)
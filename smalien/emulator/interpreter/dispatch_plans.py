@@ -0,0 +1,29 @@
+import logging
+
+logger = logging.getLogger(name=__name__)
+
+
+class DispatchPlans(dict):
+    """
+    Ordered run methods of the handlers that process each instruction kind.
+
+    A handler declares the kinds it processes in its kinds attribute, or None if it processes every kind.
+    The plan of a kind is computed when an instruction of the kind is run first, keeping the registered order of the handlers.
+    """
+
+    def __init__(self, handlers):
+        """
+        :param handlers:  Handlers in the order that they run.
+        """
+        super().__init__()
+
+        self.handlers = handlers
+
+    def __missing__(self, kind):
+        plan = tuple( handler.run for handler in self.handlers
+                      if (handler.kinds is None or kind in handler.kinds) )
+        logger.debug(f'planned {kind = } with {len(plan)} handlers')
+
+        self[kind] = plan
+
+        return plan
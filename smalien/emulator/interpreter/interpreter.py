@@ -4,6 +4,8 @@ from .reflection_resolver import ReflectionResolver
 from .value_manager.value_manager import ValueManager
 from .taint_tracker.taint_tracker import TaintTracker
 from .flow_detail_detector import FlowDetailDetectorBeforeTaint, FlowDetailDetectorAfterTaint
+from .dispatch_plans import DispatchPlans
+from .call_site_classifier import CallSiteClassifier
 
 logger = logging.getLogger(name=__name__)
 
@@ -16,12 +18,15 @@ class Interpreter:
     def __init__(self, app, taint_source_definition, taint_sink_definition, detect_failures):
         logger.debug('initializing')
 
+        # Classification of invoke instructions shared by modules
+        self.call_site_classifier = CallSiteClassifier(app, taint_source_definition, taint_sink_definition)
+
         # Initialize modules
         self.value_manager = ValueManager(app, detect_failures)
-        self.taint_tracker = TaintTracker(app, taint_source_definition, taint_sink_definition, detect_failures)
-        self.reflection_resolver = ReflectionResolver(app, detect_failures)
-        self.flow_detail_detector_before_taint = FlowDetailDetectorBeforeTaint(app, detect_failures)
-        self.flow_detail_detector_after_taint = FlowDetailDetectorAfterTaint(detect_failures, taint_source_definition)
+        self.taint_tracker = TaintTracker(app, taint_source_definition, taint_sink_definition, detect_failures, self.call_site_classifier)
+        self.reflection_resolver = ReflectionResolver(app, detect_failures, self.call_site_classifier)
+        self.flow_detail_detector_before_taint = FlowDetailDetectorBeforeTaint(app, detect_failures, self.call_site_classifier)
+        self.flow_detail_detector_after_taint = FlowDetailDetectorAfterTaint(detect_failures, taint_source_definition, self.call_site_classifier)
 
         # Register modules
         self.modules = [
@@ -31,3 +36,6 @@ class Interpreter:
             self.taint_tracker,
             self.flow_detail_detector_after_taint,
         ]
+
+        # Modules to run for each instruction kind
+        self.plans = DispatchPlans(self.modules)
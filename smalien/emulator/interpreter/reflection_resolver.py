@@ -43,26 +43,27 @@ class ReflectionResolver:
     This class resolves target class and method names of reflective method calls.
     """
 
-    def __init__(self, app, detect_failures):
+    def __init__(self, app, detect_failures, call_site_classifier):
         logger.debug('initializing')
 
         self.app = app
         self.detect_failures = detect_failures
+        self.call_site_classifier = call_site_classifier
 
-    def run(self, **kwargs):
+    # Instruction kinds processed by the resolver
+    kinds = {'invoke'}
+
+    def run(self, inst, sf, instances, static_fields, intent_data, vm, self_ptids, vms):
         """
         Run the reflection resolver.
         """
-
-        inst = kwargs['inst']
-
         if (inst.kind != 'invoke'):
             return
 
-        is_reflective_call = ReflectiveCallDetector.detect_reflective_calls(inst)
-        if (is_reflective_call):
+        call_site = self.call_site_classifier.get(inst, sf.clss)
+        if (call_site.reflective_call):
             try:
-                self.resolve(**kwargs)
+                self.resolve(inst=inst, sf=sf)
             except Exception as e:
                 if (self.detect_failures):
                     raise e
@@ -71,10 +72,9 @@ class ReflectionResolver:
                     pass
             return
 
-        is_reflective_field_access = ReflectiveFieldDetector.detect_reflective_field(inst)
-        if (is_reflective_field_access):
+        if (call_site.reflective_field_access):
             try:
-                self.resolve_reflective_field(**kwargs)
+                self.resolve_reflective_field(inst=inst, sf=sf)
             except Exception as e:
                 if (self.detect_failures):
                     raise e
@@ -2,6 +2,7 @@ import logging
 
 from smalien.utils.nops import Nop
 from .simple_propagators import *
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -23,12 +24,16 @@ class Propagator:
             'move_result': MoveResultTaintPropagator,
         }
 
-    def run(self, **kwargs):
+        # Instruction kinds processed by the propagator
+        self.kinds = set(self.mapping.keys())
+
+    def run(self, inst, registers, new_values, clss, method, static_fields, intent_data, after_invocation):
         """
         Run the propagator.
         """
-        logger.debug('running')
-
-        inst = kwargs['inst']
+        if (Trace.enabled):
+            logger.debug('running')
 
-        self.mapping.get(inst.kind, Nop).run(**kwargs)
+        self.mapping.get(inst.kind, Nop).run(inst=inst, registers=registers, new_values=new_values,
+                                             clss=clss, method=method, static_fields=static_fields,
+                                             intent_data=intent_data, after_invocation=after_invocation)
@@ -5,6 +5,7 @@ from .value_based_propagators import *
 from ..taint_operator import TaintOperator
 from ...value_manager.structures import ArrayInstanceValue, ClassInstanceValue
 from smalien.data_types import primitive_data_types
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -15,7 +16,8 @@ class InvokeTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -124,7 +126,8 @@ class MoveResultTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -154,7 +157,8 @@ class AputTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -172,7 +176,8 @@ class AgetTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -187,7 +192,8 @@ class IgetTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -208,7 +214,8 @@ class UnopTaintPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
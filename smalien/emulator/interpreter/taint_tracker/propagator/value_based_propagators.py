@@ -3,6 +3,7 @@ import copy
 
 from ...value_manager.structures import PrimitiveValue, ArrayInstanceValue, ClassInstanceValue
 from smalien.data_types import primitive_data_types
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -13,7 +14,8 @@ class InvokeValueBasedPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -63,8 +65,9 @@ class InvokeValueBasedPropagator:
                             value = registers[arg]
                             # Currently only target ClassInstanceValue, even though ClassReferenceValue and PrimitiveValue also appear
                             if (isinstance(value, ClassInstanceValue) and value.string is not None):
-                                logger.debug(f'saving value of {arg = } as a contained value of {inst.arguments[0] = }')
-                                logger.debug(value)
+                                if (Trace.enabled):
+                                    logger.debug(f'saving value of {arg = } as a contained value of {inst.arguments[0] = }')
+                                    logger.debug(value)
 
                                 key = InvokeValueBasedPropagator.generate_key_for_value(value)
 
@@ -76,7 +79,8 @@ class InvokeValueBasedPropagator:
                 elif (inst.reflective_call_class == 'Landroid/content/Intent;' and
                       inst.reflective_call_method == 'putExtra(Ljava/lang/String;Ljava/lang/String;)Landroid/content/Intent;'
                 ):
-                    logger.info('reflective call of Intent.putExtra')
+                    if (Trace.enabled):
+                        logger.info('reflective call of Intent.putExtra')
                     array_register = inst.arguments[-1]
 
                     for value in registers[array_register].elements:
@@ -85,8 +89,9 @@ class InvokeValueBasedPropagator:
 
     @staticmethod
     def save_intent_value(value, intent_data):
-        logger.info('saving the intent value')
-        logger.debug(value)
+        if (Trace.enabled):
+            logger.info('saving the intent value')
+            logger.debug(value)
 
         key = InvokeValueBasedPropagator.generate_key_for_value(value)
 
@@ -130,7 +135,8 @@ class MoveResultValueBasedPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -152,8 +158,9 @@ class MoveResultValueBasedPropagator:
                 key = InvokeValueBasedPropagator.generate_key_for_value(destination)
 
                 if (key in intent_data.keys()):
-                    logger.info(f'value-based propagation for {inst.destination = }')
-                    logger.info(f'{key = }')
+                    if (Trace.enabled):
+                        logger.info(f'value-based propagation for {inst.destination = }')
+                        logger.info(f'{key = }')
 
                     destination.taint = copy.deepcopy(intent_data[key].taint)
             # Prototype of matching the returned value to contained_values of the class instance
@@ -178,8 +185,9 @@ class MoveResultValueBasedPropagator:
                     key = InvokeValueBasedPropagator.generate_key_for_value(destination)
 
                     if (key in base.contained_values.keys()):
-                        logger.info(f'contained_value-based propagation for {inst.destination = }')
-                        logger.info(f'{key = }')
+                        if (Trace.enabled):
+                            logger.info(f'contained_value-based propagation for {inst.destination = }')
+                            logger.info(f'{key = }')
                         # This can take too long.
                         # logger.debug(f'{base.contained_values[key] = }')
 
@@ -191,7 +199,8 @@ class IgetValueBasedPropagator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -204,7 +213,8 @@ class IgetValueBasedPropagator:
             key = InvokeValueBasedPropagator.generate_key_for_value(destination)
 
             if (key in intent_data.keys()):
-                logger.info(f'[iget] value-based propagation for {inst.destination = }')
-                logger.info(f'{key = }')
+                if (Trace.enabled):
+                    logger.info(f'[iget] value-based propagation for {inst.destination = }')
+                    logger.info(f'{key = }')
 
                 destination.taint = copy.deepcopy(intent_data[key].taint)
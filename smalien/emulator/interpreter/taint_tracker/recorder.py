@@ -1,6 +1,9 @@
+import pickle
 import logging
+import tempfile
 
 from ..value_manager.structures import ClassInstanceValue
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -15,27 +18,28 @@ class Recorder:
 
         self.taint_history = []
 
-    def run(self, **kwargs):
+        # Keys of recorded items, including spilled ones, for finding matched items
+        self.history_keys = set()
+
+        # Taint history spilled to a file to bound memory usage
+        self.spill_file = None
+        self.spilled_num = 0
+
+    # Instruction kinds processed by the recorder, where None means all kinds
+    kinds = None
+
+    def run(self, inst, registers, new_values, clss, method, static_fields, intent_data, after_invocation):
         """
         Run the recorder.
         """
-        logger.debug('running')
-
-        inst = kwargs['inst']
-        registers = kwargs['registers']
-        clss = kwargs['clss']
-        method = kwargs['method']
+        if (Trace.enabled):
+            logger.debug('running')
 
         tainted = self.get_tainted_registers_and_fields(registers)
         if (tainted):
-            if (self.taint_history):
-                # If taint history is not empty, compare the new flow to the history elements.
-                # If they are matched, the updating is not necessary and is skipped.
-                # Parse the history in reverse because the most recent element is most likely to match.
-                for history in reversed(self.taint_history):
-                    matched = self.compare(history, clss, method, tainted)
-                    if (matched):
-                        return
+            # If the new flow matches to a history element, the updating is not necessary and is skipped.
+            if ((clss, method, tuple(tainted)) in self.history_keys):
+                return
 
             # Update taint history with the new information
             self.update_taint_history(clss, method, inst, tainted)
@@ -45,24 +49,27 @@ class Recorder:
         Extract tainted registers from register list.
         """
         tainted = []
+        tainted_fields = set()
 
         for reg, value in registers.items():
             if (value.taint is not None):
                 tainted.append(reg)
 
             # Check fields if value is reference-data-type
-            if (isinstance(value, ClassInstanceValue)):
+            if (isinstance(value, ClassInstanceValue) and value.fields):
                 for field_key, field_value in value.fields.items():
-                    if (field_key not in tainted and field_value.taint is not None):
+                    if (field_value.taint is not None and field_key not in tainted_fields):
+                        tainted_fields.add(field_key)
                         tainted.append(field_key)
 
         return tainted
 
-    def compare(self, prev, clss, method, tainted):
+    @staticmethod
+    def get_key(history):
         """
-        Compare previous history with the new information.
+        Return the key of a history item, which is the same for matched items.
         """
-        return (prev['class'] == clss and prev['method'] == method and prev['tainted'] == tainted)
+        return (history['class'], history['method'], tuple(history['tainted']))
 
     def update_taint_history(self, clss, method, inst, tainted):
         """
@@ -76,22 +83,66 @@ class Recorder:
             # 'inst': inst,
             'tainted': tainted,
         })
+        self.history_keys.add((clss, method, tuple(tainted)))
+
+    def merge_taint_history(self, taint_history):
+        """
+        Add items of the given taint history, such as one recorded by another process, skipping matched items.
+        """
+        for history in taint_history:
+            key = self.get_key(history)
+            if (key not in self.history_keys):
+                self.history_keys.add(key)
+                self.taint_history.append(history)
+
+    def spill(self, workspace):
+        """
+        Move taint history in memory to a temporary file in the workspace.
+        """
+        if (not self.taint_history):
+            return
+
+        if (Trace.enabled):
+            logger.info(f'spilling {len(self.taint_history)} items of taint history')
+
+        if (self.spill_file is None):
+            self.spill_file = tempfile.TemporaryFile(dir=workspace, prefix='taint_history_')
+
+        self.spill_file.seek(0, 2)
+        pickle.dump(self.taint_history, self.spill_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.spilled_num += len(self.taint_history)
+
+        self.taint_history = []
 
     def get_taint_history(self):
         """
         Return results of recorded taint history.
         """
-        return self.taint_history
+        if (self.spill_file is None):
+            return self.taint_history
+
+        # Load the spilled taint history
+        taint_history = []
+        self.spill_file.seek(0)
+        while (True):
+            try:
+                taint_history.extend(pickle.load(self.spill_file))
+            except EOFError:
+                break
+
+        return taint_history + self.taint_history
 
     def compare_taint_histories(self, history2):
         """
-        Compare the self history to the given history.
+        Compare the self history, including spilled items, to the given history.
         """
+        history1 = self.get_taint_history()
 
-        if (len(self.taint_history) != len(history2)):
+        if (len(history1) != len(history2)):
             return False
 
-        for i, h1 in enumerate(self.taint_history):
+        for i, h1 in enumerate(history1):
             h2 = history2[i]
 
             matched = (h1['class'] == h2['class'] and
@@ -3,9 +3,12 @@ import copy
 from collections import defaultdict
 
 from .taint_operator import TaintOperator
+from .taint_labels import TaintLabels
 from ..value_manager.structures import ClassInstanceValue
 from smalien.utils.nops import Nop
+from smalien.taint_definitions.definition_matcher import get_matcher
 from smalien.emulator.flow_detail_logger import FlowDetailLogger
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -15,23 +18,23 @@ class SinkApiDetector:
     Detect sinks based on API method names.
     """
     @staticmethod
-    def run(inst, registers, clss, method, class_data, after_invocation, found_sinks, taint_sink_definition):
-        logger.debug('running')
+    def run(inst, registers, clss, method, class_data, after_invocation, found_sinks, taint_sink_definition, call_site_classifier):
+        if (Trace.enabled):
+            logger.debug('running')
 
         # Only process an invoke instruction once when after_invocation=False
         if (after_invocation):
             return
 
         # Compare API class and method names with the pre-defined list.
-        # Decide invoked method's class
-        if (inst.class_name == clss):
-            # Invoked class name matches to self class, so use self class's super class.
-            logger.info(f'replacing class name to {class_data.parent = }')
-            invoked_class_name = class_data.parent
-        else:
-            invoked_class_name = inst.class_name
-
-        detected = SinkApiDetector.detect_sink_api(invoked_class_name, inst.method_name, taint_sink_definition, inst, registers)
+        # The invoked method's class and matched sink definitions are classified at the first execution.
+        call_site = call_site_classifier.get(inst, clss)
+        if (not call_site.sink_types):
+            return
+        invoked_class_name = call_site.invoked_class_name
+
+        detected = SinkApiDetector.detect_sink_api(invoked_class_name, inst.method_name, taint_sink_definition, inst, registers,
+                                                   sink_types=call_site.sink_types)
         if (detected):
             # The API method leaks data
             logger.warning('found a taint sink')
@@ -45,7 +48,7 @@ class SinkApiDetector:
             inst.is_sink = True
 
             # Check taint tags of the arguments
-            sources = []
+            sources = 0
             sink_values = []
             try:
                 for i, reg in enumerate(inst.arguments_without_64bit_pairs):
@@ -59,12 +62,10 @@ class SinkApiDetector:
                         logger.warning(registers[reg])
 
                         # Flow logging
-                        regs_sources = set(registers[reg].taint.sources)
-                        if ('PRE-SINK' in regs_sources):
-                            regs_sources.remove('PRE-SINK')
-                        FlowDetailLogger.write(f' {regs_sources}-{registers[reg].taint.flow_details}')
+                        regs_sources = registers[reg].taint.sources & ~TaintLabels.get_bit('PRE-SINK')
+                        FlowDetailLogger.write(f' {set(TaintLabels.to_names(regs_sources))}-{TaintOperator.get_flow_details(registers[reg].taint)}')
 
-                        sources = list(set(sources) | regs_sources)
+                        sources |= regs_sources
                         if (isinstance(registers[reg], ClassInstanceValue) and
                             registers[reg].string is not None):
                             sink_values.append(registers[reg].string)
@@ -87,7 +88,7 @@ class SinkApiDetector:
                                     'sink_class': invoked_class_name,
                                     'sink_method': inst.method_name,
                                     'sink_values': sink_values,
-                                    'sources': sources,
+                                    'sources': TaintLabels.to_names(sources),
                                     'returned_value': None,
                                    })
                 # logger.error(found_sinks[-1])
@@ -103,34 +104,37 @@ class SinkApiDetector:
         #         raise Exception('reflective call sink is found')
 
     @staticmethod
-    def detect_sink_api(class_name, method_name, taint_sinks, inst=None, registers=None, support_combination=True):
+    def detect_sink_api(class_name, method_name, taint_sinks, inst=None, registers=None, support_combination=True, sink_types=None):
         """
         Detect sink api.
+
+        :param sink_types:  Types of sink definitions matching the method if they are already known.
         """
-        if (class_name in taint_sinks.keys()):
-            for sink_method, sink_type in taint_sinks[class_name].items():
-                if (method_name.find(sink_method) > -1):
-
-                    if (sink_type == 'sink'):
-                        return True
-
-                    if (support_combination):
-                        if (sink_type == 'pre-sink'):
-                            # The API method is a pre-sink, works with combination methods and leaks data.
-                            # Assign a mark to its arguments
-                            logger.warning('pre-sink is detected')
-                            for reg in inst.arguments_without_64bit_pairs:
-                                registers[reg].taint = TaintOperator.create(['PRE-SINK'], TaintOperator.taint_tags['insensitive'])
-                                # registers[reg].taint.sources.append('PRE-SINK')
-                            return False
-
-                        elif (sink_type == 'combination'):
-                            # The API method leaks data if its argument has been processed by a pre-sink method.
-                            # Check if its argument has 'PRE-SINK' as its taint
-                            for reg in inst.arguments_without_64bit_pairs:
-                                if ('PRE-SINK' in TaintOperator.get_sources(registers[reg].taint)):
-                                    logger.warning('combination sink is detected')
-                                    return True
+        if (sink_types is None):
+            # Sink methods are matched by substrings of their signatures unless the definition specifies the rule
+            sink_types = get_matcher(taint_sinks, 'substring').find_all(class_name, method_name)
+
+        for sink_type in sink_types:
+            if (sink_type == 'sink'):
+                return True
+
+            if (support_combination):
+                if (sink_type == 'pre-sink'):
+                    # The API method is a pre-sink, works with combination methods and leaks data.
+                    # Assign a mark to its arguments
+                    logger.warning('pre-sink is detected')
+                    for reg in inst.arguments_without_64bit_pairs:
+                        registers[reg].taint = TaintOperator.create(['PRE-SINK'], TaintOperator.taint_tags['insensitive'])
+                        # registers[reg].taint.sources.append('PRE-SINK')
+                    return False
+
+                elif (sink_type == 'combination'):
+                    # The API method leaks data if its argument has been processed by a pre-sink method.
+                    # Check if its argument has 'PRE-SINK' as its taint
+                    for reg in inst.arguments_without_64bit_pairs:
+                        if (TaintOperator.has_source(registers[reg].taint, 'PRE-SINK')):
+                            logger.warning('combination sink is detected')
+                            return True
 
         return False
 
@@ -139,8 +143,9 @@ class SinkReturnedValueSaver:
     Save returned values of sinks.
     """
     @staticmethod
-    def run(inst, registers, clss, method, class_data, after_invocation, found_sinks, taint_sink_definition):
-        logger.debug('running')
+    def run(inst, registers, clss, method, class_data, after_invocation, found_sinks, taint_sink_definition, call_site_classifier):
+        if (Trace.enabled):
+            logger.debug('running')
 
         if (inst.kind == 'invoke' and
             inst.source.is_sink and
@@ -162,30 +167,29 @@ class SinkDetector:
     This class detects taint sinks to uncover behaviors.
     """
 
-    def __init__(self, classes, taint_sink_definition):
+    def __init__(self, classes, taint_sink_definition, call_site_classifier):
         logger.debug('initializing')
 
         self.classes = classes
         self.taint_sink_definition = taint_sink_definition
+        self.call_site_classifier = call_site_classifier
 
         self.mapping = {
             'invoke': SinkApiDetector,
             'move_result': SinkReturnedValueSaver,
         }
 
+        # Instruction kinds processed by the detector
+        self.kinds = set(self.mapping.keys())
+
         self.found_sinks = []
 
-    def run(self, **kwargs):
+    def run(self, inst, registers, new_values, clss, method, static_fields, intent_data, after_invocation):
         """
         Run the detector.
         """
-        logger.debug('running')
-
-        inst = kwargs['inst']
-        registers = kwargs['registers']
-        clss = kwargs['clss']
-        method = kwargs['method']
-        after_invocation = kwargs['after_invocation']
+        if (Trace.enabled):
+            logger.debug('running')
 
         class_data = self.classes[clss]
 
@@ -195,7 +199,8 @@ class SinkDetector:
                                              class_data=class_data,
                                              after_invocation=after_invocation,
                                              found_sinks=self.found_sinks,
-                                             taint_sink_definition=self.taint_sink_definition)
+                                             taint_sink_definition=self.taint_sink_definition,
+                                             call_site_classifier=self.call_site_classifier)
 
     def get_found_sinks(self):
         """
@@ -220,8 +225,9 @@ class SinkDetector:
         """
         for sink in self.found_sinks:
             sink_key = f'{sink["clss"]}-{sink["method"]}-{sink["num"]}'
-            logger.debug(f'{sink_key = }')
-            logger.debug(f'{sink["sources"] = }')
+            if (Trace.enabled):
+                logger.debug(f'{sink_key = }')
+                logger.debug(f'{sink["sources"] = }')
 
             unique_sinks[sink_key] |= set(sink['sources'])
 
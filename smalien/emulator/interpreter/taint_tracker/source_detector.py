@@ -1,8 +1,10 @@
 import logging
 
 from .taint_operator import TaintOperator
+from smalien.taint_definitions.definition_matcher import get_matcher
 from smalien.utils.nops import Nop
 from smalien.emulator.flow_detail_logger import FlowDetailLogger
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -12,13 +14,14 @@ class SourceApiDetector:
     Detect sources based on API method names.
     """
     @staticmethod
-    def run(inst, regs, clss, method, found_sources, taint_source_definition):
+    def run(inst, regs, clss, method, found_sources, taint_source_definition, call_site_classifier):
         """
         Check if the source of move-result is a taint source.
 
         :param inst: An object of move-result instruction
         """
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         if (inst.source.kind != 'invoke'):
             return
@@ -29,7 +32,8 @@ class SourceApiDetector:
         # if (invoke.class_name == 'Ljava/lang/Object;'):
         #     logger.error(invoke.last_invoked)
 
-        detected, call_type = SourceApiDetector.detect_sources(invoke, taint_source_definition)
+        detected, call_type = SourceApiDetector.detect_sources(invoke, taint_source_definition,
+                                                               call_site_classifier.get(invoke, clss))
 
         if (detected):
             logger.warning(f'found taint source {invoke.class_name} {invoke.method_name}')
@@ -40,7 +44,7 @@ class SourceApiDetector:
             # Flow logging
             FlowDetailLogger.write(f'[SOURCE] {call_type}, {detected}, {clss}, {method}, {invoke.num}\n')
             if (call_type == 'reflection'):
-                regs[inst.destination].taint.flow_details.append('source-reflection')
+                TaintOperator.add_flow_detail(regs[inst.destination].taint, 'source-reflection')
 
             # Save the result
             found_sources.append({'name': detected,
@@ -52,28 +56,34 @@ class SourceApiDetector:
                                  })
 
     @staticmethod
-    def detect_sources(invoke, taint_source_definition):
+    def detect_sources(invoke, taint_source_definition, call_site=None):
         """
         Return a list of detected sources.
+
+        :param call_site:  Classification of the invoke instruction if it is already known.
         """
 
         sources = []
         call_type = None 
 
         # Compare API class and method names with the pre-defined list.
-        candidate_apis = taint_source_definition.get(invoke.class_name)
-
-        if (candidate_apis is not None and invoke.method_name in candidate_apis.keys()):
-            sources = [candidate_apis[invoke.method_name]]
+        matcher = get_matcher(taint_source_definition, 'exact')
+        if (call_site is not None):
+            source = call_site.source
+        else:
+            source = matcher.find(invoke.class_name, invoke.method_name)
+
+        if (source is not None):
+            sources = [source]
             call_type = 'normal'
 
         # For reflective calls
         elif (invoke.reflective_call_class is not None and invoke.reflective_call_method is not None):
 
-            candidate_apis = taint_source_definition.get(invoke.reflective_call_class)
+            source = matcher.find(invoke.reflective_call_class, invoke.reflective_call_method)
 
-            if (candidate_apis is not None and invoke.reflective_call_method in candidate_apis.keys()):
-                sources = [candidate_apis[invoke.reflective_call_method]]
+            if (source is not None):
+                sources = [source]
                 call_type = 'reflection'
 
             # # Clear the current reflective call data
@@ -138,10 +148,11 @@ class SourceDetector:
     This class detects taint sources to introduce taints.
     """
 
-    def __init__(self, taint_source_definition):
+    def __init__(self, taint_source_definition, call_site_classifier):
         logger.debug('initializing')
 
         self.taint_source_definition = taint_source_definition
+        self.call_site_classifier = call_site_classifier
 
         self.mapping = {
             # 'const': SourceConstDetector,
@@ -149,24 +160,24 @@ class SourceDetector:
             # 'invoke': ReflectionSourceApiDetector,
         }
 
+        # Instruction kinds processed by the detector
+        self.kinds = set(self.mapping.keys())
+
         self.found_sources = []
 
-    def run(self, **kwargs):
+    def run(self, inst, registers, new_values, clss, method, static_fields, intent_data, after_invocation):
         """
         Run the detector.
         """
-        logger.debug('running')
-
-        inst = kwargs['inst']
-        registers = kwargs['registers']
-        clss = kwargs['clss']
-        method = kwargs['method']
+        if (Trace.enabled):
+            logger.debug('running')
 
         # Detect source based on instruction
         self.mapping.get(inst.kind, Nop).run(inst=inst, regs=registers,
                                              clss=clss, method=method,
                                              found_sources=self.found_sources,
-                                             taint_source_definition=self.taint_source_definition)
+                                             taint_source_definition=self.taint_source_definition,
+                                             call_site_classifier=self.call_site_classifier)
 
         # Detect source based on values
         # TODO: Implement this.
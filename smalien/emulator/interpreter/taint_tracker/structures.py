@@ -1,6 +1,9 @@
+import copy
 from typing import Dict
 from dataclasses import dataclass, field
 
+from .taint_labels import TaintLabels
+
 # TODO: Remove this after re-organized project
 # from ..value_manager.structures import Value
 # from ....parsers.opcode.structures import Opcode
@@ -14,14 +17,38 @@ class Taint:
     # Tag value
     tag: int = 0
 
-    # Sources of the tracked information
-    sources: list = field(default_factory=list)
+    # Sources of the tracked information, a bitmask of TaintLabels
+    sources: int = 0
 
     # Values at the sources
     values: list = field(default_factory=list)
 
-    # For flow logging
-    flow_details: list = field(default_factory=list)
+    # For flow logging, a bitmask of TaintLabels
+    flow_details: int = 0
+
+    def __repr__(self):
+        return (f'Taint(tag={self.tag!r}, sources={TaintLabels.to_names(self.sources)!r}, '
+                f'values={self.values!r}, flow_details={TaintLabels.to_names(self.flow_details)!r})')
+
+    def __deepcopy__(self, memo):
+        return Taint(tag=self.tag, sources=self.sources,
+                     values=copy.deepcopy(self.values, memo),
+                     flow_details=self.flow_details)
+
+    def __getstate__(self):
+        # Bits of labels differ between processes, so labels are pickled as names
+        return {
+            'tag': self.tag,
+            'sources': TaintLabels.to_names(self.sources),
+            'values': self.values,
+            'flow_details': TaintLabels.to_names(self.flow_details),
+        }
+
+    def __setstate__(self, state):
+        self.tag = state['tag']
+        self.sources = TaintLabels.to_mask(state['sources'])
+        self.values = state['values']
+        self.flow_details = TaintLabels.to_mask(state['flow_details'])
 
 # TaintSource and TaintSink are urrently not used
 # @dataclass
@@ -0,0 +1,55 @@
+import logging
+
+logger = logging.getLogger(name=__name__)
+
+
+class TaintLabels:
+    """
+    Intern taint labels, i.e., source names and flow details, to bits.
+
+    A set of labels is stored as an int bitmask, so merging sets is a bitwise or and checking a label is a bitwise and.
+    Bits are assigned in the order that labels appear, and they are only valid in the process.
+    Hence, bitmasks are converted to names when they are shown or pickled.
+    """
+
+    # Bits of labels
+    bits = {}
+
+    # Labels in the order of their bits
+    names = []
+
+    @staticmethod
+    def get_bit(name):
+        """
+        Return the bit of the label, assigning a new bit if the label is new.
+        """
+        bit = TaintLabels.bits.get(name)
+        if (bit is None):
+            bit = TaintLabels.bits[name] = 1 << len(TaintLabels.names)
+            TaintLabels.names.append(name)
+
+        return bit
+
+    @staticmethod
+    def to_mask(names):
+        """
+        Return the bitmask of the given labels.
+        """
+        mask = 0
+        for name in names:
+            mask |= TaintLabels.get_bit(name)
+
+        return mask
+
+    @staticmethod
+    def to_names(mask):
+        """
+        Return the labels of the given bitmask in the order of their bits.
+        """
+        names = []
+        while (mask):
+            bit = mask & -mask
+            names.append(TaintLabels.names[bit.bit_length() - 1])
+            mask ^= bit
+
+        return names
@@ -1,5 +1,6 @@
 import logging
 from .structures import Taint
+from .taint_labels import TaintLabels
 
 logger = logging.getLogger(name=__name__)
 
@@ -18,8 +19,10 @@ class TaintOperator:
     def create(sources, tag=taint_tags['sensitive']):
         """
         Create a sensitive taint tag.
+
+        :param sources:  Names of the sources.
         """
-        return Taint(tag=tag, sources=sources)
+        return Taint(tag=tag, sources=TaintLabels.to_mask(sources))
 
     # @staticmethod
     # def clear(taint):
@@ -41,16 +44,37 @@ class TaintOperator:
     @staticmethod
     def get_sources(taint):
         """
-        Get sources.
+        Get names of the sources.
         """
         if (taint is not None):
-            return taint.sources
+            return TaintLabels.to_names(taint.sources)
         return []
 
+    @staticmethod
+    def has_source(taint, source):
+        """
+        Check if the taint has the source.
+        """
+        return (taint is not None and (taint.sources & TaintLabels.get_bit(source)) != 0)
+
+    @staticmethod
+    def add_flow_detail(taint, flow_detail):
+        """
+        Add the flow detail to the taint.
+        """
+        taint.flow_details |= TaintLabels.get_bit(flow_detail)
+
+    @staticmethod
+    def get_flow_details(taint):
+        """
+        Get the flow details of the taint.
+        """
+        return TaintLabels.to_names(taint.flow_details)
+
     @staticmethod
     def merge_taint(taint1, taint2):
         """
         Merge taint2 into taint1.
         """
-        taint1.sources = list(set(taint1.sources) | set(taint2.sources))
-        taint1.flow_details = list(set(taint1.flow_details) | set(taint2.flow_details))
+        taint1.sources |= taint2.sources
+        taint1.flow_details |= taint2.flow_details
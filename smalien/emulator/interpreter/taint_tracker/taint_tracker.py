@@ -4,6 +4,7 @@ from .recorder import Recorder
 from .propagator.propagator import Propagator
 from .source_detector import SourceDetector
 from .sink_detector import SinkDetector
+from ..dispatch_plans import DispatchPlans
 
 logger = logging.getLogger(name=__name__)
 
@@ -13,15 +14,15 @@ class TaintTracker:
     This class runs taint logics that interpret app's instructions.
     """
 
-    def __init__(self, app, taint_source_definition, taint_sink_definition, detect_failures):
+    def __init__(self, app, taint_source_definition, taint_sink_definition, detect_failures, call_site_classifier):
         logger.debug('initializing')
 
         self.app = app
         self.detect_failures = detect_failures
 
         # Initialize modules
-        self.source_detector = SourceDetector(taint_source_definition)
-        self.sink_detector = SinkDetector(self.app.classes, taint_sink_definition)
+        self.source_detector = SourceDetector(taint_source_definition, call_site_classifier)
+        self.sink_detector = SinkDetector(self.app.classes, taint_sink_definition, call_site_classifier)
         self.propagator = Propagator()
         self.recorder = Recorder()
 
@@ -36,21 +37,19 @@ class TaintTracker:
             self.recorder,
         ]
 
-    def run(self, **kwargs):
+        # Taint logics to run for each instruction kind
+        self.plans = DispatchPlans(self.taint_logics)
+
+    # Instruction kinds processed by the tracker, where None means all kinds
+    kinds = None
+
+    def run(self, inst, sf, instances, static_fields, intent_data, vm, self_ptids, vms):
         """
         Run the taint logics.
         """
-
-        inst = kwargs['inst']
-        sf = kwargs['sf']
-        static_fields = kwargs['static_fields']
-        intent_data = kwargs['intent_data']
-
         try:
-            for taint_logic in self.taint_logics:
-                taint_logic.run(inst=inst, registers=sf.registers, new_values=sf.new_values,
-                                clss=sf.clss, method=sf.method, static_fields=static_fields,
-                                intent_data=intent_data, after_invocation=sf.after_invocation)
+            for run in self.plans[inst.kind]:
+                run(inst, sf.registers, sf.new_values, sf.clss, sf.method, static_fields, intent_data, sf.after_invocation)
         except Exception as e:
             # raise e
 
@@ -2,6 +2,7 @@ import logging
 import copy
 
 from ..value_resolver_utils import ValueResolver
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -17,7 +18,8 @@ class ArrayNewInstanceValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         registers = kwargs['registers']
 
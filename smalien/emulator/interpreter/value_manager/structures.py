@@ -3,10 +3,11 @@ from dataclasses import dataclass, field
 
 from ..taint_tracker.structures import Taint
 from smalien.parsers.opcode.structures import Opcode
+from smalien.utils.slotted_state import SlottedState
 
 
-@dataclass
-class Value:
+@dataclass(slots=True)
+class Value(SlottedState):
     """
     Base class for containing a register's value.
     """
@@ -17,19 +18,19 @@ class Value:
     # Taint data
     taint: Taint = None
 
-@dataclass
+@dataclass(slots=True)
 class PrimitiveValue(Value):
     """
     Contain a register's primitive value.
     """
 
-@dataclass
+@dataclass(slots=True)
 class PrimitiveValue64(PrimitiveValue):
     """
     Contain a register's 64-bit primitive value.
     """
 
-@dataclass
+@dataclass(slots=True)
 class ArrayInstanceValue(Value):
     """
     Contain a register's array instance value.
@@ -42,7 +43,7 @@ class ArrayInstanceValue(Value):
     last_invoked: Opcode = None  # Keep this instance's last-invoked method information
     last_invoked_arguments: list = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class ClassInstanceValue(Value):
     """
     Contain a register's class instance value.
@@ -70,7 +71,7 @@ class ClassInstanceValue(Value):
     # If the class is not string-data-type, the value will be None.
     string: str = None
 
-@dataclass
+@dataclass(slots=True)
 class ClassReferenceValue(Value):
     """
     Contain a reference to the class, generated by const-class instruction.
@@ -3,6 +3,7 @@ import json
 
 from .structures import PrimitiveValue, PrimitiveValue64, ArrayInstanceValue, ClassInstanceValue, ClassReferenceValue
 from smalien.data_types import primitive_data_types, numeric_types_integer, numeric_types_floating_point, numeric_types_64, boolean_type, character_type, byte_type, string_types, string_types_identifier_logged, NULL_REPRESENTATION, JAVA_TO_SMALI_PRIMITIVE_TYPE_CLASS
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -42,7 +43,8 @@ class PrimitiveValueGenerator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         value = kwargs['value']
         data_type = kwargs['data_type']
@@ -98,7 +100,8 @@ class ArrayInstanceValueGenerator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         value = kwargs['value']
         data_type = kwargs['data_type']
@@ -196,7 +199,8 @@ class ClassInstanceValueGenerator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         value = kwargs['value']
         data_type = kwargs['data_type']
@@ -229,8 +233,9 @@ class ClassInstanceValueGenerator:
                 # just copying the value to the string.
                 string = value
 
-        logger.debug(f'{data_type = }')
-        logger.debug(f'{value = }')
+        if (Trace.enabled):
+            logger.debug(f'{data_type = }')
+            logger.debug(f'{value = }')
         # assert value is None or str(value).find(':') < 0, f'{value = } must not have ":"'
         assert str(value).find(':') < 0, f'{value = } must not have ":"'
 
@@ -243,7 +248,8 @@ class ClassReferenceValueGenerator:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         value = kwargs['value']
         data_type = kwargs['data_type']
@@ -3,6 +3,7 @@ import logging
 from .mapping import mapping
 from ...vm_manager.exceptions import ExceptionOccurException, ClinitInvokedException
 from smalien.utils.nops import Nop
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -20,14 +21,15 @@ class ValueManager:
 
         self.mapping = mapping
 
-    def run(self, **kwargs):
+        # Instruction kinds processed by the updater
+        self.kinds = set(self.mapping.keys())
+
+    def run(self, inst, sf, instances, static_fields, intent_data, vm, self_ptids, vms):
         """
         Run the updater.
         """
-        logger.debug('running')
-
-        inst = kwargs['inst']
-        sf = kwargs['sf']
+        if (Trace.enabled):
+            logger.debug('running')
 
         try:
             self.mapping.get(inst.kind, Nop).run(inst=inst,
@@ -37,14 +39,14 @@ class ValueManager:
                                                  new_values=sf.new_values,
                                                  previous=sf.previous,
                                                  after_invocation=sf.after_invocation,
-                                                 instances=kwargs['instances'],
-                                                 static_fields=kwargs['static_fields'],
+                                                 instances=instances,
+                                                 static_fields=static_fields,
                                                  mattr=self.classes[sf.clss].methods[sf.method].attribute,
                                                  is_constructor=self.classes[sf.clss].methods[sf.method].is_constructor,
                                                  classes=self.classes,
-                                                 vm = kwargs['vm'],
-                                                 self_ptids=kwargs['self_ptids'],
-                                                 vms=kwargs['vms'],
+                                                 vm=vm,
+                                                 self_ptids=self_ptids,
+                                                 vms=vms,
                                                  detect_failures=self.detect_failures)
         except ExceptionOccurException as e:
             raise e
@@ -10,7 +10,9 @@ from ..reflection_resolver import REFLECTIVE_FIELD_ACCESS
 # from .api_call_edge_value_resolvers.api_call_edge_value_resolvers import api_call_edge_value_resolvers
 from ...vm_manager.structures import StackFrameEntry
 from ...vm_manager.exceptions import ExceptionOccurException, ClinitInvokedException
+from smalien.parsers.opcode.evaluators import get_evaluator
 from smalien.data_types import primitive_data_types, numeric_types_64, numeric_types_floating_point, string_types, NULL_REPRESENTATION
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -28,7 +30,8 @@ class MethodHeadValueResolver:
         If an argument is reference data type, the instance is shared with the caller and callee,
         and tainting the instance at the callee causes the instance tainted at the caller.
         """
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -54,7 +57,8 @@ class MethodHeadValueResolver:
             Hence, a value is copied from an item of array instances[representation] to p0.
             If the value does not exist, the value is created first.
             '''
-            logger.info('this instance method is called by the system')
+            if (Trace.enabled):
+                logger.info('this instance method is called by the system')
 
             # Match the base object
             base = inst.parameters[0]
@@ -94,7 +98,8 @@ class MethodHeadValueResolver:
 #             else:
             if (True):
                 # New thread is created
-                logger.info('new thread is created')
+                if (Trace.enabled):
+                    logger.info('new thread is created')
                 # Propagate based on the base object's last_invoked.
                 # Using information of last-invoked is currently limited and only targets cases where the lengths of argument and parameters are same
                 # because it can falsely propagate primitive-data-type arguments to non-primitive-data-type parameters.
@@ -102,7 +107,8 @@ class MethodHeadValueResolver:
                 # TODO: Check if the all arguments' and parameters' data types have one-to-one matching.
                 data_types_matched = MethodHeadValueResolver.match_data_types_between_arguments_and_parameters(registers[base].last_invoked, inst)
                 if (data_types_matched):
-                    logger.info('the base object last invoked is saved')
+                    if (Trace.enabled):
+                        logger.info('the base object last invoked is saved')
                     # logger.info(registers[base].last_invoked)
 
                     # Copy values of non-base arguments
@@ -126,7 +132,8 @@ class MethodHeadValueResolver:
                            ):
                             instances[registers[param].value].append(registers[param])
                 else:
-                    logger.info('the base object last invoked is not saved or used, and perform the same propagation as one for methods called by system')
+                    if (Trace.enabled):
+                        logger.info('the base object last invoked is not saved or used, and perform the same propagation as one for methods called by system')
                     # assert len(inst.parameters) == 1, 'parameters are more than one, and propagation is required'
 
                     i = 0
@@ -152,13 +159,15 @@ class MethodHeadValueResolver:
                         else:
                             i += 1
 
-            logger.debug({'inst': inst})
-            logger.debug({'registers': registers})
+            if (Trace.enabled):
+                logger.debug({'inst': inst})
+                logger.debug({'registers': registers})
         elif (isinstance(previous, StackFrameEntry) and len(inst.parameters) > 0):
             # For static methods called by the system, currently simply search previously-created instances for parameters.
             assert mattr == 'static'
 
-            logger.info('generating parameter values for static method called by the system')
+            if (Trace.enabled):
+                logger.info('generating parameter values for static method called by the system')
 
             i = 0
             while i < len(inst.parameters):
@@ -181,20 +190,23 @@ class MethodHeadValueResolver:
                     i += 1
 
         else:
-            logger.info(f'new method is invoked by other method {previous.clss = }, {previous.method = }')
+            if (Trace.enabled):
+                logger.info(f'new method is invoked by other method {previous.clss = }, {previous.method = }')
             # For methods invoked by app's other methods except threads.
             # If the callee has any parameter, perform the argument-parameter value propagation
 
             # If the invoked method is <init>, previous method can be new-instance.
             # If so, skip the propagation.
             if (len(inst.parameters) > 0):
-                logger.info('performing value propagation for the new method')
+                if (Trace.enabled):
+                    logger.info('performing value propagation for the new method')
                 # Get caller's instruction and registers.
                 # Then, propagate values in the registers to the callee's parameter registers
 
                 caller_inst = classes[previous.clss].methods[previous.method].instructions[previous.pc]
 
-                logger.info({'caller_inst': caller_inst})
+                if (Trace.enabled):
+                    logger.info({'caller_inst': caller_inst})
 
                 if (caller_inst.kind == 'new_instance'):
                     # Make sure that the invoked class has only one parameter
@@ -238,7 +250,8 @@ class MethodHeadValueResolver:
                         )  # or
                         # (caller_base_obj_value == callee_base_obj_value)  # Currently disabled base-object-based matching because it causes false matches)
                     ):
-                        logger.info('caller and callee base objects match')
+                        if (Trace.enabled):
+                            logger.info('caller and callee base objects match')
                         # For debugging constructor matching
                         # logger.error(f'{caller_inst.class_name = }')
                         # logger.error(f'{classes[caller_inst.class_name].family = }')  # This can cause KeyError
@@ -253,8 +266,9 @@ class MethodHeadValueResolver:
                             while i < len(inst.parameters):
                                 param = inst.parameters[i]
 
-                                logger.info(f'newly logged {new_values.get(param) = }')
-                                logger.info(f'propagating {previous.registers[caller_inst.arguments[i]].value = } to {param = }')
+                                if (Trace.enabled):
+                                    logger.info(f'newly logged {new_values.get(param) = }')
+                                    logger.info(f'propagating {previous.registers[caller_inst.arguments[i]].value = } to {param = }')
 
                                 registers[param] = ValueResolver.get_value_copy(previous.registers[caller_inst.arguments[i]])
 
@@ -316,7 +330,8 @@ class MethodHeadValueResolver:
 
                     else:
                         # The base objects are not matched.
-                        logger.info('caller and callee base objects do not match')
+                        if (Trace.enabled):
+                            logger.info('caller and callee base objects do not match')
                         # Next, detect reflection by checking the following conditions:
                         #   (1) caller's argument length is 3.
                         #   (2) caller's second argument and callee's base object are the same.
@@ -351,7 +366,8 @@ class MethodHeadValueResolver:
                             # E.g., static Landroid/os/Looper;->loop()V invokes non-static handleMessage(Landroid/os/Message;)V
                             # E.g., native method invocation invokes a java method of the app
 
-                            logger.info('no invocation pattern is detected')
+                            if (Trace.enabled):
+                                logger.info('no invocation pattern is detected')
 
                             i = 0
                             while i < len(inst.parameters):
@@ -399,7 +415,8 @@ class MethodHeadValueResolver:
 
             else:
                 # If the new method is static and has no parameter, the value propagation is skipped
-                logger.info('the new method has no parameter')
+                if (Trace.enabled):
+                    logger.info('the new method has no parameter')
 
                 # Just in case, check if the method's attribute is static
                 assert mattr == 'static', f'non-static method has no parameter, {mattr = }, {inst = }'
@@ -412,11 +429,13 @@ class MethodHeadValueResolver:
                     for field_name in classes[invoked_class].fields['static'].keys():
                         field_key = f'{invoked_class}->{field_name}'
                         if (field_key in static_fields.keys()):
-                            logger.debug(f'removing static field {field_key = }')
+                            if (Trace.enabled):
+                                logger.debug(f'removing static field {field_key = }')
                             del static_fields[field_key]
 
-            logger.debug({'inst': inst})
-            logger.debug({'registers': registers})
+            if (Trace.enabled):
+                logger.debug({'inst': inst})
+                logger.debug({'registers': registers})
 
     @staticmethod
     def get_instance_value(data_type, previous_instances, reg, new_values, self_ptids, vms, mattr):
@@ -473,7 +492,8 @@ class MethodHeadValueResolver:
             # assert reg_value is None, f'{reg_value = } is not None, but its instance is not found in {previous_instances.keys() = }'
             pass
 
-        logger.info(f'generating {data_type = }, {reg = }, {reg_value}')
+        if (Trace.enabled):
+            logger.info(f'generating {data_type = }, {reg = }, {reg_value}')
         value = ValueResolver.generate_value(data_type, reg_value)
 
         # Save the value if it is class reference-data type
@@ -535,8 +555,9 @@ class MethodHeadValueResolver:
         """
         Matching arguments' and parameters' data types.
         """
-        logger.info(f'matching data types between arguments and parameters')
-        logger.info(caller)
+        if (Trace.enabled):
+            logger.info(f'matching data types between arguments and parameters')
+            logger.info(caller)
         if (caller is None):
             return False
 
@@ -585,7 +606,8 @@ class InvokeValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         classes = kwargs['classes']
@@ -665,8 +687,9 @@ class InvokeValueResolver:
                 if (inst.class_name == REFLECTIVE_FIELD_ACCESS['class'] and
                     inst.method_name == REFLECTIVE_FIELD_ACCESS['method']
                    ):
-                    logger.debug('reflective field access')
-                    logger.debug(inst)
+                    if (Trace.enabled):
+                        logger.debug('reflective field access')
+                        logger.debug(inst)
 
                     # Currently, only static fields are supported
                     if (inst.reflective_field_attr == 'static'):
@@ -684,7 +707,8 @@ class InvokeValueResolver:
                        ):
 
                         # TODO: Taint will be removed, so requiring a method to preserve taint
-                        logger.info(f'updating array {arg = } {inst.argument_data_types[arg] = } value from {registers[arg].value = } to {new_values[arg] = } after invocation')
+                        if (Trace.enabled):
+                            logger.info(f'updating array {arg = } {inst.argument_data_types[arg] = } value from {registers[arg].value = } to {new_values[arg] = } after invocation')
                         # Copy new values to the array
                         array_new_value = ValueResolver.generate_value(inst.argument_data_types[arg], new_values[arg])
                         registers[arg].value = array_new_value.value
@@ -722,7 +746,8 @@ class ReturnValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
 
@@ -770,7 +795,8 @@ class MoveResultValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
 
@@ -811,7 +837,8 @@ class MoveResultValueResolver:
                     registers[arg].value != new_values[arg]):
 
                     # TODO: Elements' taint will be removed, so requiring a method to preserve taint
-                    logger.info(f'updating array value from {registers[arg].value = } to {new_values[arg] = } after invocation')
+                    if (Trace.enabled):
+                        logger.info(f'updating array value from {registers[arg].value = } to {new_values[arg] = } after invocation')
                     ValueResolver.update_array_value(arg, new_values[arg], registers)
                     # ValueResolver.set_register_value(arg, invoke.argument_data_types[arg],
                     #                                  new_values[arg], registers)
@@ -847,7 +874,8 @@ class MoveResultValueResolver:
                             assert new_value != NULL_REPRESENTATION, f'{NULL_REPRESENTATION = } must not exist in instances'
 
                             # Instance is found
-                            logger.info(f'returned value {new_value = }, {reg = }, of an API method call matches to a previously saved instance')
+                            if (Trace.enabled):
+                                logger.info(f'returned value {new_value = }, {reg = }, of an API method call matches to a previously saved instance')
                             registers[reg] = ValueResolver.get_value_copy(matched_instance)
                             return
 
@@ -890,7 +918,8 @@ class MoveResultValueResolver:
         if (invoke.class_name == 'Ljava/lang/Object;' and
             invoke.method_name == 'clone()Ljava/lang/Object;'
            ):
-            logger.info('Ljava/lang/Object;->clone()Ljava/lang/Object; is invoked')
+            if (Trace.enabled):
+                logger.info('Ljava/lang/Object;->clone()Ljava/lang/Object; is invoked')
 
             base_object = registers[invoke.arguments[0]]
 
@@ -952,7 +981,8 @@ class MoveResultValueResolver:
         """
         Resolve values at a move-result with filled-new-array instruction.
         """
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -981,7 +1011,8 @@ class ConstValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -994,7 +1025,8 @@ class ConstStringValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1010,7 +1042,8 @@ class ConstClassValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1027,7 +1060,8 @@ class NewInstanceValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1058,7 +1092,8 @@ class InstanceOfValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1076,7 +1111,8 @@ class NewArrayValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1113,7 +1149,8 @@ class FillArrayDataValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1134,7 +1171,8 @@ class ArrayLengthValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1154,7 +1192,8 @@ class AputValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1174,7 +1213,8 @@ class AgetValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1194,10 +1234,12 @@ class AgetValueResolver:
 
                 # Check whether the value is a previously-created instance
                 matched_instance = MoveResultValueResolver.search_previously_created_instance(element.value, instances, self_ptids, vms)
-                logger.info(f'searching aget element {element.value = } in instances, result is {matched_instance is not None}')
+                if (Trace.enabled):
+                    logger.info(f'searching aget element {element.value = } in instances, result is {matched_instance is not None}')
                 if (matched_instance is not None):
                     # Instance is found
-                    logger.info('aget element value matches to a previously-created instance')
+                    if (Trace.enabled):
+                        logger.info('aget element value matches to a previously-created instance')
                     # Copy the instance to the destination
                     registers[inst.destination] = ValueResolver.get_value_copy(matched_instance)
                     # Replace the array's value with the found value
@@ -1214,7 +1256,8 @@ class AgetValueResolver:
             # Make sure the index equals to or greater than the array length
             assert index.value >= len(array.elements), f'{index.value = } < {len(array.elements) = }'
 
-            logger.info('ArrayIndexOutOfBoundsException occured')
+            if (Trace.enabled):
+                logger.info('ArrayIndexOutOfBoundsException occured')
 
             raise ExceptionOccurException(inst)
 
@@ -1224,7 +1267,8 @@ class MoveValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1238,7 +1282,8 @@ class IgetValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1252,7 +1297,8 @@ class IgetValueResolver:
         # Detect NullPointerException
         if (instance_value.value == 0):
 
-            logger.info('NullPointerException occured')
+            if (Trace.enabled):
+                logger.info('NullPointerException occured')
 
             raise ExceptionOccurException(inst)
 
@@ -1275,7 +1321,8 @@ class IgetValueResolver:
                     matched_instance = MoveResultValueResolver.search_previously_created_instance(value, instances, self_ptids, vms)
                     if (matched_instance is not None):
                         # Instance is found
-                        logger.info('iget destination value matches to a previously-created instance')
+                        if (Trace.enabled):
+                            logger.info('iget destination value matches to a previously-created instance')
                         registers[inst.destination] = ValueResolver.get_value_copy(matched_instance)
                         return
 
@@ -1302,7 +1349,8 @@ class IgetValueResolver:
                 # Compare the newly-logged value with the value previously saved.
                 new_logged_value = ValueResolver.generate_value(data_type, value)
                 if (new_logged_value.value != registers[inst.destination].value):
-                    logger.info(f'newly-logged iget {inst.field = } {value = } does not match to the previously-saved value')
+                    if (Trace.enabled):
+                        logger.info(f'newly-logged iget {inst.field = } {value = } does not match to the previously-saved value')
                     if (isinstance(registers[inst.destination], ArrayInstanceValue)):
                         # Keep the current ArrayInstanceValue instance, and copy only values
                         ValueResolver.update_array_value(inst.destination, value, registers)
@@ -1319,7 +1367,8 @@ class IputValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1337,7 +1386,8 @@ class SgetValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1354,7 +1404,8 @@ class SgetValueResolver:
             value = new_values.get(inst.destination)
             # inst.logging should be checked because the register's old value can exist in new_values.
             if (value is not None and inst.logging):
-                logger.debug('new logged value is set to sget destination')
+                if (Trace.enabled):
+                    logger.debug('new logged value is set to sget destination')
                 # Set the new value
                 ValueResolver.set_register_value(inst.destination, inst.destination_data_type,
                                                  value, registers)
@@ -1366,9 +1417,11 @@ class SgetValueResolver:
                     # Raise the exception to break the emulation
                     raise ClinitInvokedException(inst)
 
-                logger.debug('no value is logged, and generating a default value for sget destination')
+                if (Trace.enabled):
+                    logger.debug('no value is logged, and generating a default value for sget destination')
                 if (inst.default_value is not None):
-                    logger.info(f'using {inst.default_value = } for {inst.destination = }')
+                    if (Trace.enabled):
+                        logger.info(f'using {inst.default_value = } for {inst.destination = }')
                     registers[inst.destination] = ValueResolver.generate_value(inst.destination_data_type, inst.default_value)
                 else:
                     # For other fields, set a default value that are either 0 or Null.
@@ -1383,7 +1436,8 @@ class SgetValueResolver:
                 # Compare the newly-logged value with the value previously saved.
                 new_logged_value = ValueResolver.generate_value(inst.destination_data_type, value)
                 if (new_logged_value.value != static_fields[inst.field].value):
-                    logger.debug(f'newly-logged sget field {value = } does not match to the previously-saved value')
+                    if (Trace.enabled):
+                        logger.debug(f'newly-logged sget field {value = } does not match to the previously-saved value')
                     # Set the newly-logged value
                     ValueResolver.set_register_value(inst.destination, inst.destination_data_type,
                                                      value, registers)
@@ -1394,7 +1448,8 @@ class SgetValueResolver:
 
             # Move a static field's value to a register.
             try:
-                logger.debug(f'moving value from {inst.field = } to {inst.destination = }')
+                if (Trace.enabled):
+                    logger.debug(f'moving value from {inst.field = } to {inst.destination = }')
                 registers[inst.destination] = ValueResolver.get_value_copy(static_fields[inst.field])
             except (AttributeError, KeyError) as e:
                 raise Exception(f'Moving from {inst.field = } to {inst.destination = } failed') from e
@@ -1405,7 +1460,8 @@ class SputValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1433,14 +1489,15 @@ class UnopValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
         
         inst = kwargs['inst']
         registers = kwargs['registers']
 
         source = registers[inst.source].value
 
-        result = eval(inst.expression, {'source': source})
+        result = get_evaluator(inst.expression, 'source')(source)
 
         # Convert data type
         try:
@@ -1460,7 +1517,8 @@ class BinopValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
         
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1481,7 +1539,7 @@ class BinopValueResolver:
 
         else:
             try:
-                result = eval(inst.expression, {'source1': source1, 'source2': source2})
+                result = get_evaluator(inst.expression, 'source1, source2')(source1, source2)
             except Exception as e:
                 logger.error(registers)
                 raise Exception(f'Operation {inst.instruction = } ({inst.data_type = }) failed with {source1 = } and {source2 = }') from e
@@ -1504,7 +1562,8 @@ class BinopLit8ValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
         
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1524,7 +1583,7 @@ class BinopLit8ValueResolver:
 
         else:
             try:
-                result = eval(inst.expression, {'source1': source, 'source2': inst.literal})
+                result = get_evaluator(inst.expression, 'source1, source2')(source, inst.literal)
             except Exception as e:
                 raise Exception(f'Operation {inst.instruction = } ({inst.data_type = }) failed with {source = } and {inst.literal = }') from e
 
@@ -1547,7 +1606,8 @@ class Binop2addrValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
         
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1569,7 +1629,7 @@ class Binop2addrValueResolver:
 
         else:
             try:
-                result = eval(inst.expression, {'source1': source1, 'source2': source2})
+                result = get_evaluator(inst.expression, 'source1, source2')(source1, source2)
             except Exception as e:
                 raise Exception(f'Operation {inst.instruction = } ({inst.data_type = }) failed with {source1 = } and {source2 = }') from e
 
@@ -1592,7 +1652,8 @@ class CmpValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         inst = kwargs['inst']
         registers = kwargs['registers']
@@ -1620,7 +1681,8 @@ class ThrowValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         vm = kwargs['vm']
         inst = kwargs['inst']
@@ -1635,7 +1697,8 @@ class MoveExceptionValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         vm = kwargs['vm']
         inst = kwargs['inst']
@@ -1662,7 +1725,8 @@ class CheckCastValueResolver:
     """
     @staticmethod
     def run(**kwargs):
-        logger.debug('running')
+        if (Trace.enabled):
+            logger.debug('running')
 
         vm = kwargs['vm']
         inst = kwargs['inst']
@@ -0,0 +1,155 @@
+import struct
+import logging
+
+import numpy
+
+logger = logging.getLogger(name=__name__)
+
+
+# Header of a binary record: time, pid, tid, cid, line, register's code, and length of the value bytes, all big-endian.
+# The length is -1 if the record does not contain a value.
+BINARY_HEADER = struct.Struct('>qiiiiii')
+
+
+class LogDecoder:
+    """
+    Decode records of smalien logs.
+
+    A record is formatted as <time>:<pid>:<tid>:<cid>_<line>[_<reg>:<value>].
+    Each record is tokenized by a single split, and validated without regular expressions.
+
+    A binary record written by SmalienBinaryWriter is formatted as
+    <time:int64><pid:int32><tid:int32><cid:int32><line:int32><reg:int32><value length:int32><value>,
+    where reg is 0 if the record does not contain a register, n+1 for v<n>, and -(n+1) for p<n>.
+    Records are decoded with a single unpack of the fixed-width header, without splitting strings.
+
+    A record written by the per-thread writer is prefixed with a sequence number, as <seq>:<time>:<pid>:<tid>:<cid>_<line>[_<reg>:<value>].
+    """
+
+    # Names of registers keyed by their codes in binary records, filled while decoding
+    REGISTERS = {}
+
+    @staticmethod
+    def decode(records):
+        """
+        Decode the given records.
+        Return a list of tuples of time, pid, tid, cid, line, reg, and value.
+        reg and value are None if the record does not contain a value.
+        """
+        decoded = []
+        append = decoded.append
+
+        for record in records:
+            # A record can be None when not a log string but a null is logged by the app.
+            # The cause must be investigated, and currently raise an error
+            assert record is not None, 'a log is none, meaning null is logged by the app'
+
+            # The value can contain ':', so it is not split
+            fields = record.split(':', 4)
+            ids = fields[3].split('_') if (len(fields) > 3) else ()
+
+            assert (len(ids) > 1 and
+                    len(fields[0]) == 13 and
+                    fields[0].isdigit() and
+                    fields[1].isdigit() and
+                    fields[2].isdigit() and
+                    ids[0].isdigit() and
+                    ids[1].isdigit()), f'Corrupted, {record = }'
+
+            if (len(ids) > 2):
+                append((int(fields[0]), int(fields[1]), int(fields[2]), int(ids[0]), int(ids[1]),
+                        ids[-1], fields[4] if (len(fields) > 4) else ''))
+            else:
+                append((int(fields[0]), int(fields[1]), int(fields[2]), int(ids[0]), int(ids[1]),
+                        None, None))
+
+        return decoded
+
+    @staticmethod
+    def decode_sequenced(records):
+        """
+        Decode the given records prefixed with sequence numbers.
+        Return a list of tuples of the sequence number and the tuple decode() returns.
+        """
+        seqs = []
+        strings = []
+        for record in records:
+            assert record is not None, 'a log is none, meaning null is logged by the app'
+
+            seq, _, string = record.partition(':')
+            assert seq.isdigit(), f'Corrupted, {record = }'
+
+            seqs.append(int(seq))
+            strings.append(string)
+
+        return list(zip(seqs, LogDecoder.decode(strings)))
+
+    @staticmethod
+    def decode_binary(buffer):
+        """
+        Decode binary records in the given buffer.
+        Return a list of tuples in the same form as decode(), and the offset following the last complete record.
+        Bytes after the offset are a partial record, which must be prepended to the next buffer.
+        """
+        decoded = []
+        append = decoded.append
+
+        unpack_header = BINARY_HEADER.unpack_from
+        header_size = BINARY_HEADER.size
+        registers = LogDecoder.REGISTERS
+
+        size = len(buffer)
+        offset = 0
+        while (offset + header_size <= size):
+            time, pid, tid, cid, line, reg, value_length = unpack_header(buffer, offset)
+
+            value_start = offset + header_size
+            value_end = value_start + max(value_length, 0)
+            if (value_end > size):
+                break
+
+            assert (999999999999 < time < 10000000000000 and
+                    pid >= 0 and
+                    tid >= 0 and
+                    cid >= 0 and
+                    line >= 0 and
+                    value_length >= -1), f'Corrupted, {offset = }, {time = }, {cid = }, {line = }'
+
+            if (reg != 0):
+                name = registers.get(reg)
+                if (name is None):
+                    name = registers[reg] = f'v{reg - 1}' if (reg > 0) else f'p{-reg - 1}'
+
+                value = buffer[value_start:value_end].decode('utf-8', errors='ignore') if (value_length > 0) else ''
+                append((time, pid, tid, cid, line, name, value))
+            else:
+                append((time, pid, tid, cid, line, None, None))
+
+            offset = value_end
+
+        return decoded, offset
+
+    @staticmethod
+    def decode_columns(records):
+        """
+        Decode the given records into columns.
+        Return a dict of NumPy arrays of time, pid, tid, cid, and line, and lists of reg and value.
+        """
+        return LogDecoder.to_columns(LogDecoder.decode(records))
+
+    @staticmethod
+    def to_columns(decoded):
+        """
+        Transform the given decoded records into columns.
+        """
+        columns = list(zip(*decoded)) if (len(decoded) > 0) else [()] * 7
+
+        return {
+            'time': numpy.array(columns[0], dtype=numpy.int64),
+            'pid': numpy.array(columns[1], dtype=numpy.int32),
+            'tid': numpy.array(columns[2], dtype=numpy.int32),
+            'cid': numpy.array(columns[3], dtype=numpy.int32),
+            'line': numpy.array(columns[4], dtype=numpy.int32),
+            'reg': list(columns[5]),
+            'value': list(columns[6]),
+        }
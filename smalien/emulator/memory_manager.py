@@ -0,0 +1,181 @@
+import os
+import gc
+import logging
+import resource
+
+from .vm_manager.structures import StackFrameEntry
+from .interpreter.value_manager.structures import Value, ClassInstanceValue, ArrayInstanceValue
+
+logger = logging.getLogger(name=__name__)
+
+
+class MemoryManager:
+    """
+    Bound memory usage of the emulation with runtime logs.
+
+    Every CHECK_INTERVAL VM orders, VMs whose call stacks are empty are evicted.
+    A new VM is created when the thread logs again, which is equivalent to the evicted one.
+    If RSS exceeds the memory budget, the following are also released:
+      - Instances neither reachable from VMs, static fields, and intent data nor tainted.
+        Only the latest instance of each representation is looked up, so older duplicates are also removed.
+      - Taint history, which is spilled to a file in the workspace.
+    """
+
+    # Number of VM orders between checks of memory usage
+    CHECK_INTERVAL = 10000
+
+    def __init__(self, data, recorder, workspace, memory_budget):
+        """
+        :param data:           Emulation data.
+        :param recorder:       Recorder of taint history.
+        :param workspace:      Directory to which taint history is spilled.
+        :param memory_budget:  Maximum RSS in bytes.
+        """
+        logger.debug('initializing')
+
+        self.data = data
+        self.recorder = recorder
+        self.workspace = workspace
+        self.memory_budget = memory_budget
+
+        self.vm_order_num = 0
+
+        # For reporting
+        self.evicted_vm_num = 0
+        self.collected_instance_num = 0
+
+    def run(self):
+        """
+        Count a VM order, and release memory at every interval.
+        """
+        self.vm_order_num += 1
+        if (self.vm_order_num % self.CHECK_INTERVAL != 0):
+            return
+
+        self.evict_dead_vms()
+
+        if (self.get_rss() > self.memory_budget):
+            logger.info(f'RSS exceeds the memory budget, {self.get_rss() = }')
+
+            self.collect_instances()
+            self.recorder.spill(self.workspace)
+            gc.collect()
+
+    def evict_dead_vms(self):
+        """
+        Remove VMs whose call stacks only contain the entry frame.
+        """
+        for ptids in [ ptids for ptids, vm_runner in self.data.vms.items() if self.is_dead(vm_runner.vm) ]:
+            del self.data.vms[ptids]
+            self.evicted_vm_num += 1
+
+    @staticmethod
+    def is_dead(vm):
+        """
+        Return True if the VM holds no state that a new VM of the thread would lack.
+
+        Registers, logged values waiting for move-result, and the after-invocation flag belong to StackFrames,
+        and the entry frame has none of them.
+        When the stack only contains the entry frame, the next VM order creates a new frame from its own values,
+        as it does for a new VM.
+        Instances, static fields, and intent data are shared with the emulation data, so they outlive the VM.
+        Hence, only a thrown exception waiting for move-exception is lost, which is checked.
+        """
+        return (len(vm.call_stack) == 1 and
+                isinstance(vm.call_stack[0], StackFrameEntry) and
+                vm.exception_value is None)
+
+    def collect_instances(self):
+        """
+        Remove instances that are neither reachable nor tainted.
+        """
+        # Tainted instances are kept, and so are values they refer to
+        tainted = [ instances[-1] for instances in self.data.instances.values() if self.is_tainted(instances[-1]) ]
+        reachable = self.find_reachable_values(tainted)
+
+        for key, instances in list(self.data.instances.items()):
+            if (id(instances[-1]) in reachable):
+                self.collected_instance_num += len(instances) - 1
+                del instances[:-1]
+            else:
+                self.collected_instance_num += len(instances)
+                del self.data.instances[key]
+
+    def find_reachable_values(self, roots):
+        """
+        Return ids of values reachable from the given roots, VMs' registers, static fields, and intent data.
+        """
+        roots = roots + list(self.data.static_fields.values()) + list(self.data.intent_data.values())
+        for vm_runner in self.data.vms.values():
+            roots.append(vm_runner.vm.exception_value)
+            for sf in vm_runner.vm.call_stack[1:]:
+                roots.extend(sf.registers.values())
+
+        reachable = set()
+        while (roots):
+            value = roots.pop()
+            if (not isinstance(value, Value) or id(value) in reachable):
+                continue
+            reachable.add(id(value))
+
+            roots.extend(self.get_children(value))
+
+        return reachable
+
+    @staticmethod
+    def is_tainted(value):
+        """
+        Return True if the value or a value it refers to is tainted.
+        """
+        visited = set()
+        values = [value]
+        while (values):
+            value = values.pop()
+            if (not isinstance(value, Value) or id(value) in visited):
+                continue
+            visited.add(id(value))
+
+            if (value.taint is not None):
+                return True
+
+            values.extend(MemoryManager.get_children(value))
+
+        return False
+
+    @staticmethod
+    def get_children(value):
+        """
+        Return values that the given value refers to.
+        """
+        if (isinstance(value, ClassInstanceValue)):
+            return list(value.fields.values()) + list(value.references)
+        if (isinstance(value, ArrayInstanceValue)):
+            return list(value.elements) + list(value.last_invoked_arguments)
+        return []
+
+    @staticmethod
+    def get_rss():
+        """
+        Return current RSS in bytes.
+        """
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except OSError:
+            # /proc is unavailable, so use the peak instead
+            return MemoryManager.get_peak_rss()
+
+    @staticmethod
+    def get_peak_rss():
+        """
+        Return peak RSS of the process in bytes.
+        """
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def report(self):
+        """
+        Log the released data and peak RSS.
+        """
+        logger.info(f'{self.evicted_vm_num = }, {self.collected_instance_num = }, {self.recorder.spilled_num = }')
+        logger.info(f'peak RSS is {self.get_peak_rss() / 1024**2:.1f} MiB')
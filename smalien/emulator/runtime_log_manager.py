@@ -1,20 +1,67 @@
 import logging
 import io
-import re
+import gzip
 import json
+import pathlib
+import heapq
+import itertools
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 
+from .log_decoder import LogDecoder
 from .coverage_calculator import CoverageCalculator
 from .vm_manager.structures import VMOrder
+from smalien.utils.log_segments import LogSegments
 
 logger = logging.getLogger(name=__name__)
 
 
+# Decompressors of runtime logs collected with compression, keyed by suffixes of the compressed copies
+LOG_DECOMPRESSORS = {
+    '.gz': gzip.open,
+}
+
+
+def open_log(path, binary=False):
+    """
+    Open the runtime log.
+    If the log was collected as a compressed copy, the copy is decompressed while being read.
+    """
+    for suffix, decompressor in LOG_DECOMPRESSORS.items():
+        compressed = pathlib.Path(f'{path}{suffix}')
+        if (compressed.exists()):
+            f = decompressor(compressed, 'rb')
+            break
+    else:
+        f = io.open(path, 'rb')
+
+    if (binary):
+        return f
+
+    return io.TextIOWrapper(f, encoding='utf-8', errors='ignore')
+
+def decode_segment(path):
+    """
+    Decode records of a log segment in a worker process.
+    Records are returned with their sequence numbers.
+    """
+    decoded = []
+    try:
+        with open_log(path) as f:
+            for string in f:
+                decoded.extend(LogDecoder.decode_sequenced(json.loads(string)))
+    except FileNotFoundError:
+        logger.warning(f'{path} is not found')
+
+    return decoded
+
+
 class RuntimeLogManager:
     """
     This class arranges the runtime log and passes it to the emulator.
     """
 
-    def __init__(self, app, workspace, calculate_coverage):
+    def __init__(self, app, workspace, calculate_coverage, decode_workers=1):
         logger.debug('initializing')
 
         self.app = app
@@ -34,6 +81,19 @@ class RuntimeLogManager:
         # For counting the number of logs
         self.log_num = 0
 
+        # Number of worker processes decoding log segments
+        self.decode_workers = decode_workers
+
+        # Lines of the runtime log streamed while the app is being exercised, or None if the log is read from self.local_log
+        self.live_stream = None
+
+        # Readers of decoded records, keyed by the log format
+        self.record_readers = {
+            'json': self.read_json_records,
+            'binary': self.read_binary_records,
+            'threaded': self.read_threaded_records,
+        }
+
     def run(self):
         """
         Read and transform runtime logs for the emulator.
@@ -53,7 +113,7 @@ class RuntimeLogManager:
             # Resolve class and method names from cid and line
             cdata = self.app.cids[cid]
             clss = cdata.name
-            method = self.get_method_of_line(cdata, line)
+            method = cdata.get_method_of_line(line)
             values = {reg: value} if (reg is not None) else {}
 
             # For calculating coverage
@@ -108,54 +168,219 @@ class RuntimeLogManager:
 
             yield vm_order
 
-    def combine_ptids(self, pid, tid):
-        return '{}_{}'.format(pid, tid)
-
-    def get_method_of_line(self, cdata, line):
+    def run_live(self, stream):
         """
-        Get method name containing the code of the line.
+        Read and transform runtime logs streamed while the app is being exercised.
+        Only JSON logs are supported, since the other formats are not processed in the order of lines.
+
+        :param stream:   Iterable of lines of the log.
         """
-        for method, mdata in cdata.methods.items():
-            if (mdata.start_at <= line <= mdata.end_at):
-                return method
-        raise Exception(f'Failed to find method of {line = } in {cdata.name = }')
+        if (self.app.log_format != 'json' or self.app.log_segment_size > 0):
+            raise Exception(f'Live logs of {self.app.log_format} format are not supported')
+
+        self.live_stream = stream
+
+        return self.run()
+
+    def combine_ptids(self, pid, tid):
+        return '{}_{}'.format(pid, tid)
 
     def parse_logs(self):
         """
         Parse smalien logs.
         """
         logger.debug('parsing logs')
+        for records in self.read_records():
+            for record in records:
+                # Count the number of logs
+                self.log_num += 1
+
+                yield record
+
+    def parse_log_columns(self):
+        """
+        Parse smalien logs into batches of columns.
+        Each batch is a dict of NumPy arrays of time, pid, tid, cid, and line, and lists of reg and value.
+        """
+        logger.debug('parsing logs into columns')
+        for records in self.read_records():
+            columns = LogDecoder.to_columns(records)
+
+            # Count the number of logs
+            self.log_num += len(columns['time'])
+
+            yield columns
+
+    def read_records(self):
+        """
+        Read batches of decoded records in the app's log format.
+        """
+        if (self.live_stream is not None):
+            return self.read_live_records()
+
+        if (self.app.log_segment_size > 0):
+            return self.read_segment_records()
+
+        return self.record_readers[self.app.log_format]()
+
+    def read_json_records(self):
+        """
+        Read batches of decoded records from JSON logs.
+        """
         for log_list in self.read_logs():
-            for log in log_list:
-                # logger.info({'log': log})
+            yield LogDecoder.decode(log_list)
 
-                # A log can be None when not a log string but a null is logged by the app.
-                # The cause must be investigated, and currently raise an error
-                assert log is not None, 'a log is none, meaning null is logged by the app'
+    def read_live_records(self):
+        """
+        Read batches of decoded records from the live stream as lines arrive.
+        """
+        for string in self.live_stream:
+            try:
+                log_list = json.loads(string)
+            except ValueError as e:
+                # The last line can be incomplete if the stream was closed while the line was being written
+                logger.warning(f'ignoring an incomplete line of {len(string)} bytes in the live log')
+                continue
 
-                assert re.match(r'^\d{13}:\d+:\d+:\d+_\d+', log) is not None, f'Corrupted, {log = }'
+            yield LogDecoder.decode(log_list)
 
-                time = int(log.split(':')[0])
-                pid = int(log.split(':')[1])
-                tid = int(log.split(':')[2])
+    def read_threaded_records(self):
+        """
+        Read batches of decoded records from JSON logs written by the per-thread writer.
+        A line holds records of a single thread, and lines of threads are interleaved in the order of being flushed.
+        Records are put back in the order of their sequence numbers line by line.
+        """
+        return self.sequence_records( LogDecoder.decode_sequenced(log_list) for log_list in self.read_logs() )
 
-                smalien_id = log.split(':')[3]
-                cid = int(smalien_id.split('_')[0])
-                line = int(smalien_id.split('_')[1])
+    def read_segment_records(self):
+        """
+        Read batches of decoded records from segments of logs written by the per-thread writer.
+        Segments are decoded in worker processes, and their records are put back in order as read_threaded_records does.
+        """
+        segments = LogSegments.list_local(self.local_log)
+        logger.debug(f'reading {len(segments)} segments of {self.local_log}')
+        if (len(segments) == 0):
+            logger.warning('smalien log is not found')
+            return
 
-                reg = smalien_id.split('_')[-1] if (len(smalien_id.split('_')) > 2) else None
-                value = ':'.join(log.split(':')[4:]) if (reg is not None) else None
+        yield from self.sequence_records(self.decode_segments(segments))
 
-                # Count the number of logs
-                self.log_num += 1
+    def sequence_records(self, batches, batch_size=10000, max_pending=1000000):
+        """
+        Put decoded records back in the order of their sequence numbers, which are shared by threads of each process.
+        A record is passed once all records of lower sequence numbers of the process are read,
+        so only records waiting for records still buffered by other threads are held.
+        Processes do not share sequence numbers, so records of processes are merged by timestamps within a batch.
+
+        :param batches:       Iterable of lists of tuples of a sequence number and a decoded record.
+        :param batch_size:    Number of records ready to be passed before merging them into a batch.
+        :param max_pending:   Number of held records of a process, beyond which missing records are skipped.
+        """
+        # Next sequence numbers, held records in heaps, and records ready to be passed, keyed by PIDs
+        next_seqs = {}
+        pending = {}
+        ready = {}
+        ready_num = 0
+
+        for sequenced in batches:
+            for seq, record in sequenced:
+                heapq.heappush(pending.setdefault(record[1], []), (seq, record))
+
+            for pid, heap in pending.items():
+                next_seq = next_seqs.get(pid, 0)
+                if (heap and heap[0][0] < next_seq):
+                    # The sequence restarts if the PID is reused by a new process
+                    logger.warning(f'sequence numbers of {pid = } restarted at {heap[0][0]}')
+                    next_seq = heap[0][0]
+                elif (len(heap) > max_pending):
+                    # Records can be missing if the process was killed before flushing them
+                    logger.warning(f'skipping missing records of {pid = } from {next_seq} to {heap[0][0]}')
+                    next_seq = heap[0][0]
+
+                out = ready.setdefault(pid, [])
+                start = len(out)
+                while (heap and heap[0][0] == next_seq):
+                    out.append(heapq.heappop(heap)[1])
+                    next_seq += 1
+                ready_num += len(out) - start
+
+                next_seqs[pid] = next_seq
+
+            if (ready_num >= batch_size):
+                yield from self.merge_ready(ready, batch_size)
+                ready_num = 0
+
+        # Pass held records, which follow missing records
+        for pid, heap in pending.items():
+            if (heap):
+                logger.warning(f'{len(heap)} records of {pid = } follow missing records')
+                ready.setdefault(pid, []).extend( record for seq, record in sorted(heap) )
+
+        yield from self.merge_ready(ready, batch_size)
+
+    def merge_ready(self, ready, batch_size):
+        """
+        Merge records ready to be passed from processes by timestamps, and empty the ready lists.
+        """
+        merged = heapq.merge(*ready.values(), key=lambda record: record[0])
+        while (True):
+            records = list(itertools.islice(merged, batch_size))
+            if (len(records) == 0):
+                break
+
+            yield records
+
+        [ records.clear() for records in ready.values() ]
+
+    def decode_segments(self, segments):
+        """
+        Yield decoded records of the segments in order.
+        With multiple workers, up to twice as many segments as the workers are decoded ahead.
+        """
+        paths = [ segment.path for segment in segments ]
+        if (self.decode_workers <= 1 or len(paths) <= 1):
+            for path in paths:
+                yield decode_segment(path)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.decode_workers) as executor:
+            pending = deque()
+            for path in paths:
+                pending.append(executor.submit(decode_segment, path))
+                if (len(pending) >= self.decode_workers * 2):
+                    yield pending.popleft().result()
+
+            while (pending):
+                yield pending.popleft().result()
+
+    def read_binary_records(self, block_size=1024*1024):
+        """
+        Read batches of decoded records from binary logs.
+        The file is read by blocks, and a partial record at the end of a block is carried over to the next block.
+        """
+        logger.debug(f'reading {self.local_log = }')
+        try:
+            f = open_log(self.local_log, binary=True)
+        except Exception as e:
+            logger.warning('smalien log is not found')
+            return
+
+        with f:
+            remainder = b''
+            while (True):
+                block = f.read(block_size)
+                if (len(block) == 0):
+                    break
 
-                # Delete log to free memory
-                del log
+                buffer = remainder + block
+                records, offset = LogDecoder.decode_binary(buffer)
+                remainder = buffer[offset:]
 
-                yield time, pid, tid, cid, line, reg, value
+                yield records
 
-            # Delete log list to free memory
-            del log_list
+        # The last record can be incomplete if the app was killed while writing it
+        if (len(remainder) > 0):
+            logger.warning(f'ignoring an incomplete record of {len(remainder)} bytes at the end of the log')
 
     def read_logs(self):
         """
@@ -163,7 +388,7 @@ class RuntimeLogManager:
         """
         logger.debug(f'reading {self.local_log = }')
         try:
-            with io.open(self.local_log, 'r', encoding='utf-8', errors='ignore') as f:
+            with open_log(self.local_log) as f:
                 for string in f:
                     yield json.loads(string)
         except Exception as e:
@@ -0,0 +1,372 @@
+import os
+import pickle
+import shutil
+import logging
+import pathlib
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from .emulator import Emulator
+from .memory_manager import MemoryManager
+from .interpreter.value_manager.structures import Value, ClassInstanceValue
+from .flow_detail_logger import FlowDetailLogger
+from smalien.definitions import FLOW_DETAIL_LOG_FILE
+
+logger = logging.getLogger(name=__name__)
+
+
+# Data shared with every emulator worker process.
+# Set by init_emulator_worker when the process pool starts a worker.
+worker_data = {}
+
+def init_emulator_worker(app, taint_sources, taint_sinks, detect_failures):
+    """
+    Initialize an emulator worker process.
+
+    :param app:              App data.
+    :param taint_sources:    Definition of taint sources.
+    :param taint_sinks:      Definition of taint sinks.
+    :param detect_failures:  Whether detecting failures.
+    """
+    worker_data['app'] = app
+    worker_data['taint_sources'] = taint_sources
+    worker_data['taint_sinks'] = taint_sinks
+    worker_data['detect_failures'] = detect_failures
+
+def emulate_shard_in_worker(params):
+    """
+    Emulate VM orders of a shard in a worker process.
+    The shard's directory is used as the workspace, so each shard writes its own flow detail log.
+    """
+    ptids, directory, seeds = params
+
+    emulator = Emulator(worker_data['app'], pathlib.Path(directory),
+                        worker_data['taint_sources'],
+                        worker_data['taint_sinks'],
+                        detect_failures=worker_data['detect_failures'],
+                        calculate_coverage=False)
+
+    # Shared state received from the other shards is exposed at the time it was written
+    shard_state = ShardState(emulator, seeds)
+
+    try:
+        emulator.run_vm_orders(shard_state.run(ShardedEmulator.load_shard(directory)))
+    finally:
+        FlowDetailLogger.log_file.close()
+
+    return {
+        'ptids': ptids,
+        'found_sources': emulator.get_found_sources(),
+        'found_sinks': emulator.get_found_sinks(),
+        'taint_history': emulator.get_taint_history(),
+        'shared': shard_state.get_shared_state(),
+    }
+
+
+class StampedDict(dict):
+    """
+    Static fields or intent data of a shard, recording writes with their timestamps.
+    """
+
+    def __init__(self, shard_state, kind):
+        super().__init__()
+        self.shard_state = shard_state
+        self.kind = kind
+
+    def __setitem__(self, key, value):
+        self.shard_state.record_write(self.kind, key, value)
+        dict.__setitem__(self, key, value)
+
+
+class StampedList(list):
+    """
+    Instances of a key, recording appended instances with their timestamps.
+    """
+
+    def __init__(self, shard_state, key):
+        super().__init__()
+        self.shard_state = shard_state
+        self.key = key
+
+    def append(self, value):
+        self.shard_state.record_write('instances', self.key, value)
+        list.append(self, value)
+
+
+class StampedInstances(dict):
+    """
+    Instances of a shard, creating a StampedList for each new key.
+    """
+
+    def __init__(self, shard_state):
+        super().__init__()
+        self.shard_state = shard_state
+
+    def __missing__(self, key):
+        instances = StampedList(self.shard_state, key)
+        dict.__setitem__(self, key, instances)
+        return instances
+
+
+class ShardState:
+    """
+    Instances, static fields, and intent data of a shard, which are shared with the other shards.
+
+    A write is recorded with the timestamp of the VM order writing it.
+    Writes of a key are kept only while they are tainted or made by different VM orders,
+    since an untainted write is not needed once it is overwritten, and the other shards see the state only between VM orders.
+    Entries received from the other shards are written without being recorded,
+    before the first VM order whose timestamp is later than the time they were written.
+    """
+
+    def __init__(self, emulator, seeds):
+        """
+        :param emulator:  Emulator of the shard, whose shared state is replaced before any VM is created.
+        :param seeds:     List of tuples of time, kind, key, and value received from the other shards, in the order of time.
+        """
+        self.instances = StampedInstances(self)
+        self.static_fields = StampedDict(self, 'static_fields')
+        self.intent_data = StampedDict(self, 'intent_data')
+
+        emulator.data.instances = emulator.vm_manager.instances = self.instances
+        emulator.data.static_fields = emulator.vm_manager.static_fields = self.static_fields
+        emulator.data.intent_data = emulator.vm_manager.intent_data = self.intent_data
+
+        # Timestamp of the running VM order
+        self.now = 0
+
+        # Lists of tuples of time and value written by the shard, keyed by kinds and keys
+        self.writes = {'instances': {}, 'static_fields': {}, 'intent_data': {}}
+
+        self.seeds = deque(seeds)
+
+    def run(self, vm_orders):
+        """
+        Yield the VM orders, exposing entries received from the other shards before each of them.
+        """
+        for vm_order in vm_orders:
+            if (vm_order.timestamp is not None):
+                self.expose(vm_order.timestamp)
+                self.now = vm_order.timestamp
+
+            yield vm_order
+
+    def expose(self, timestamp):
+        """
+        Write entries received from the other shards that were written before the timestamp.
+        """
+        while (self.seeds and self.seeds[0][0] < timestamp):
+            _, kind, key, value = self.seeds.popleft()
+            if (kind == 'instances'):
+                list.append(self.instances[key], value)
+            else:
+                dict.__setitem__(getattr(self, kind), key, value)
+
+    def record_write(self, kind, key, value):
+        """
+        Record a write of the shard.
+        """
+        writes = self.writes[kind].setdefault(key, [])
+        if (writes and (writes[-1][0] == self.now or not MemoryManager.is_tainted(writes[-1][1]))):
+            writes[-1] = (self.now, value)
+        else:
+            writes.append((self.now, value))
+
+    def get_shared_state(self):
+        """
+        Return writes of keys that the shard wrote tainted values to, as lists of tuples of time and value keyed by kinds and keys.
+        Untainted writes of such keys are included, since they overwrite tainted values written by the other shards.
+        """
+        return { kind: { key: writes for key, writes in entries.items()
+                         if any( MemoryManager.is_tainted(value) for _, value in writes ) }
+                 for kind, entries in self.writes.items() }
+
+
+class ShardedEmulator:
+    """
+    Emulate the app with runtime logs in worker processes, partitioning VM orders by PTIDs.
+
+    Each thread is emulated in its own shard.
+    Threads share state through instances of their process, static fields, and intent data, which are written and read across threads.
+    Hence, the shards are emulated in rounds, and writes of tainted shared state are exchanged between rounds:
+      1. Every shard is emulated with the writes received from the other shards, which are empty at the first round.
+         A received write is exposed from the first VM order of the shard whose timestamp is later than the write's.
+      2. Writes of keys that a shard tainted are collected with the timestamps of the VM orders writing them.
+         A shard receives writes of the other shards, and writes of instances only from shards of the same process.
+      3. If any shard receives writes of different times, keys, values, or taints from the previous round, the shards are emulated again.
+    Results of the last round are merged into the given emulator.
+    If the shared state does not converge in max_rounds, it is reported, and results of the last round are merged.
+
+    Found sinks can still differ from the serial emulation in the following cases:
+      - A write is stamped with the timestamp of its VM order, which is the time of the order's first record.
+        A read by another thread after the order started but before the write can see the write.
+      - Records are timestamped in milliseconds, so a write is not seen by another thread's VM order of the same millisecond.
+      - Values mutated in place without being written again, e.g., fields of a received instance, are not exchanged.
+    benchmarks/bench_sharded_emulation.py compares the sinks of both emulations on threads sharing a static field.
+    """
+
+    def __init__(self, emulator, workspace, taint_sources, taint_sinks, detect_failures, workers, max_rounds=3):
+        """
+        :param emulator:    Emulator receiving results.
+        :param workspace:   Directory in which shards are written.
+        :param workers:     Number of worker processes.
+        :param max_rounds:  Maximum number of rounds exchanging shared state.
+        """
+        logger.debug('initializing')
+
+        self.emulator = emulator
+        self.workspace = workspace
+        self.taint_sources = taint_sources
+        self.taint_sinks = taint_sinks
+        self.detect_failures = detect_failures
+        self.workers = workers
+        self.max_rounds = max_rounds
+
+        # Whether the shared state converged in the last run
+        self.converged = None
+
+    def run(self):
+        """
+        Run the emulation.
+        """
+        logger.debug(f'running with {self.workers = }')
+
+        with tempfile.TemporaryDirectory(dir=self.workspace, prefix='shards_') as directory:
+            shards = self.write_shards(directory)
+            logger.info(f'partitioned VM orders into {len(shards)} shards')
+
+            seeds = { ptids: [] for ptids in shards.keys() }
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     initializer=init_emulator_worker,
+                                     initargs=(self.emulator.app, self.taint_sources, self.taint_sinks, self.detect_failures)) as executor:
+                for i in range(self.max_rounds):
+                    logger.info(f'emulating shards, round {i}')
+
+                    # Larger shards are started first
+                    params = [ (ptids, shards[ptids], seeds[ptids])
+                               for ptids in sorted(shards.keys(), key=lambda p: -os.path.getsize(shards[p] / 'orders.pickle')) ]
+                    results = { result['ptids']: result for result in executor.map(emulate_shard_in_worker, params) }
+
+                    new_seeds = self.exchange_shared_state(results)
+                    changed = [ ptids for ptids in shards.keys()
+                                if (self.get_seed_signature(new_seeds[ptids]) != self.get_seed_signature(seeds[ptids])) ]
+                    if (len(changed) == 0):
+                        self.converged = True
+                        break
+                    seeds = new_seeds
+                else:
+                    self.converged = False
+                    logger.warning(f'shared state is not converged in {self.max_rounds = }, '
+                                   f'{len(changed)} of {len(shards)} shards received changed state at the last round, '
+                                   'so flows across threads can be missed')
+
+            self.merge_results(shards, results)
+
+    def write_shards(self, directory):
+        """
+        Write VM orders to a file per PTIDs.
+        Return a dict of tuples of PID and TID, and directories of the shards.
+        """
+        shards = {}
+        files = {}
+        batches = {}
+        for vm_order in self.emulator.runtime_log_manager.run():
+            ptids = (vm_order.pid, vm_order.tid)
+            if (ptids not in shards.keys()):
+                shards[ptids] = pathlib.Path(directory) / f'{vm_order.pid}_{vm_order.tid}'
+                shards[ptids].mkdir()
+                files[ptids] = open(shards[ptids] / 'orders.pickle', 'wb')
+                batches[ptids] = []
+
+            batches[ptids].append(vm_order)
+            if (len(batches[ptids]) >= 1000):
+                pickle.dump(batches[ptids], files[ptids], protocol=pickle.HIGHEST_PROTOCOL)
+                batches[ptids] = []
+
+        for ptids, f in files.items():
+            pickle.dump(batches[ptids], f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.close()
+
+        return shards
+
+    @staticmethod
+    def load_shard(directory):
+        """
+        Yield VM orders of a shard.
+        """
+        with open(pathlib.Path(directory) / 'orders.pickle', 'rb') as f:
+            while (True):
+                try:
+                    batch = pickle.load(f)
+                except EOFError:
+                    break
+                yield from batch
+
+    @staticmethod
+    def exchange_shared_state(results):
+        """
+        Return writes that each shard receives from the other shards, as lists of tuples of time, kind, key, and value in the order of time.
+        Instances are received only from threads of the same process.
+        """
+        seeds = {}
+        for ptids in results.keys():
+            seeds[ptids] = []
+            for other in sorted(results.keys()):
+                if (other == ptids):
+                    continue
+                for kind, entries in results[other]['shared'].items():
+                    if (kind == 'instances' and other[0] != ptids[0]):
+                        continue
+                    seeds[ptids].extend( (time, kind, key, value) for key, writes in entries.items() for time, value in writes )
+
+            # Writes at the same time are kept in the order of PTIDs
+            seeds[ptids].sort(key=lambda seed: seed[0])
+
+        return seeds
+
+    @staticmethod
+    def get_seed_signature(seed):
+        """
+        Return a comparable signature of the seed's writes, their times, values, and taints of the values and values they refer to.
+        """
+        return [ (time, kind, key, ShardedEmulator.get_value_signature(value)) for time, kind, key, value in seed ]
+
+    @staticmethod
+    def get_value_signature(value):
+        """
+        Return a tuple of data types, primitive values, and taints of the value and values it refers to, in the order of traversal.
+        """
+        signature = []
+        visited = set()
+        values = [value]
+        while (values):
+            value = values.pop()
+            if (not isinstance(value, Value) or id(value) in visited):
+                continue
+            visited.add(id(value))
+
+            primitive = value.value if (isinstance(value.value, (int, float, str, bool)) or value.value is None) else type(value.value).__name__
+            signature.append((value.data_type, primitive, repr(value.taint)))
+
+            # Children are visited in a fixed order, so that the same values have the same signature
+            if (isinstance(value, ClassInstanceValue)):
+                values.extend( value.fields[name] for name in sorted(value.fields.keys(), reverse=True) )
+            else:
+                values.extend(reversed(MemoryManager.get_children(value)))
+
+        return tuple(signature)
+
+    def merge_results(self, shards, results):
+        """
+        Merge results of the shards into the emulator in the order of PTIDs.
+        """
+        taint_tracker = self.emulator.interpreter.taint_tracker
+        for ptids in sorted(results.keys()):
+            taint_tracker.source_detector.found_sources.extend(results[ptids]['found_sources'])
+            taint_tracker.sink_detector.found_sinks.extend(results[ptids]['found_sinks'])
+            taint_tracker.recorder.merge_taint_history(results[ptids]['taint_history'])
+
+            # Append the shard's flow detail log
+            with open(shards[ptids] / FLOW_DETAIL_LOG_FILE, 'r') as f:
+                shutil.copyfileobj(f, FlowDetailLogger.log_file)
@@ -2,6 +2,8 @@ import logging
 
 from .exceptions import *
 from smalien.data_types import string_types
+from smalien.parsers.opcode.evaluators import get_evaluator
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -56,22 +58,25 @@ class PCController:
         register_2_value = registers[inst.register_2].value
 
         try:
-            result = eval(inst.expression, {'register_1': register_1_value, 'register_2': register_2_value})
+            result = get_evaluator(inst.expression, 'register_1, register_2')(register_1_value, register_2_value)
         except Exception as e:
             logger.warning('if_branch failed')
             logger.warning(inst)
             raise Exception(f'{register_1_value = }, {register_2_value = }') from e
 
-        logger.info(f'{inst.expression = }')
-        logger.info(f'{register_1_value = }, {register_2_value = }')
+        if (Trace.enabled):
+            logger.info(f'{inst.expression = }')
+            logger.info(f'{register_1_value = }, {register_2_value = }')
 
         if (result):
             # Branch is taken
-            logger.info('branch is taken')
+            if (Trace.enabled):
+                logger.info('branch is taken')
             return inst.destination.num
 
         # Branch is not taken
-        logger.info('fall through')
+        if (Trace.enabled):
+            logger.info('fall through')
         return self.add_one(**kwargs)
 
     def ifz_branch(self, **kwargs):
@@ -89,7 +94,7 @@ class PCController:
             register_value = 0
 
         try:
-            result = eval(inst.expression, {'register': register_value})
+            result = get_evaluator(inst.expression, 'register')(register_value)
         except Exception as e:
             logger.error('ifz_branch failed')
             logger.error(inst)
@@ -97,11 +102,13 @@ class PCController:
 
         if (result):
             # Branch is taken
-            logger.info(f'{inst.expression = } is true, and branch is taken')
+            if (Trace.enabled):
+                logger.info(f'{inst.expression = } is true, and branch is taken')
             return inst.destination.num
 
         # Branch is not taken
-        logger.info(f'{inst.expression = } is false, and fall through')
+        if (Trace.enabled):
+            logger.info(f'{inst.expression = } is false, and fall through')
         return self.add_one(**kwargs)
 
     def goto(self, **kwargs):
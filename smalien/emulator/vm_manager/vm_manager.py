@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from .structures import VM, VMOrder
 from .vm_runner import VMRunner
 from .callback_triggerer import CallbackTriggerer
+from smalien.utils.loggers import Trace
 from .exceptions import StackIsEmptyException, LogPointException, ExceptionThrownException, ExceptionOccurException, ClinitInvokedException
 
 logger = logging.getLogger(name=__name__)
@@ -88,6 +89,9 @@ class VMManager:
         """
         logger.debug('running')
 
+        # Follow the current log level in the hot path
+        Trace.update()
+
         # Run VMs until a breakpoint
         while True:
 
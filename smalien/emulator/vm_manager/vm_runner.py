@@ -14,6 +14,7 @@ from .context_manager import ContextManager
 from .exceptions import *
 from ..interpreter.taint_tracker.taint_operator import TaintOperator
 from smalien.utils.pretty_printer import PrettyPrinter
+from smalien.utils.loggers import Trace
 
 logger = logging.getLogger(name=__name__)
 
@@ -236,24 +237,21 @@ class VMRunner:
         if (inst is None):
             return sf.pc + 1
 
-        logger.info(f'running a single step {sf.pc = }, {sf.after_invocation = }')
-        logger.info(f'{sf.clss = }')
-        logger.info(f'{sf.method = }')
-        logger.info(inst)
+        if (Trace.enabled):
+            logger.info(f'running a single step {sf.pc = }, {sf.after_invocation = }')
+            logger.info(f'{sf.clss = }')
+            logger.info(f'{sf.method = }')
+            logger.info(inst)
 
         # Execute interpreter modules
-        for module in self.interpreters:
-            module.run(inst=inst, sf=sf,
-                       instances=self.vm.instances,
-                       static_fields=self.vm.static_fields,
-                       intent_data=self.vm.intent_data,
-                       vm=self.vm,
-                       self_ptids=self.vm.ptids,
-                       vms=self.vms)
-
-        logger.info('interpreters finished')
-        logger.info(sf.registers.keys())
-        logger.debug(sf.registers)
+        vm = self.vm
+        for run in self.interpreters[inst.kind]:
+            run(inst, sf, vm.instances, vm.static_fields, vm.intent_data, vm, vm.ptids, self.vms)
+
+        if (Trace.enabled):
+            logger.info('interpreters finished')
+            logger.info(sf.registers.keys())
+            logger.debug(sf.registers)
 
         if (0 in self.vm.instances.keys()):
             logger.error(f'{len(self.vm.instances[0]) = }')
@@ -1,4 +1,5 @@
 import logging
+import threading
 from collections import defaultdict
 
 from .exerciser import Exerciser
@@ -13,10 +14,14 @@ class AutomaticExerciser():
     Automatically exercise the app.
     """
 
-    def __init__(self, app, workspace, taint_sources, taint_sinks, devices, action_num_limit=None):
+    def __init__(self, app, workspace, taint_sources, taint_sinks, devices, action_num_limit=None, adb='adb', log_compression=None,
+                 live=False):
         """
         
         :param action_num_limi:  The exerciser tries actions no more than <action_num_limit> times on each device.
+        :param adb:              adb command, either a command name or a list of arguments.
+        :param log_compression:  Compressor of runtime logs transferred from the device, either None or gzip.
+        :param live:             Emulate the app with the runtime log streamed while performing actions.
         """
 
         logger.debug('initializing')
@@ -28,6 +33,13 @@ class AutomaticExerciser():
         self.taint_sinks = taint_sinks
         self.devices = devices
         self.action_num_limit = action_num_limit
+        self.adb = adb
+        self.log_compression = log_compression
+        self.live = live
+
+        # Live logs are read in the order of lines
+        if (live and (app.log_format != 'json' or app.log_segment_size > 0)):
+            raise Exception(f'Live exercising does not support {app.log_format} logs')
 
         # Helper modules
         self.emulator = None
@@ -57,7 +69,7 @@ class AutomaticExerciser():
             # Initialize
             self.flow_causing_actions = []
 
-            self.exerciser = Exerciser(self.app, self.workspace, device)
+            self.exerciser = Exerciser(self.app, self.workspace, device, self.adb, self.log_compression)
 
             # Install the app
             # Make sure that the app is not installed
@@ -132,6 +144,7 @@ class AutomaticExerciser():
 
                 # Clean the device and perform flow-causing actions
                 self.clean()
+                live_emulation = self.start_live_emulation() if (self.live) else None
                 self.perform_flow_causing_actions()
 
                 # Pop and perform one of actionables.
@@ -142,22 +155,26 @@ class AutomaticExerciser():
                 num_actions += len(self.flow_causing_actions) + 1
                 logger.debug(f'{num_actions = }')
 
-                # Sleep and collect SmalienLog
+                # Sleep and collect SmalienLog, or finish the live emulation
                 self.exerciser.sleep(2)
-                collected = self.exerciser.collect()
+                if (live_emulation is not None):
+                    collected = self.finish_live_emulation(live_emulation)
+                else:
+                    collected = self.exerciser.collect()
 
                 # Apply information flow analysis to the app's executed code
                 if (collected):
-                    # Create an Emulator instance and perform information flow analysis.
-                    logger.debug('app code is executed, and performing information flow analysis')
-
-                    # Run the emulator
-                    self.emulator = Emulator(self.app, self.workspace, self.taint_sources, self.taint_sinks)
-                    try:
-                        self.emulator.run_with_runtime_logs()
-                    except:
-                        # Ignore errors in emulator
-                        pass
+                    if (live_emulation is None):
+                        # Create an Emulator instance and perform information flow analysis.
+                        logger.debug('app code is executed, and performing information flow analysis')
+
+                        # Run the emulator
+                        self.emulator = Emulator(self.app, self.workspace, self.taint_sources, self.taint_sinks)
+                        try:
+                            self.emulator.run_with_runtime_logs()
+                        except:
+                            # Ignore errors in emulator
+                            pass
 
                     num_leaks = self.emulator.get_num_leaks()
                     taint_history_size = len(self.emulator.get_taint_history())
@@ -242,6 +259,42 @@ class AutomaticExerciser():
 
         return False
 
+    def start_live_emulation(self):
+        """
+        Start emulating the app in a background thread with the runtime log streamed from the device,
+        so that the emulation overlaps performing actions.
+        """
+        logger.debug('starting live emulation')
+
+        stream = self.exerciser.stream_log()
+        self.emulator = Emulator(self.app, self.workspace, self.taint_sources, self.taint_sinks)
+
+        thread = threading.Thread(target=self.run_live_emulation, args=(self.emulator, stream), daemon=True)
+        thread.start()
+
+        return stream, thread
+
+    @staticmethod
+    def run_live_emulation(emulator, stream):
+        try:
+            emulator.run_with_live_logs(stream)
+        except:
+            # Ignore errors in emulator
+            pass
+
+    def finish_live_emulation(self, live_emulation):
+        """
+        Close the stream, and wait for the emulator to process the rest of the log.
+        Return true if app code is executed.
+        """
+        logger.debug('finishing live emulation')
+
+        stream, thread = live_emulation
+        stream.close()
+        thread.join()
+
+        return self.emulator.get_log_num() > 0
+
     def clean(self):
         """
         Kill the app and clear smalien logs on the device.
@@ -2,16 +2,26 @@ import logging
 import copy
 import time
 import itertools
+import pathlib
 from xml.etree import ElementTree
 from concurrent.futures import ProcessPoolExecutor
 from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Process
 
 from ..utils.command_runner import CommandRunner
+from ..utils.log_segments import LogSegments
+from .live_log_stream import LiveLogStream
 
 logger = logging.getLogger(name=__name__)
 
 
+# Compressors of runtime logs on the device, keyed by their names.
+# Each is a command writing the compressed file to stdout, the suffix of the compressed copy, and its magic number.
+LOG_COMPRESSORS = {
+    'gzip': (['gzip', '-1', '-c'], '.gz', b'\x1f\x8b'),
+}
+
+
 def mitmdump_recorder(params):
     """
     Read mitmdump's output and write it to file with timestamp.
@@ -40,7 +50,11 @@ class Exerciser:
     This module exercises the app and obtains runtime data.
     """
 
-    def __init__(self, app, workspace, device):
+    def __init__(self, app, workspace, device, adb='adb', log_compression=None):
+        """
+        :param adb:              adb command, either a command name or a list of arguments.
+        :param log_compression:  Compressor of runtime logs transferred from the device, either None or gzip.
+        """
         logger.debug('initializing')
 
         # Setup paths
@@ -51,6 +65,11 @@ class Exerciser:
         self.smaliened = str(app.smaliened)
         self.smalien_log = app.smalien_log
         self.smalien_log_local = app.smalien_log_local
+        self.log_segment_size = app.log_segment_size
+
+        if (log_compression is not None and log_compression not in LOG_COMPRESSORS.keys()):
+            raise Exception(f'Unsupported log compression {log_compression}')
+        self.log_compression = log_compression
 
         # Logcat
         self.logcat_log = app.logcat_log
@@ -62,7 +81,7 @@ class Exerciser:
         self.mitmdump_recorder_pool = None
 
         # Setup ADB command
-        self.adb = ['adb']
+        self.adb = [adb] if (isinstance(adb, str)) else list(adb)
         if (self.device is not None):
             self.adb.extend([
                 '-s',
@@ -92,6 +111,13 @@ class Exerciser:
             'rm',
             self.smalien_log])
 
+        # Segments are also removed from the device and the workspace,
+        # since segments collected previously are not overwritten
+        if (self.log_segment_size > 0):
+            cmd.append(f'{self.smalien_log}.*')
+            for path in self.smalien_log_local.parent.glob(f'{self.smalien_log_local.name}.*'):
+                path.unlink()
+
         # Run the command
         try:
             CommandRunner.run(cmd)
@@ -301,18 +327,13 @@ class Exerciser:
         """
         Collect the app's log on the device.
         """
-        logger.debug(f'collecting {self.smalien_log}')
+        if (self.log_segment_size > 0):
+            return self.collect_segments()
 
-        # Create a command
-        cmd = copy.copy(self.adb)
-        cmd.extend([
-            'pull',
-            self.smalien_log,
-            self.workspace])
+        logger.debug(f'collecting {self.smalien_log}')
 
-        # Run the command
         try:
-            CommandRunner.run(cmd)
+            self.pull(self.smalien_log, self.log_compression)
 
             # Successfully collected
             return True
@@ -322,6 +343,98 @@ class Exerciser:
 
             return False
 
+    def collect_segments(self):
+        """
+        Collect segments of the app's log on the device.
+        Indexed segments are complete, so they are pulled only once with their indexes.
+        Segments being written are pulled every time.
+        """
+        logger.debug(f'collecting segments of {self.smalien_log}')
+
+        # List segments and indexes on the device
+        cmd = copy.copy(self.adb)
+        cmd.extend([
+            'shell',
+            'ls',
+            f'{self.smalien_log}.*'])
+
+        try:
+            names = CommandRunner.run(cmd).decode('utf-8').split()
+        except Exception as e:
+            logger.debug(f'failed to list segments {e = }')
+
+            return False
+
+        segments = LogSegments.parse_names(self.smalien_log, names)
+        for (pid, num), indexed in segments.items():
+            local_index = pathlib.Path(LogSegments.get_index_path(self.smalien_log_local, pid, num))
+            if (local_index.exists()):
+                continue
+
+            # The index is pulled after the segment, so that a local index implies the local segment is complete
+            paths = [(LogSegments.get_path(self.smalien_log, pid, num), self.log_compression)]
+            if (indexed):
+                paths.append((LogSegments.get_index_path(self.smalien_log, pid, num), None))
+
+            for path, compression in paths:
+                try:
+                    self.pull(path, compression)
+                except Exception as e:
+                    logger.debug(f'failed to collect {e = }')
+
+                    return False
+
+        logger.debug(f'collected {len(segments)} segments')
+
+        return len(segments) > 0
+
+    def stream_log(self):
+        """
+        Start streaming the app's log on the device while the app is being exercised.
+        """
+        logger.debug(f'streaming {self.smalien_log}')
+
+        return LiveLogStream.from_adb(self.adb, self.smalien_log)
+
+    def pull(self, remote, compression=None):
+        """
+        Pull the file on the device to the workspace.
+        With a compressor, the file is compressed on the device and streamed through adb exec-out,
+        and only the compressed copy is saved as <name><suffix>, which the runtime log manager decompresses while reading it.
+        """
+        local = self.workspace / pathlib.PurePosixPath(remote).name
+
+        # Remove copies previously collected in the other forms, not to be read instead of the new copy
+        stale = [ pathlib.Path(f'{local}{suffix}') for _, suffix, _ in LOG_COMPRESSORS.values() ] + [local]
+
+        cmd = copy.copy(self.adb)
+        if (compression is None):
+            [ path.unlink(missing_ok=True) for path in stale if path != local ]
+
+            cmd.extend([
+                'pull',
+                remote,
+                self.workspace])
+
+            CommandRunner.run(cmd)
+            return
+
+        compressor, suffix, magic = LOG_COMPRESSORS[compression]
+        compressed = pathlib.Path(f'{local}{suffix}')
+        [ path.unlink(missing_ok=True) for path in stale if path != compressed ]
+
+        cmd.append('exec-out')
+        cmd.extend(compressor)
+        cmd.append(remote)
+
+        CommandRunner.run_with_redirecting_to_file(cmd, compressed)
+
+        # exec-out does not return the exit status of the command, so check that the output is compressed
+        with open(compressed, 'rb') as f:
+            if (f.read(len(magic)) != magic):
+                compressed.unlink()
+                raise Exception(f'Failed to compress {remote} with {compression}')
+
     def press_home_button(self, seconds=0):
         """
         Press home button.
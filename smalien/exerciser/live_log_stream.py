@@ -0,0 +1,69 @@
+import socket
+import logging
+import subprocess
+
+logger = logging.getLogger(name=__name__)
+
+
+class LiveLogStream:
+    """
+    Stream lines of the runtime log while the app is being exercised.
+    Lines are read from a process following the log on the device, or from a local socket standing in for the device.
+    The stream ends when it is closed, after lines already received are read.
+    """
+
+    def __init__(self, f, process=None, sock=None):
+        logger.debug('initializing')
+
+        self.f = f
+        self.process = process
+        self.sock = sock
+
+    @staticmethod
+    def from_adb(adb, log):
+        """
+        Follow the log on the device with tail, which waits for the log to be created and reads it from the beginning.
+
+        :param adb:   adb command as a list of arguments.
+        :param log:   Path to the log on the device.
+        """
+        cmd = adb + ['exec-out', 'tail', '-n', '+1', '-F', log]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        return LiveLogStream(process.stdout, process=process)
+
+    @staticmethod
+    def from_socket(address):
+        """
+        Read the log from a local socket.
+
+        :param address:   Tuple of the host and port.
+        """
+        sock = socket.create_connection(address)
+
+        return LiveLogStream(sock.makefile('rb'), sock=sock)
+
+    def __iter__(self):
+        try:
+            for line in self.f:
+                yield line
+        finally:
+            self.f.close()
+            if (self.sock is not None):
+                self.sock.close()
+
+    def close(self):
+        """
+        Stop receiving lines.
+        This is called from a thread other than the reader, whose iteration ends at the end of received lines.
+        """
+        logger.debug('closing')
+
+        if (self.process is not None):
+            self.process.terminate()
+            self.process.wait()
+        if (self.sock is not None):
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError as e:
+                logger.debug(f'{e = }')
@@ -8,12 +8,20 @@ from smalien.definitions import REF_LIMIT_IN_DEX
 logger = logging.getLogger(name=__name__)
 
 
+# Instructions whose payloads only modify long-distance jumps without logging
+JUMP_KINDS = ['if', 'ifz', 'goto']
+
+
 class Generator():
     """
     Generate code logging runtime data of the app.
     """
 
-    def __init__(self, app, register_reassignment, use_shared_converter, converter_keys, taint_sources, dummy_source_values):
+    def __init__(self, app, register_reassignment, use_shared_converter, converter_keys, taint_sources, dummy_source_values, methods=None, redundant=None):
+        """
+        :param methods:    Methods instrumented, as a set of class and method names. If None, all implemented methods are instrumented.
+        :param redundant:  Log points not instrumented, as a set of class names, method names, and line numbers.
+        """
         logger.debug('initializing')
 
         self.app = app
@@ -27,6 +35,13 @@ class Generator():
         self.reference_num = 0
         self.smalien_dex_id = 0
 
+        self.methods = methods
+        self.redundant = redundant
+
+        # Numbers of instructions logged, instructions skipped by the selective instrumentation, and redundant instructions skipped
+        self.log_point_num = 0
+        self.removed_log_point_num = 0
+        self.minimized_log_point_num = 0
 
     def run(self):
         """
@@ -40,11 +55,19 @@ class Generator():
                     self.generate_payload_for_a_class(class_data.payloads,
                                                       class_data.methods,
                                                       class_data.cid,
-                                                      self.app.classes)
+                                                      self.app.classes,
+                                                      class_data.name)
                 except Exception as e:
                     raise Exception(f'{class_data.path = }') from e
 
-    def generate_payload_for_a_class(self, class_payloads, methods, cid, classes):
+        if (self.methods is not None):
+            logger.info(f'selective instrumentation removed {self.removed_log_point_num} of '
+                        f'{self.log_point_num + self.removed_log_point_num} log points')
+        if (self.redundant is not None):
+            logger.info(f'minimization removed {self.minimized_log_point_num} of '
+                        f'{self.log_point_num + self.minimized_log_point_num} log points')
+
+    def generate_payload_for_a_class(self, class_payloads, methods, cid, classes, clss):
         """
         Generate one class's payload.
         """
@@ -52,10 +75,20 @@ class Generator():
             if (not method.implemented):
                 continue
 
+            if (self.methods is not None and (clss, method.name) not in self.methods):
+                # Count instructions that would be logged
+                self.removed_log_point_num += sum( 1 for inst in method.instructions.values()
+                                                   if inst.kind in payload_mapping.keys() and inst.kind not in JUMP_KINDS )
+                continue
+
             # Generate payloads for instructions in the method
             for i in range(method.start_at, method.end_at):
                 inst = method.instructions.get(i, None)
                 if (inst is not None and inst.kind in payload_mapping.keys()):
+                    if (self.redundant is not None and (clss, method.name, i) in self.redundant):
+                        self.minimized_log_point_num += 1
+                        continue
+
                     # Generate and save a payload
                     payloads, converter_keys = payload_mapping[inst.kind].run(inst=inst,
                                                                               cid=cid,
@@ -84,6 +117,9 @@ class Generator():
                         # Mark the instruction as logged
                         inst.logging = True
 
+                        if (any( isinstance(payload, PayloadLogging) for payload in payloads )):
+                            self.log_point_num += 1
+
                         # Check if the payload counter reaches to the limit
                         if (self.reference_num >= REF_LIMIT_IN_DEX):
                             # Increment the smalien dex id
@@ -4,6 +4,7 @@ from .payload_generator_utils import Utils
 from .structures import PayloadDummyReturnedValue
 from smalien.data_types import primitive_data_types, numeric_types_64, CHECK_CAST_TARGET
 from smalien.definitions import LONG_DISTANCE_JUMP_THRESHOLD
+from smalien.taint_definitions.definition_matcher import get_matcher
 
 logger = logging.getLogger(name=__name__)
 
@@ -152,11 +153,9 @@ class PayloadInvokeGenerator():
                 if (dummy_source_values is not None):
                     # Check whether the invoked method is a taint source
                     # Currently, reflection calls are not supported
-                    if (inst.class_name in taint_sources.keys() and
-                        inst.method_name in taint_sources[inst.class_name].keys()
-                       ):
+                    source_key = get_matcher(taint_sources, 'exact').find(inst.class_name, inst.method_name)
+                    if (source_key is not None):
                         # Generate a dummy-source-returning instruction
-                        source_key = taint_sources[inst.class_name][inst.method_name]
                         if (source_key in dummy_source_values.keys()):
                             payloads.append(Utils.generate_dummy_returned_value(position,
                                                                                 move_result.destination,
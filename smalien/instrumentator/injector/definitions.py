@@ -450,3 +450,1282 @@ SMALIEN_WRITER = '''
     throw p0
 .end method
 '''
+
+# Variant of SmalienWriter writing binary records.
+# A record consists of:
+#   - timestamp (int64), pid (int32), and tid (int32)
+#   - cid (int32), line (int32), and register (int32) of the smalien id,
+#     where the register is 0 if no register is logged, n+1 for v<n>, and -(n+1) for p<n>
+#   - length of the value (int32, -1 if no value is logged) and the value in UTF-8
+# All integers are big-endian, as written by DataOutputStream.
+# Smalien ids are passed as constant strings by call sites, so each id is parsed once and cached.
+# Records are buffered in memory, and appended to the log file with a single write when LOG_BUFF_SIZE records are buffered.
+SMALIEN_BINARY_WRITER = '''
+# static fields
+.field private static buffer:Ljava/io/ByteArrayOutputStream;
+
+.field private static cntr:I = 0x0
+
+.field private static dataStream:Ljava/io/DataOutputStream;
+
+.field private static fileStream:Ljava/io/FileOutputStream;
+
+.field private static ids:Ljava/util/HashMap;
+
+
+# direct methods
+.method static constructor <clinit>()V
+    .locals 3
+
+    new-instance v0, Ljava/io/ByteArrayOutputStream;
+
+    const/high16 v1, 0x10000
+
+    invoke-direct {v0, v1}, Ljava/io/ByteArrayOutputStream;-><init>(I)V
+
+    sput-object v0, LSmalienWriter;->buffer:Ljava/io/ByteArrayOutputStream;
+
+    new-instance v1, Ljava/io/DataOutputStream;
+
+    invoke-direct {v1, v0}, Ljava/io/DataOutputStream;-><init>(Ljava/io/OutputStream;)V
+
+    sput-object v1, LSmalienWriter;->dataStream:Ljava/io/DataOutputStream;
+
+    new-instance v0, Ljava/util/HashMap;
+
+    invoke-direct {v0}, Ljava/util/HashMap;-><init>()V
+
+    sput-object v0, LSmalienWriter;->ids:Ljava/util/HashMap;
+
+    const/4 v0, 0x0
+
+    sput v0, LSmalienWriter;->cntr:I
+
+    :try_start_0
+    new-instance v0, Ljava/io/FileOutputStream;
+
+    const-string v1, "LOG_PATH"
+
+    const/4 v2, 0x1
+
+    invoke-direct {v0, v1, v2}, Ljava/io/FileOutputStream;-><init>(Ljava/lang/String;Z)V
+
+    sput-object v0, LSmalienWriter;->fileStream:Ljava/io/FileOutputStream;
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    return-void
+.end method
+
+.method public constructor <init>()V
+    .locals 0
+
+    invoke-direct {p0}, Ljava/lang/Object;-><init>()V
+
+    return-void
+.end method
+
+.method public static writeTag(Ljava/lang/String;)V
+    .locals 1
+
+    const/4 v0, 0x0
+
+    invoke-static {p0, v0}, LSmalienWriter;->writeRecord(Ljava/lang/String;[B)V
+
+    return-void
+.end method
+
+.method public static writeVal(Ljava/lang/String;Ljava/lang/String;)V
+    .locals 1
+
+    invoke-static {p1}, Ljava/lang/String;->valueOf(Ljava/lang/Object;)Ljava/lang/String;
+
+    move-result-object v0
+
+    invoke-virtual {v0}, Ljava/lang/String;->getBytes()[B
+
+    move-result-object v0
+
+    invoke-static {p0, v0}, LSmalienWriter;->writeRecord(Ljava/lang/String;[B)V
+
+    return-void
+.end method
+
+.method private static writeRecord(Ljava/lang/String;[B)V
+    .locals 6
+
+    invoke-static {}, Ljava/lang/System;->currentTimeMillis()J
+
+    move-result-wide v0
+
+    invoke-static {}, Landroid/os/Process;->myPid()I
+
+    move-result v2
+
+    invoke-static {}, Landroid/os/Process;->myTid()I
+
+    move-result v3
+
+    sget-object v4, LSmalienWriter;->dataStream:Ljava/io/DataOutputStream;
+
+    monitor-enter v4
+
+    :try_start_0
+    invoke-static {p0}, LSmalienWriter;->getIds(Ljava/lang/String;)[I
+
+    move-result-object p0
+
+    invoke-virtual {v4, v0, v1}, Ljava/io/DataOutputStream;->writeLong(J)V
+
+    invoke-virtual {v4, v2}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    invoke-virtual {v4, v3}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    const/4 v5, 0x0
+
+    aget v5, p0, v5
+
+    invoke-virtual {v4, v5}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    const/4 v5, 0x1
+
+    aget v5, p0, v5
+
+    invoke-virtual {v4, v5}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    const/4 v5, 0x2
+
+    aget v5, p0, v5
+
+    invoke-virtual {v4, v5}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    if-nez p1, :cond_0
+
+    const/4 v5, -0x1
+
+    invoke-virtual {v4, v5}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    goto :goto_0
+
+    :cond_0
+    array-length v5, p1
+
+    invoke-virtual {v4, v5}, Ljava/io/DataOutputStream;->writeInt(I)V
+
+    invoke-virtual {v4, p1}, Ljava/io/DataOutputStream;->write([B)V
+
+    :goto_0
+    sget v5, LSmalienWriter;->cntr:I
+
+    add-int/lit8 v5, v5, 0x1
+
+    const v0, LOG_BUFF_SIZE
+
+    if-lt v5, v0, :cond_1
+
+    sget-object v0, LSmalienWriter;->buffer:Ljava/io/ByteArrayOutputStream;
+
+    sget-object v1, LSmalienWriter;->fileStream:Ljava/io/FileOutputStream;
+
+    invoke-virtual {v0, v1}, Ljava/io/ByteArrayOutputStream;->writeTo(Ljava/io/OutputStream;)V
+
+    invoke-virtual {v0}, Ljava/io/ByteArrayOutputStream;->reset()V
+
+    const/4 v5, 0x0
+
+    :cond_1
+    sput v5, LSmalienWriter;->cntr:I
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+    .catchall {:try_start_0 .. :try_end_0} :catchall_0
+
+    :goto_1
+    :try_start_1
+    monitor-exit v4
+    :try_end_1
+    .catchall {:try_start_1 .. :try_end_1} :catchall_0
+
+    return-void
+
+    :catch_0
+    # Failed to write the records, and they are discarded
+    :try_start_3
+    sget-object v0, LSmalienWriter;->buffer:Ljava/io/ByteArrayOutputStream;
+
+    invoke-virtual {v0}, Ljava/io/ByteArrayOutputStream;->reset()V
+
+    const/4 v5, 0x0
+
+    sput v5, LSmalienWriter;->cntr:I
+    :try_end_3
+    .catchall {:try_start_3 .. :try_end_3} :catchall_0
+
+    goto :goto_1
+
+    :catchall_0
+    move-exception p0
+
+    :try_start_2
+    monitor-exit v4
+    :try_end_2
+    .catchall {:try_start_2 .. :try_end_2} :catchall_0
+
+    throw p0
+.end method
+
+.method private static getIds(Ljava/lang/String;)[I
+    .locals 2
+
+    # Called while holding the lock of dataStream, which also guards the cache
+    sget-object v0, LSmalienWriter;->ids:Ljava/util/HashMap;
+
+    invoke-virtual {v0, p0}, Ljava/util/HashMap;->get(Ljava/lang/Object;)Ljava/lang/Object;
+
+    move-result-object v1
+
+    check-cast v1, [I
+
+    if-nez v1, :cond_0
+
+    invoke-static {p0}, LSmalienWriter;->parseId(Ljava/lang/String;)[I
+
+    move-result-object v1
+
+    invoke-virtual {v0, p0, v1}, Ljava/util/HashMap;->put(Ljava/lang/Object;Ljava/lang/Object;)Ljava/lang/Object;
+
+    :cond_0
+    return-object v1
+.end method
+
+.method private static parseId(Ljava/lang/String;)[I
+    .locals 5
+
+    # Parse <cid>_<line>[_<reg>] into cid, line, and the register's code
+    const/4 v0, 0x3
+
+    new-array v0, v0, [I
+
+    const/16 v1, 0x5f
+
+    invoke-virtual {p0, v1}, Ljava/lang/String;->indexOf(I)I
+
+    move-result v2
+
+    const/4 v3, 0x0
+
+    invoke-virtual {p0, v3, v2}, Ljava/lang/String;->substring(II)Ljava/lang/String;
+
+    move-result-object v3
+
+    invoke-static {v3}, Ljava/lang/Integer;->parseInt(Ljava/lang/String;)I
+
+    move-result v3
+
+    const/4 v4, 0x0
+
+    aput v3, v0, v4
+
+    add-int/lit8 v2, v2, 0x1
+
+    invoke-virtual {p0, v1, v2}, Ljava/lang/String;->indexOf(II)I
+
+    move-result v1
+
+    if-gez v1, :cond_0
+
+    # No register is logged, so the code stays 0
+    invoke-virtual {p0, v2}, Ljava/lang/String;->substring(I)Ljava/lang/String;
+
+    move-result-object v3
+
+    invoke-static {v3}, Ljava/lang/Integer;->parseInt(Ljava/lang/String;)I
+
+    move-result v3
+
+    const/4 v4, 0x1
+
+    aput v3, v0, v4
+
+    return-object v0
+
+    :cond_0
+    invoke-virtual {p0, v2, v1}, Ljava/lang/String;->substring(II)Ljava/lang/String;
+
+    move-result-object v3
+
+    invoke-static {v3}, Ljava/lang/Integer;->parseInt(Ljava/lang/String;)I
+
+    move-result v3
+
+    const/4 v4, 0x1
+
+    aput v3, v0, v4
+
+    # The register's number follows its kind, v or p
+    add-int/lit8 v2, v1, 0x2
+
+    invoke-virtual {p0, v2}, Ljava/lang/String;->substring(I)Ljava/lang/String;
+
+    move-result-object v3
+
+    invoke-static {v3}, Ljava/lang/Integer;->parseInt(Ljava/lang/String;)I
+
+    move-result v3
+
+    add-int/lit8 v3, v3, 0x1
+
+    add-int/lit8 v1, v1, 0x1
+
+    invoke-virtual {p0, v1}, Ljava/lang/String;->charAt(I)C
+
+    move-result v1
+
+    const/16 v2, 0x70
+
+    if-ne v1, v2, :cond_1
+
+    neg-int v3, v3
+
+    :cond_1
+    const/4 v4, 0x2
+
+    aput v3, v0, v4
+
+    return-object v0
+.end method
+'''
+
+# Variant of SmalienWriter buffering records per thread, in the same JSON format.
+# Each thread appends records to its own buffer, which is handed over to a queue when LOG_BUFF_SIZE records are buffered.
+# SmalienFlusher writes the queued buffers in a daemon thread at intervals, draining buffers of all threads.
+# It also drains and writes them at process exit and on low memory.
+# A record is prefixed with a sequence number shared by threads of the process, as <seq>:<time>:<pid>:<tid>:<location>.
+# A line of the log holds records of a single thread, so records of the threads are put back in the order of the sequence numbers on the host.
+# If LOG_SEGMENT_SIZE is not 0, the log rolls over to a new segment once a segment has LOG_SEGMENT_SIZE characters.
+# A closed segment is indexed with its first and last timestamps and PTIDs.
+SMALIEN_THREADED_WRITER = '''
+# static fields
+.field private static buffers:Ljava/util/ArrayList;
+
+.field private static callbacks:LSmalienFlusher;
+
+.field private static firstTime:J
+
+.field private static lastTime:J
+
+.field private static local:Ljava/lang/ThreadLocal;
+
+.field private static printWriter:Ljava/io/PrintWriter;
+
+.field private static ptids:Ljava/util/HashSet;
+
+.field private static queue:Ljava/util/concurrent/LinkedBlockingQueue;
+
+.field private static segment:I
+
+.field private static seq:Ljava/util/concurrent/atomic/AtomicLong;
+
+.field private static written:J
+
+
+# direct methods
+.method static constructor <clinit>()V
+    .locals 5
+
+    new-instance v0, Ljava/util/ArrayList;
+
+    invoke-direct {v0}, Ljava/util/ArrayList;-><init>()V
+
+    sput-object v0, LSmalienWriter;->buffers:Ljava/util/ArrayList;
+
+    new-instance v0, Ljava/lang/ThreadLocal;
+
+    invoke-direct {v0}, Ljava/lang/ThreadLocal;-><init>()V
+
+    sput-object v0, LSmalienWriter;->local:Ljava/lang/ThreadLocal;
+
+    new-instance v0, Ljava/util/concurrent/LinkedBlockingQueue;
+
+    invoke-direct {v0}, Ljava/util/concurrent/LinkedBlockingQueue;-><init>()V
+
+    sput-object v0, LSmalienWriter;->queue:Ljava/util/concurrent/LinkedBlockingQueue;
+
+    new-instance v0, Ljava/util/HashSet;
+
+    invoke-direct {v0}, Ljava/util/HashSet;-><init>()V
+
+    sput-object v0, LSmalienWriter;->ptids:Ljava/util/HashSet;
+
+    new-instance v0, Ljava/util/concurrent/atomic/AtomicLong;
+
+    invoke-direct {v0}, Ljava/util/concurrent/atomic/AtomicLong;-><init>()V
+
+    sput-object v0, LSmalienWriter;->seq:Ljava/util/concurrent/atomic/AtomicLong;
+
+    invoke-static {}, LSmalienWriter;->openSegment()V
+
+    # Start the flusher thread
+    new-instance v0, Ljava/lang/Thread;
+
+    new-instance v1, LSmalienFlusher;
+
+    const/4 v2, 0x0
+
+    invoke-direct {v1, v2}, LSmalienFlusher;-><init>(I)V
+
+    const-string v2, "SmalienFlusher"
+
+    invoke-direct {v0, v1, v2}, Ljava/lang/Thread;-><init>(Ljava/lang/Runnable;Ljava/lang/String;)V
+
+    const/4 v1, 0x1
+
+    invoke-virtual {v0, v1}, Ljava/lang/Thread;->setDaemon(Z)V
+
+    invoke-virtual {v0}, Ljava/lang/Thread;->start()V
+
+    # Flush at process exit
+    :try_start_1
+    invoke-static {}, Ljava/lang/Runtime;->getRuntime()Ljava/lang/Runtime;
+
+    move-result-object v0
+
+    new-instance v1, Ljava/lang/Thread;
+
+    new-instance v2, LSmalienFlusher;
+
+    const/4 v3, 0x1
+
+    invoke-direct {v2, v3}, LSmalienFlusher;-><init>(I)V
+
+    invoke-direct {v1, v2}, Ljava/lang/Thread;-><init>(Ljava/lang/Runnable;)V
+
+    invoke-virtual {v0, v1}, Ljava/lang/Runtime;->addShutdownHook(Ljava/lang/Thread;)V
+    :try_end_1
+    .catch Ljava/lang/Exception; {:try_start_1 .. :try_end_1} :catch_1
+
+    :catch_1
+    return-void
+.end method
+
+.method private static getSegmentPath()Ljava/lang/String;
+    .locals 2
+
+    # Segments are named <log path>.<pid>.<segment number>, since processes of the app write their own segments
+    new-instance v0, Ljava/lang/StringBuilder;
+
+    invoke-direct {v0}, Ljava/lang/StringBuilder;-><init>()V
+
+    const-string v1, "LOG_PATH."
+
+    invoke-virtual {v0, v1}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    invoke-static {}, Landroid/os/Process;->myPid()I
+
+    move-result v1
+
+    invoke-virtual {v0, v1}, Ljava/lang/StringBuilder;->append(I)Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    const-string v1, "."
+
+    invoke-virtual {v0, v1}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    sget v1, LSmalienWriter;->segment:I
+
+    invoke-virtual {v0, v1}, Ljava/lang/StringBuilder;->append(I)Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    invoke-virtual {v0}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    move-result-object v0
+
+    return-object v0
+.end method
+
+.method private static openSegment()V
+    .locals 5
+
+    # The log is written to a single file if the segment size is 0, and otherwise to segments
+    const-string v0, "LOG_PATH"
+
+    const v1, LOG_SEGMENT_SIZE
+
+    if-eqz v1, :cond_0
+
+    invoke-static {}, LSmalienWriter;->getSegmentPath()Ljava/lang/String;
+
+    move-result-object v0
+
+    :cond_0
+    const/4 v1, 0x0
+
+    sput-object v1, LSmalienWriter;->printWriter:Ljava/io/PrintWriter;
+
+    :try_start_0
+    new-instance v1, Ljava/io/PrintWriter;
+
+    new-instance v2, Ljava/io/BufferedWriter;
+
+    new-instance v3, Ljava/io/FileWriter;
+
+    const/4 v4, 0x1
+
+    invoke-direct {v3, v0, v4}, Ljava/io/FileWriter;-><init>(Ljava/lang/String;Z)V
+
+    invoke-direct {v2, v3}, Ljava/io/BufferedWriter;-><init>(Ljava/io/Writer;)V
+
+    invoke-direct {v1, v2}, Ljava/io/PrintWriter;-><init>(Ljava/io/Writer;)V
+
+    sput-object v1, LSmalienWriter;->printWriter:Ljava/io/PrintWriter;
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    return-void
+.end method
+
+.method public constructor <init>()V
+    .locals 0
+
+    invoke-direct {p0}, Ljava/lang/Object;-><init>()V
+
+    return-void
+.end method
+
+.method private static getPrefix()Ljava/lang/StringBuilder;
+    .locals 4
+
+    # Start a record with <seq>:<time>:<pid>:<tid>:,
+    # where seq is taken from a counter shared by threads of the process to order their records
+    sget-object v0, LSmalienWriter;->seq:Ljava/util/concurrent/atomic/AtomicLong;
+
+    invoke-virtual {v0}, Ljava/util/concurrent/atomic/AtomicLong;->getAndIncrement()J
+
+    move-result-wide v0
+
+    new-instance v2, Ljava/lang/StringBuilder;
+
+    invoke-direct {v2}, Ljava/lang/StringBuilder;-><init>()V
+
+    invoke-virtual {v2, v0, v1}, Ljava/lang/StringBuilder;->append(J)Ljava/lang/StringBuilder;
+
+    const-string v3, ":"
+
+    invoke-virtual {v2, v3}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-static {}, Ljava/lang/System;->currentTimeMillis()J
+
+    move-result-wide v0
+
+    invoke-virtual {v2, v0, v1}, Ljava/lang/StringBuilder;->append(J)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v2, v3}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-static {}, Landroid/os/Process;->myPid()I
+
+    move-result v0
+
+    invoke-virtual {v2, v0}, Ljava/lang/StringBuilder;->append(I)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v2, v3}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-static {}, Landroid/os/Process;->myTid()I
+
+    move-result v0
+
+    invoke-virtual {v2, v0}, Ljava/lang/StringBuilder;->append(I)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v2, v3}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    return-object v2
+.end method
+
+.method public static writeTag(Ljava/lang/String;)V
+    .locals 1
+
+    invoke-static {}, LSmalienWriter;->getPrefix()Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    invoke-virtual {v0, p0}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v0}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    move-result-object p0
+
+    invoke-static {p0}, Lorg/json/JSONObject;->quote(Ljava/lang/String;)Ljava/lang/String;
+
+    move-result-object p0
+
+    invoke-static {p0}, LSmalienWriter;->append(Ljava/lang/String;)V
+
+    return-void
+.end method
+
+.method public static writeVal(Ljava/lang/String;Ljava/lang/String;)V
+    .locals 2
+
+    invoke-static {}, LSmalienWriter;->getPrefix()Ljava/lang/StringBuilder;
+
+    move-result-object v0
+
+    invoke-virtual {v0, p0}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    const-string v1, ":"
+
+    invoke-virtual {v0, v1}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v0, p1}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    invoke-virtual {v0}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    move-result-object v0
+
+    invoke-static {v0}, Lorg/json/JSONObject;->quote(Ljava/lang/String;)Ljava/lang/String;
+
+    move-result-object v0
+
+    invoke-static {v0}, LSmalienWriter;->append(Ljava/lang/String;)V
+
+    return-void
+.end method
+
+.method private static append(Ljava/lang/String;)V
+    .locals 4
+
+    # Get the thread's buffer
+    sget-object v0, LSmalienWriter;->local:Ljava/lang/ThreadLocal;
+
+    invoke-virtual {v0}, Ljava/lang/ThreadLocal;->get()Ljava/lang/Object;
+
+    move-result-object v1
+
+    check-cast v1, Ljava/util/ArrayList;
+
+    if-nez v1, :cond_0
+
+    # Create and register a buffer of the thread
+    new-instance v1, Ljava/util/ArrayList;
+
+    invoke-direct {v1}, Ljava/util/ArrayList;-><init>()V
+
+    invoke-virtual {v0, v1}, Ljava/lang/ThreadLocal;->set(Ljava/lang/Object;)V
+
+    sget-object v2, LSmalienWriter;->buffers:Ljava/util/ArrayList;
+
+    monitor-enter v2
+
+    :try_start_0
+    invoke-virtual {v2, v1}, Ljava/util/ArrayList;->add(Ljava/lang/Object;)Z
+
+    monitor-exit v2
+    :try_end_0
+    .catchall {:try_start_0 .. :try_end_0} :catchall_0
+
+    # The buffer is locked by the flusher only while it is drained
+    :cond_0
+    monitor-enter v1
+
+    :try_start_1
+    invoke-virtual {v1, p0}, Ljava/util/ArrayList;->add(Ljava/lang/Object;)Z
+
+    invoke-virtual {v1}, Ljava/util/ArrayList;->size()I
+
+    move-result v3
+
+    const v0, LOG_BUFF_SIZE
+
+    if-lt v3, v0, :cond_1
+
+    invoke-static {v1}, LSmalienWriter;->handOver(Ljava/util/ArrayList;)V
+
+    :cond_1
+    monitor-exit v1
+    :try_end_1
+    .catchall {:try_start_1 .. :try_end_1} :catchall_1
+
+    return-void
+
+    :catchall_0
+    move-exception p0
+
+    :try_start_2
+    monitor-exit v2
+    :try_end_2
+    .catchall {:try_start_2 .. :try_end_2} :catchall_0
+
+    throw p0
+
+    :catchall_1
+    move-exception p0
+
+    :try_start_3
+    monitor-exit v1
+    :try_end_3
+    .catchall {:try_start_3 .. :try_end_3} :catchall_1
+
+    throw p0
+.end method
+
+.method private static handOver(Ljava/util/ArrayList;)V
+    .locals 2
+
+    # Move records of the locked buffer to the queue, keeping the order of the thread's records
+    invoke-virtual {p0}, Ljava/util/ArrayList;->isEmpty()Z
+
+    move-result v0
+
+    if-nez v0, :cond_0
+
+    invoke-virtual {p0}, Ljava/util/ArrayList;->size()I
+
+    move-result v0
+
+    new-array v0, v0, [Ljava/lang/String;
+
+    invoke-virtual {p0, v0}, Ljava/util/ArrayList;->toArray([Ljava/lang/Object;)[Ljava/lang/Object;
+
+    move-result-object v0
+
+    invoke-virtual {p0}, Ljava/util/ArrayList;->clear()V
+
+    sget-object v1, LSmalienWriter;->queue:Ljava/util/concurrent/LinkedBlockingQueue;
+
+    invoke-virtual {v1, v0}, Ljava/util/concurrent/LinkedBlockingQueue;->offer(Ljava/lang/Object;)Z
+
+    :cond_0
+    return-void
+.end method
+
+.method private static drainBuffers()V
+    .locals 3
+
+    # Copy the registered buffers, not to lock the registry while locking the buffers
+    sget-object v0, LSmalienWriter;->buffers:Ljava/util/ArrayList;
+
+    monitor-enter v0
+
+    :try_start_0
+    invoke-virtual {v0}, Ljava/util/ArrayList;->toArray()[Ljava/lang/Object;
+
+    move-result-object v1
+
+    monitor-exit v0
+    :try_end_0
+    .catchall {:try_start_0 .. :try_end_0} :catchall_0
+
+    const/4 v0, 0x0
+
+    :goto_0
+    array-length v2, v1
+
+    if-ge v0, v2, :cond_0
+
+    aget-object v2, v1, v0
+
+    check-cast v2, Ljava/util/ArrayList;
+
+    monitor-enter v2
+
+    :try_start_1
+    invoke-static {v2}, LSmalienWriter;->handOver(Ljava/util/ArrayList;)V
+
+    monitor-exit v2
+    :try_end_1
+    .catchall {:try_start_1 .. :try_end_1} :catchall_1
+
+    add-int/lit8 v0, v0, 0x1
+
+    goto :goto_0
+
+    :cond_0
+    return-void
+
+    :catchall_0
+    move-exception v1
+
+    :try_start_2
+    monitor-exit v0
+    :try_end_2
+    .catchall {:try_start_2 .. :try_end_2} :catchall_0
+
+    throw v1
+
+    :catchall_1
+    move-exception v1
+
+    :try_start_3
+    monitor-exit v2
+    :try_end_3
+    .catchall {:try_start_3 .. :try_end_3} :catchall_1
+
+    throw v1
+.end method
+
+.method private static writeQueued()V
+    .locals 8
+
+    # Writers are serialized by the queue's monitor, which app threads do not lock
+    sget-object v0, LSmalienWriter;->queue:Ljava/util/concurrent/LinkedBlockingQueue;
+
+    monitor-enter v0
+
+    :try_start_0
+    :goto_0
+    invoke-virtual {v0}, Ljava/util/concurrent/LinkedBlockingQueue;->poll()Ljava/lang/Object;
+
+    move-result-object v2
+
+    if-eqz v2, :cond_1
+
+    # Records are discarded if the log file is not opened
+    sget-object v1, LSmalienWriter;->printWriter:Ljava/io/PrintWriter;
+
+    if-eqz v1, :goto_0
+
+    check-cast v2, [Ljava/lang/Object;
+
+    invoke-static {v2}, LSmalienWriter;->indexBatch([Ljava/lang/Object;)V
+
+    invoke-static {v2}, Ljava/util/Arrays;->toString([Ljava/lang/Object;)Ljava/lang/String;
+
+    move-result-object v2
+
+    invoke-virtual {v1, v2}, Ljava/io/PrintWriter;->println(Ljava/lang/String;)V
+
+    # Roll over to the next segment once the segment reaches the segment size
+    const v3, LOG_SEGMENT_SIZE
+
+    if-eqz v3, :goto_0
+
+    invoke-virtual {v2}, Ljava/lang/String;->length()I
+
+    move-result v2
+
+    add-int/lit8 v2, v2, 0x1
+
+    int-to-long v4, v2
+
+    sget-wide v6, LSmalienWriter;->written:J
+
+    add-long/2addr v6, v4
+
+    sput-wide v6, LSmalienWriter;->written:J
+
+    int-to-long v4, v3
+
+    cmp-long v2, v6, v4
+
+    if-ltz v2, :goto_0
+
+    invoke-static {}, LSmalienWriter;->rollOver()V
+
+    goto :goto_0
+
+    :cond_1
+    sget-object v1, LSmalienWriter;->printWriter:Ljava/io/PrintWriter;
+
+    if-eqz v1, :cond_2
+
+    invoke-virtual {v1}, Ljava/io/PrintWriter;->flush()V
+
+    :cond_2
+    monitor-exit v0
+    :try_end_0
+    .catchall {:try_start_0 .. :try_end_0} :catchall_0
+
+    return-void
+
+    :catchall_0
+    move-exception v1
+
+    :try_start_1
+    monitor-exit v0
+    :try_end_1
+    .catchall {:try_start_1 .. :try_end_1} :catchall_0
+
+    throw v1
+.end method
+
+.method private static indexBatch([Ljava/lang/Object;)V
+    .locals 6
+
+    # A batch holds records of a single thread in the order of time,
+    # and a record is a quoted string of <seq>:<time>:<pid>:<tid>:<location>
+    array-length v0, p0
+
+    if-eqz v0, :cond_2
+
+    :try_start_0
+    const/4 v0, 0x0
+
+    aget-object v0, p0, v0
+
+    check-cast v0, Ljava/lang/String;
+
+    const-string v1, ":"
+
+    const/4 v2, 0x5
+
+    invoke-virtual {v0, v1, v2}, Ljava/lang/String;->split(Ljava/lang/String;I)[Ljava/lang/String;
+
+    move-result-object v0
+
+    # Add <pid>_<tid> to the segment's PTIDs
+    new-instance v1, Ljava/lang/StringBuilder;
+
+    invoke-direct {v1}, Ljava/lang/StringBuilder;-><init>()V
+
+    const/4 v2, 0x2
+
+    aget-object v2, v0, v2
+
+    invoke-virtual {v1, v2}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v1
+
+    const-string v2, "_"
+
+    invoke-virtual {v1, v2}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v1
+
+    const/4 v2, 0x3
+
+    aget-object v2, v0, v2
+
+    invoke-virtual {v1, v2}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v1
+
+    invoke-virtual {v1}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    move-result-object v1
+
+    sget-object v2, LSmalienWriter;->ptids:Ljava/util/HashSet;
+
+    invoke-virtual {v2, v1}, Ljava/util/HashSet;->add(Ljava/lang/Object;)Z
+
+    # Update the segment's first timestamp with the batch's first record
+    const/4 v1, 0x1
+
+    aget-object v0, v0, v1
+
+    invoke-static {v0}, Ljava/lang/Long;->parseLong(Ljava/lang/String;)J
+
+    move-result-wide v0
+
+    sget-wide v2, LSmalienWriter;->firstTime:J
+
+    const-wide/16 v4, 0x0
+
+    cmp-long v4, v2, v4
+
+    if-eqz v4, :cond_0
+
+    cmp-long v4, v0, v2
+
+    if-gez v4, :cond_1
+
+    :cond_0
+    sput-wide v0, LSmalienWriter;->firstTime:J
+
+    # Update the segment's last timestamp with the batch's last record
+    :cond_1
+    array-length v0, p0
+
+    add-int/lit8 v0, v0, -0x1
+
+    aget-object v0, p0, v0
+
+    check-cast v0, Ljava/lang/String;
+
+    const-string v1, ":"
+
+    const/4 v2, 0x3
+
+    invoke-virtual {v0, v1, v2}, Ljava/lang/String;->split(Ljava/lang/String;I)[Ljava/lang/String;
+
+    move-result-object v0
+
+    const/4 v1, 0x1
+
+    aget-object v0, v0, v1
+
+    invoke-static {v0}, Ljava/lang/Long;->parseLong(Ljava/lang/String;)J
+
+    move-result-wide v0
+
+    sget-wide v2, LSmalienWriter;->lastTime:J
+
+    cmp-long v4, v0, v2
+
+    if-lez v4, :cond_2
+
+    sput-wide v0, LSmalienWriter;->lastTime:J
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    :cond_2
+    return-void
+.end method
+
+.method private static rollOver()V
+    .locals 2
+
+    sget-object v0, LSmalienWriter;->printWriter:Ljava/io/PrintWriter;
+
+    invoke-virtual {v0}, Ljava/io/PrintWriter;->close()V
+
+    # The index is written after the segment is closed, so that indexed segments are complete
+    invoke-static {}, LSmalienWriter;->writeIndex()V
+
+    sget v0, LSmalienWriter;->segment:I
+
+    add-int/lit8 v0, v0, 0x1
+
+    sput v0, LSmalienWriter;->segment:I
+
+    const-wide/16 v0, 0x0
+
+    sput-wide v0, LSmalienWriter;->written:J
+
+    sput-wide v0, LSmalienWriter;->firstTime:J
+
+    sput-wide v0, LSmalienWriter;->lastTime:J
+
+    sget-object v0, LSmalienWriter;->ptids:Ljava/util/HashSet;
+
+    invoke-virtual {v0}, Ljava/util/HashSet;->clear()V
+
+    invoke-static {}, LSmalienWriter;->openSegment()V
+
+    return-void
+.end method
+
+.method private static writeIndex()V
+    .locals 5
+
+    # Write {"segment", "first", "last", "ptids"} to <segment path>.idx
+    :try_start_0
+    new-instance v0, Lorg/json/JSONObject;
+
+    invoke-direct {v0}, Lorg/json/JSONObject;-><init>()V
+
+    const-string v1, "segment"
+
+    sget v2, LSmalienWriter;->segment:I
+
+    invoke-virtual {v0, v1, v2}, Lorg/json/JSONObject;->put(Ljava/lang/String;I)Lorg/json/JSONObject;
+
+    const-string v1, "first"
+
+    sget-wide v2, LSmalienWriter;->firstTime:J
+
+    invoke-virtual {v0, v1, v2, v3}, Lorg/json/JSONObject;->put(Ljava/lang/String;J)Lorg/json/JSONObject;
+
+    const-string v1, "last"
+
+    sget-wide v2, LSmalienWriter;->lastTime:J
+
+    invoke-virtual {v0, v1, v2, v3}, Lorg/json/JSONObject;->put(Ljava/lang/String;J)Lorg/json/JSONObject;
+
+    const-string v1, "ptids"
+
+    new-instance v2, Lorg/json/JSONArray;
+
+    sget-object v3, LSmalienWriter;->ptids:Ljava/util/HashSet;
+
+    invoke-direct {v2, v3}, Lorg/json/JSONArray;-><init>(Ljava/util/Collection;)V
+
+    invoke-virtual {v0, v1, v2}, Lorg/json/JSONObject;->put(Ljava/lang/String;Ljava/lang/Object;)Lorg/json/JSONObject;
+
+    new-instance v1, Ljava/lang/StringBuilder;
+
+    invoke-direct {v1}, Ljava/lang/StringBuilder;-><init>()V
+
+    invoke-static {}, LSmalienWriter;->getSegmentPath()Ljava/lang/String;
+
+    move-result-object v2
+
+    invoke-virtual {v1, v2}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v1
+
+    const-string v2, ".idx"
+
+    invoke-virtual {v1, v2}, Ljava/lang/StringBuilder;->append(Ljava/lang/String;)Ljava/lang/StringBuilder;
+
+    move-result-object v1
+
+    invoke-virtual {v1}, Ljava/lang/StringBuilder;->toString()Ljava/lang/String;
+
+    move-result-object v1
+
+    new-instance v2, Ljava/io/FileWriter;
+
+    invoke-direct {v2, v1}, Ljava/io/FileWriter;-><init>(Ljava/lang/String;)V
+
+    invoke-virtual {v0}, Lorg/json/JSONObject;->toString()Ljava/lang/String;
+
+    move-result-object v0
+
+    invoke-virtual {v2, v0}, Ljava/io/Writer;->write(Ljava/lang/String;)V
+
+    invoke-virtual {v2}, Ljava/io/Writer;->close()V
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    return-void
+.end method
+
+.method public static flush()V
+    .locals 0
+
+    invoke-static {}, LSmalienWriter;->drainBuffers()V
+
+    invoke-static {}, LSmalienWriter;->writeQueued()V
+
+    return-void
+.end method
+
+.method public static registerCallbacks()V
+    .locals 4
+
+    # Register SmalienFlusher for onLowMemory once the application is created
+    sget-object v0, LSmalienWriter;->callbacks:LSmalienFlusher;
+
+    if-nez v0, :cond_0
+
+    :try_start_0
+    const-string v0, "android.app.ActivityThread"
+
+    invoke-static {v0}, Ljava/lang/Class;->forName(Ljava/lang/String;)Ljava/lang/Class;
+
+    move-result-object v0
+
+    const-string v1, "currentApplication"
+
+    const/4 v2, 0x0
+
+    new-array v3, v2, [Ljava/lang/Class;
+
+    invoke-virtual {v0, v1, v3}, Ljava/lang/Class;->getMethod(Ljava/lang/String;[Ljava/lang/Class;)Ljava/lang/reflect/Method;
+
+    move-result-object v0
+
+    const/4 v1, 0x0
+
+    new-array v3, v2, [Ljava/lang/Object;
+
+    invoke-virtual {v0, v1, v3}, Ljava/lang/reflect/Method;->invoke(Ljava/lang/Object;[Ljava/lang/Object;)Ljava/lang/Object;
+
+    move-result-object v0
+
+    check-cast v0, Landroid/app/Application;
+
+    if-eqz v0, :cond_0
+
+    new-instance v1, LSmalienFlusher;
+
+    const/4 v2, 0x2
+
+    invoke-direct {v1, v2}, LSmalienFlusher;-><init>(I)V
+
+    invoke-virtual {v0, v1}, Landroid/app/Application;->registerComponentCallbacks(Landroid/content/ComponentCallbacks;)V
+
+    sput-object v1, LSmalienWriter;->callbacks:LSmalienFlusher;
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    :cond_0
+    return-void
+.end method
+'''
+
+SMALIEN_FLUSHER_SMALI_NAME = 'SmalienFlusher.smali'
+SMALIEN_FLUSHER_CLASS_NAME = 'LSmalienFlusher;'
+
+# Flusher of SMALIEN_THREADED_WRITER.
+# mode is 0 for the daemon thread, 1 for the shutdown hook, and 2 for the callbacks of memory events.
+SMALIEN_FLUSHER = '''.implements Ljava/lang/Runnable;
+.implements Landroid/content/ComponentCallbacks2;
+
+
+# instance fields
+.field private final mode:I
+
+
+# direct methods
+.method public constructor <init>(I)V
+    .locals 0
+
+    invoke-direct {p0}, Ljava/lang/Object;-><init>()V
+
+    iput p1, p0, LSmalienFlusher;->mode:I
+
+    return-void
+.end method
+
+
+# virtual methods
+.method public run()V
+    .locals 2
+
+    iget v0, p0, LSmalienFlusher;->mode:I
+
+    if-eqz v0, :goto_0
+
+    invoke-static {}, LSmalienWriter;->flush()V
+
+    return-void
+
+    # Write records at intervals of 200 milliseconds
+    :goto_0
+    :try_start_0
+    const-wide/16 v0, 0xc8
+
+    invoke-static {v0, v1}, Ljava/lang/Thread;->sleep(J)V
+
+    invoke-static {}, LSmalienWriter;->flush()V
+
+    invoke-static {}, LSmalienWriter;->registerCallbacks()V
+    :try_end_0
+    .catch Ljava/lang/Exception; {:try_start_0 .. :try_end_0} :catch_0
+
+    :catch_0
+    goto :goto_0
+.end method
+
+.method public onConfigurationChanged(Landroid/content/res/Configuration;)V
+    .locals 0
+
+    return-void
+.end method
+
+.method public onLowMemory()V
+    .locals 0
+
+    invoke-static {}, LSmalienWriter;->flush()V
+
+    return-void
+.end method
+
+.method public onTrimMemory(I)V
+    .locals 0
+
+    invoke-static {}, LSmalienWriter;->flush()V
+
+    return-void
+.end method
+'''
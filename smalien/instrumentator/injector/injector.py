@@ -1,11 +1,11 @@
 import logging
-# from androguard.core.bytecodes.axml import AXMLPrinter
 
 from ..generator.payload.structures import PayloadLocals, PayloadMove, PayloadMoveResult, PayloadMoveException, PayloadGoto, PayloadGotoExtra, PayloadGotoLabel, PayloadGotoLabelExtra, PayloadCondLabel, PayloadLogging, PayloadDummyReturnedValue
-from .definitions import PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_ENCODED_XML, PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_DECODED_XML, SMALIEN_CLASS_HEADER_TEMPLATE, SMALIEN_WRITER_SMALI_NAME, SMALIEN_WRITER_CLASS_NAME, SMALIEN_WRITER
+from .manifest_injector import ManifestInjector
+from .definitions import SMALIEN_CLASS_HEADER_TEMPLATE, SMALIEN_WRITER_SMALI_NAME, SMALIEN_WRITER_CLASS_NAME, SMALIEN_WRITER, SMALIEN_BINARY_WRITER
+from .definitions import SMALIEN_THREADED_WRITER, SMALIEN_FLUSHER_SMALI_NAME, SMALIEN_FLUSHER_CLASS_NAME, SMALIEN_FLUSHER
 from .definitions_of_to_string_converters import TO_STRING_CONVERTERS
 from smalien.data_types import DATA_TYPES_IMPLEMENTED_INDIVIDUAL_CONVERTER
-from smalien.utils.command_runner import CommandRunner
 
 logger = logging.getLogger(name=__name__)
 
@@ -15,18 +15,40 @@ class Injector:
     Inject the generated code into smali files of the app.
     """
 
-    def __init__(self, app, log_buff_size, multi_dex, use_shared_converter, converter_keys, xml2axml='xml2axml'):
+    def __init__(self, app, log_buff_size, multi_dex, use_shared_converter, converter_keys, xml2axml='xml2axml', binary_log=False,
+                 threaded_log=False, log_segment_size=0, tool_worker=None):
         logger.debug('initializing')
 
         self.app = app
-        self.smalien_writer = SMALIEN_WRITER.replace(
+
+        # Select the writer of runtime logs
+        if (binary_log and threaded_log):
+            raise Exception('binary_log and threaded_log cannot be enabled together')
+        elif (binary_log):
+            self.app.log_format = 'binary'
+            smalien_writer = SMALIEN_BINARY_WRITER
+        elif (threaded_log):
+            self.app.log_format = 'threaded'
+            smalien_writer = SMALIEN_THREADED_WRITER
+        else:
+            self.app.log_format = 'json'
+            smalien_writer = SMALIEN_WRITER
+
+        # Segmented logs are written by the per-thread writer
+        if (log_segment_size > 0 and not threaded_log):
+            raise Exception('log_segment_size requires threaded_log')
+        self.app.log_segment_size = log_segment_size
+
+        self.smalien_writer = smalien_writer.replace(
             'LOG_BUFF_SIZE', str(hex(log_buff_size))
+        ).replace(
+            'LOG_SEGMENT_SIZE', str(hex(log_segment_size))
         ).replace(
             'LOG_PATH', app.smalien_log)
 
         self.use_shared_converter = use_shared_converter
         self.converter_keys = converter_keys
-        self.xml2axml = xml2axml
+        self.manifest_injector = ManifestInjector(app, xml2axml, tool_worker)
 
         # Set destination directory of smalien logging class
         if (multi_dex):
@@ -55,14 +77,7 @@ class Injector:
         logger.debug('running')
 
         # Add WRITE_EXTERNAL_STORAGE permission to AndroidManifest.xml
-        if (self.app.resource_decoded):
-            self.inject_permission_to_decoded_xml(PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_DECODED_XML)
-
-            self.remove_extractNativeLibs_from_decoded_xml()
-
-        else:
-            # (currently disabled) The extractNativelibs is also removed by the method
-            self.inject_permission_to_encoded_xml(PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_ENCODED_XML)
+        self.manifest_injector.run()
 
         # Create a smali file containing SmalienWriter and to-string converters
         self.inject_smalien_writer()
@@ -72,105 +87,6 @@ class Injector:
             class_data.reference_num += self.inject_payload_for_a_class(class_data.payloads, class_data.path,
                                                                         class_data.linage, class_data.code)
 
-    def inject_permission_to_decoded_xml(self, permission):
-        """
-        Add a uses-permission sentence to decoded AndroidManifest.xml
-        """
-        logger.debug('injecting the permission to decoded AndroidManifest.xml')
-
-        with open(self.app.android_manifest, 'r') as f:
-            data = f.read()
-            if (data.find(permission) > -1):
-                return
-        with open(self.app.android_manifest, 'w') as f:
-            data = data.split('\n')
-            output = data[0]+'\n'+permission+'\n'+'\n'.join(data[1:])
-            f.write(output)
-
-    def remove_extractNativeLibs_from_decoded_xml(self):
-        """
-        Remove extractNativeLibs from decoded AndroidManifest.xml
-        """
-        logger.debug('Removing extractNativeLibs from decoded AndroidManifest.xml')
-
-        with open(self.app.android_manifest, 'r') as f:
-            data = f.read()
-
-        data = data.replace('android:extractNativeLibs="false" ', '')
-
-        with open(self.app.android_manifest, 'w') as f:
-            f.write(data)
-
-    def inject_permission_to_encoded_xml(self, permission):
-        """
-        Add a uses-permission sentence to encoded AndroidManifest.xml
-        """
-        logger.debug('injecting the permission to encoded AndroidManifest.xml')
-
-        decoded = self.app.unpackaged.parent / self.app.android_manifest.name
-
-        # Decode binary AndroidManifest.xml
-        cmd = [self.xml2axml,
-               'd',
-               self.app.android_manifest,
-               decoded]
-        try:
-            CommandRunner.run(cmd)
-        except Exception as e:
-            raise Exception('failed to decode AndroidManifest.xml') from e
-
-        with open(decoded, 'r') as f:
-            data = f.read()
-
-        # Remove extractNativeLibs
-        # Currently disable this because it decreases the install success rate
-        # data = data.replace('android:extractNativeLibs="false"', '')
-
-        # Add the permission
-        with open(decoded, 'w') as f:
-            # Check whether the permission is defined
-            if (data.find(permission) > -1):
-                logger.debug('the permission is already defined')
-                # output = data
-                # Currently, removing extractNativeLibs is disabled,
-                # and do nothing if editing the manifest is not necessary.
-                return
-            else:
-                data = data.split('\n')
-                for i, line in enumerate(data):
-                    if (line.startswith('\t>')):
-                        # The line must the end of <manifest>
-                        break
-                output = '\n'.join(data[:i+1])
-                output += '\n\t<uses-permission\n'
-                output += f'\t\t{permission}\n'
-                output += '\t\t>\n'
-                output += '\t</uses-permission>\n'
-                output += '\n'.join(data[i+1:])
-
-            f.write(output)
-
-        # Encode plane AndroidManifest.xml
-        cmd = [self.xml2axml,
-               'e',
-               decoded,
-               self.app.android_manifest]
-        try:
-            CommandRunner.run(cmd)
-        except Exception as e:
-            raise Exception('failed to encode AndroidManifest.xml') from e
-
-        # Stopped using androguard because it cannot encode plane xml to binary axml
-        # with open(self.app.android_manifest, 'rb') as f:
-        #     data = AXMLPrinter(f.read()).get_xml().decode('utf-8')
-        #     if (data.find(permission) > -1):
-        #         return
-        # with open(self.app.android_manifest, 'wb') as f:
-        #     data = data.split('\n')
-        #     output = data[0]+'\n  '+permission+'\n'+'\n'.join(data[1:])
-        #     output = output.encode('utf-8')
-        #     f.write(output)
-
     def inject_smalien_writer(self):
         """
         Inject the SmalienWriter and shared converters.
@@ -189,6 +105,11 @@ class Injector:
         self.inject_definition(SMALIEN_WRITER_SMALI_NAME, SMALIEN_WRITER_CLASS_NAME,
                                self.smalien_writer)
 
+        # The threaded writer's buffers are written by SmalienFlusher
+        if (self.app.log_format == 'threaded'):
+            self.inject_definition(SMALIEN_FLUSHER_SMALI_NAME, SMALIEN_FLUSHER_CLASS_NAME,
+                                   SMALIEN_FLUSHER)
+
     def inject_payload_for_a_class(self, payloads, path, linage, code):
         """
         Inject the payload for one class.
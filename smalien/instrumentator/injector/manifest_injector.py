@@ -0,0 +1,138 @@
+import logging
+# from androguard.core.bytecodes.axml import AXMLPrinter
+
+from .definitions import PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_ENCODED_XML, PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_DECODED_XML
+from smalien.utils.command_runner import CommandRunner
+
+logger = logging.getLogger(name=__name__)
+
+
+class ManifestInjector:
+    """
+    Inject the permission for writing runtime logs into AndroidManifest.xml.
+    It only edits the manifest, so it can be run again when the app is unpackaged again.
+    """
+
+    def __init__(self, app, xml2axml='xml2axml', tool_worker=None):
+        """
+        :param tool_worker:  ToolWorker running xml2axml, or None.
+        """
+        logger.debug('initializing')
+
+        self.app = app
+        self.xml2axml = xml2axml
+        self.tool_worker = tool_worker
+
+    def run(self):
+        """
+        Execute the injection, which depends on whether the manifest is decoded.
+        """
+        logger.debug('running')
+
+        if (self.app.resource_decoded):
+            self.inject_permission_to_decoded_xml(PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_DECODED_XML)
+
+            self.remove_extractNativeLibs_from_decoded_xml()
+
+        else:
+            # (currently disabled) The extractNativelibs is also removed by the method
+            self.inject_permission_to_encoded_xml(PERMISSION_WRITE_EXTERNAL_STORAGE_FOR_ENCODED_XML)
+
+    def inject_permission_to_decoded_xml(self, permission):
+        """
+        Add a uses-permission sentence to decoded AndroidManifest.xml
+        """
+        logger.debug('injecting the permission to decoded AndroidManifest.xml')
+
+        with open(self.app.android_manifest, 'r') as f:
+            data = f.read()
+            if (data.find(permission) > -1):
+                return
+        with open(self.app.android_manifest, 'w') as f:
+            data = data.split('\n')
+            output = data[0]+'\n'+permission+'\n'+'\n'.join(data[1:])
+            f.write(output)
+
+    def remove_extractNativeLibs_from_decoded_xml(self):
+        """
+        Remove extractNativeLibs from decoded AndroidManifest.xml
+        """
+        logger.debug('Removing extractNativeLibs from decoded AndroidManifest.xml')
+
+        with open(self.app.android_manifest, 'r') as f:
+            data = f.read()
+
+        data = data.replace('android:extractNativeLibs="false" ', '')
+
+        with open(self.app.android_manifest, 'w') as f:
+            f.write(data)
+
+    def inject_permission_to_encoded_xml(self, permission):
+        """
+        Add a uses-permission sentence to encoded AndroidManifest.xml
+        """
+        logger.debug('injecting the permission to encoded AndroidManifest.xml')
+
+        decoded = self.app.unpackaged.parent / self.app.android_manifest.name
+
+        # Decode binary AndroidManifest.xml
+        cmd = [self.xml2axml,
+               'd',
+               self.app.android_manifest,
+               decoded]
+        try:
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
+        except Exception as e:
+            raise Exception('failed to decode AndroidManifest.xml') from e
+
+        with open(decoded, 'r') as f:
+            data = f.read()
+
+        # Remove extractNativeLibs
+        # Currently disable this because it decreases the install success rate
+        # data = data.replace('android:extractNativeLibs="false"', '')
+
+        # Add the permission
+        with open(decoded, 'w') as f:
+            # Check whether the permission is defined
+            if (data.find(permission) > -1):
+                logger.debug('the permission is already defined')
+                # output = data
+                # Currently, removing extractNativeLibs is disabled,
+                # and do nothing if editing the manifest is not necessary.
+                return
+            else:
+                data = data.split('\n')
+                for i, line in enumerate(data):
+                    if (line.startswith('\t>')):
+                        # The line must the end of <manifest>
+                        break
+                output = '\n'.join(data[:i+1])
+                output += '\n\t<uses-permission\n'
+                output += f'\t\t{permission}\n'
+                output += '\t\t>\n'
+                output += '\t</uses-permission>\n'
+                output += '\n'.join(data[i+1:])
+
+            f.write(output)
+
+        # Encode plane AndroidManifest.xml
+        cmd = [self.xml2axml,
+               'e',
+               decoded,
+               self.app.android_manifest]
+        try:
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
+        except Exception as e:
+            raise Exception('failed to encode AndroidManifest.xml') from e
+
+        # Stopped using androguard because it cannot encode plane xml to binary axml
+        # with open(self.app.android_manifest, 'rb') as f:
+        #     data = AXMLPrinter(f.read()).get_xml().decode('utf-8')
+        #     if (data.find(permission) > -1):
+        #         return
+        # with open(self.app.android_manifest, 'wb') as f:
+        #     data = data.split('\n')
+        #     output = data[0]+'\n  '+permission+'\n'+'\n'.join(data[1:])
+        #     output = output.encode('utf-8')
+        #     f.write(output)
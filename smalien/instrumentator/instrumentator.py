@@ -3,6 +3,8 @@ import logging
 from .relocator import Relocator
 from .generator.generator import Generator
 from .injector.injector import Injector
+from smalien.analyzers.reachability_analyzer import ReachabilityAnalyzer
+from smalien.analyzers.log_point_minimizer import LogPointMinimizer
 
 logger = logging.getLogger(name=__name__)
 
@@ -12,7 +14,9 @@ class Instrumentator():
     It operates static bytecode instrumentation.
     """
 
-    def __init__(self, app, log_buff_size, register_reassignment, multi_dex, taint_sources, dummy_source_values, use_shared_converter=True):
+    def __init__(self, app, log_buff_size, register_reassignment, multi_dex, taint_sources, dummy_source_values, use_shared_converter=True, binary_log=False,
+                 taint_sinks=None, selective=False, minimize=False, threaded_log=False,
+                 log_segment_size=0, tool_worker=None):
         logger.debug('initializing')
 
         self.app = app
@@ -22,17 +26,33 @@ class Instrumentator():
 
         self.converter_keys = set()  # Indicate necessary to-string-converter definitions
 
+        # Instrument only methods relevant to taint sources and sinks
+        methods = None
+        if (selective):
+            methods = ReachabilityAnalyzer(app, taint_sources, taint_sinks).run()
+
+        # Skip log points that the emulator can recompute
+        redundant = None
+        if (minimize):
+            redundant = LogPointMinimizer(app).run()
+
         self.generator = Generator(app,
                                    register_reassignment,
                                    self.use_shared_converter,
                                    self.converter_keys,
                                    taint_sources,
-                                   dummy_source_values)
+                                   dummy_source_values,
+                                   methods,
+                                   redundant)
         self.injector = Injector(app,
                                  log_buff_size,
                                  multi_dex,
                                  self.use_shared_converter,
-                                 self.converter_keys)
+                                 self.converter_keys,
+                                 binary_log=binary_log,
+                                 threaded_log=threaded_log,
+                                 log_segment_size=log_segment_size,
+                                 tool_worker=tool_worker)
         self.relocator = Relocator(app)
 
     def run(self):
@@ -2,6 +2,7 @@ import logging
 import pathlib
 
 from .utils.pickle_handler import PickleHandler
+from .utils.project_store import ProjectStore
 from .parsers.parser_manager import ParserManager
 from .structures import App, AppClass, AppField, AppMethod
 
@@ -17,6 +18,17 @@ def load_pickle(**kwargs):
 
     return PickleHandler.load(kwargs['target'])
 
+def load_project_store(**kwargs):
+    """
+    Load a target's project store.
+    Instructions of each class are loaded on first access.
+
+    :param target:    Path to project store file.
+    """
+    logger.debug('loading project store')
+
+    return ProjectStore.load(kwargs['target'])
+
 def load_apk(**kwargs):
     """
     Load a target's apk.
@@ -26,6 +38,9 @@ def load_apk(**kwargs):
     :param ignore_list:  List of packages to be skipped.
     :param apk_handler:  ApkHandler object.
     :param run_parser:   Whether run parser.
+    :param parse_workers:  Number of worker processes parsing smali files.
+    :param parse_cache:    ParseCache object, or None if the cache is disabled.
+    :param trial_build:    Whether test if the apk is repackageable at unpackaging.
     """
     logger.debug('loading apk')
 
@@ -36,6 +51,9 @@ def load_apk(**kwargs):
     apk_handler = kwargs['apk_handler']
     taint_sources = kwargs['taint_sources']
     taint_sinks = kwargs['taint_sinks']
+    parse_workers = kwargs['parse_workers']
+    parse_cache = kwargs['parse_cache']
+    trial_build = kwargs['trial_build']
 
     # Get app's package name
     package = apk_handler.get_package_name(apk)
@@ -68,10 +86,11 @@ def load_apk(**kwargs):
     # Run parse if run_parser is True
     if (kwargs['run_parser']):
         # Unpackage the apk
-        app.resource_decoded = apk_handler.unpackage(apk, app.unpackaged, app.smaliened)
+        app.resource_decoded = apk_handler.unpackage(apk, app.unpackaged, app.smaliened, trial_build)
+        app.repackage_tested = trial_build
 
         # Parse app code
-        ParserManager(app, ignore_list, target_packages, taint_sources, taint_sinks).run()
+        ParserManager(app, ignore_list, target_packages, taint_sources, taint_sinks, parse_workers, parse_cache).run()
 
         # Analyze
         # TODO: Implement analyzers
@@ -84,5 +103,6 @@ class Loader:
     """
     loaders = {
         '.pickle': load_pickle,
+        '.sqlite': load_project_store,
         '.apk': load_apk,
     }
@@ -17,30 +17,39 @@ class ClassParser:
         self.classes = classes
         self.dex_ids = dex_ids
 
-    def run(self, cid: int, path: str):
+    def run(self, cid: int, path: str, code: list = None):
         """
         Execute the class parser.
         Return None if the given class is in the ignore_list.
+        The code is loaded from the path unless it is given.
         """
         logger.debug('running')
 
         # Load smali code
-        with open(path, 'r') as f:
-            code = f.read().split('\n')
-
-            # Create an app class object
-            app_class = AppClass(cid=cid,
-                                 name=self.get_class_name(code[0]),
-                                 path=path,
-                                 is_abstract=self.check_whether_class_is_abstract(code[0]),
-                                 parent=self.get_parent_class(code[1], path),
-                                 linage=len(code),
-                                 code=code,
-                                 dex_id=self.get_dex_id(path),
-                                 path_in_dex=self.get_path_in_dex(path))
+        if (code is None):
+            code = self.load_code(path)
+
+        # Create an app class object
+        app_class = AppClass(cid=cid,
+                             name=self.get_class_name(code[0]),
+                             path=path,
+                             is_abstract=self.check_whether_class_is_abstract(code[0]),
+                             parent=self.get_parent_class(code[1], path),
+                             linage=len(code),
+                             code=code,
+                             dex_id=self.get_dex_id(path),
+                             path_in_dex=self.get_path_in_dex(path))
 
         return app_class
 
+    @staticmethod
+    def load_code(path):
+        """
+        Load lines of smali code in the given file.
+        """
+        with open(path, 'r') as f:
+            return f.read().split('\n')
+
     def get_class_name(self, line):
         """
         Extract the class name.
@@ -2,7 +2,7 @@ import logging
 import re
 
 from .definitions import METHOD_ATTRIBUTES, IMPLEMENTEDS, RE_METHOD_ARG_TYPES
-from ..structures import AppMethod
+from ..structures import AppMethod, MethodIndex
 from .opcode.structures import OpMethodHead, OpMethodTail
 from smalien.data_types import numeric_types_64
 
@@ -52,6 +52,9 @@ class MethodParser:
             else:
                 i += 1
 
+        # Index methods' lines for resolving methods from logged lines
+        self.clss.method_index = MethodIndex.build(self.methods)
+
     def create(self, start_at, head1, head2, end_at):
         """
         Create an object of the found method.
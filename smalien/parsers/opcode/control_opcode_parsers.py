@@ -1,6 +1,7 @@
 import logging
 
 from .opcode_parser_utils import Utils
+from .evaluators import compile_evaluators
 from .structures import *
 
 logger = logging.getLogger(name=__name__)
@@ -77,6 +78,10 @@ class OpIfzParser:
         return OpIfz(num=kwargs['num'], instruction=instruction,
                     register=register, label=label, expression=expression)
 
+# Compile the expressions for the emulation
+compile_evaluators(OpIfParser.expression_mapping.values(), 'register_1, register_2')
+compile_evaluators(OpIfzParser.expression_mapping.values(), 'register')
+
 
 class OpGotoParser:
     """
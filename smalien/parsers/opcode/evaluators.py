@@ -0,0 +1,31 @@
+import logging
+
+logger = logging.getLogger(name=__name__)
+
+
+# Functions evaluating expressions of instructions, keyed by the expression string.
+# Instructions keep expressions as strings so that they can be pickled,
+# and the emulator looks up the function of an expression instead of evaluating the string every time.
+evaluators = {}
+
+def compile_evaluators(expressions, parameters):
+    """
+    Compile the given expressions into functions.
+
+    :param expressions:  Expression strings.
+    :param parameters:   Names of the functions' parameters separated by commas, such as 'source1, source2'.
+    """
+    for expression in expressions:
+        evaluators[expression] = eval(f'lambda {parameters}: {expression}', {})
+
+def get_evaluator(expression, parameters):
+    """
+    Return the function of the given expression, which is compiled if not yet.
+    """
+    evaluator = evaluators.get(expression)
+    if (evaluator is None):
+        logger.debug(f'compiling {expression = }')
+        compile_evaluators([expression], parameters)
+        evaluator = evaluators[expression]
+
+    return evaluator
@@ -2,6 +2,7 @@ import logging
 import struct
 import numpy
 
+from .evaluators import compile_evaluators
 from smalien.data_types import NULL_REPRESENTATION
 
 logger = logging.getLogger(name=__name__)
@@ -386,3 +387,8 @@ class Utils:
         # TODO: Test if this works
         'ushr-int/lit8': 'int((source1 & 0xffffffff) >> (source2 & 0x1f))',
     }
+
+# Compile the expressions for the emulation.
+# Unop expressions take a source, and binop expressions take two sources.
+compile_evaluators([ e for e in Utils.unop_and_binop_expression_mapping.values() if e.find('source1') < 0 ], 'source')
+compile_evaluators([ e for e in Utils.unop_and_binop_expression_mapping.values() if e.find('source1') > -1 ], 'source1, source2')
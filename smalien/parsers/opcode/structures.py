@@ -1,9 +1,11 @@
 from typing import Dict
 from dataclasses import dataclass, field
 
+from smalien.utils.slotted_state import SlottedState
 
-@dataclass
-class Opcode:
+
+@dataclass(slots=True)
+class Opcode(SlottedState):
     """
     Base class of Op* classes.
     """
@@ -20,7 +22,7 @@ class Opcode:
     logging: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class OpNop(Opcode):
     """
     Contain a nop instruction's data.
@@ -29,7 +31,7 @@ class OpNop(Opcode):
     kind: str = 'nop'
 
 
-@dataclass
+@dataclass(slots=True)
 class OpMethodHead(Opcode):
     """
     Contain a method head's data.
@@ -43,7 +45,7 @@ class OpMethodHead(Opcode):
     is_constructor: bool = None  # Flag suggesting the method is a constructor
     attribute: str = None        # Attribute of the method (native, abstract, static, normal)
 
-@dataclass
+@dataclass(slots=True)
 class OpMethodTail(Opcode):
     """
     Contain a method tail's data.
@@ -52,7 +54,7 @@ class OpMethodTail(Opcode):
     kind: str = 'method_tail'
 
 
-@dataclass
+@dataclass(slots=True)
 class OpInvoke(Opcode):
     """
     Contain an invoke-kind instruction's data.
@@ -98,7 +100,10 @@ class OpInvoke(Opcode):
 
     is_sink: bool = False          # Indicate whether the invoked method is a sink.
 
-@dataclass
+    # Classification of the invocation, cached by CallSiteClassifier at the first execution
+    call_site: object = None
+
+@dataclass(slots=True)
 class OpMoveResult(Opcode):
     """
     Contain a move-result instruction's data.
@@ -121,7 +126,7 @@ class OpMoveResult(Opcode):
 # Array Operation
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpAget(Opcode):
     """
     Contain an aget instruction's data.
@@ -135,7 +140,7 @@ class OpAget(Opcode):
     index: str = None        # Index register
     index_data_type: str = None  # Data type of the index register
 
-@dataclass
+@dataclass(slots=True)
 class OpAput(Opcode):
     """
     Contain an aput instruction's data.
@@ -149,7 +154,7 @@ class OpAput(Opcode):
     index: str = None    # Index register
     index_data_type: str = None  # Data type of the index register
 
-@dataclass
+@dataclass(slots=True)
 class OpNewArray(Opcode):
     """
     Contain a new-array instruction's data.
@@ -167,7 +172,7 @@ class OpNewArray(Opcode):
     size: str = None             # Register holding the array size
     size_data_type: str = None   # Data type of the size
 
-@dataclass
+@dataclass(slots=True)
 class OpFillArrayData(Opcode):
     """
     Contain a fill-array-data instruction's data.
@@ -180,7 +185,7 @@ class OpFillArrayData(Opcode):
     label: str = None          # Label pointing the array_data
     array_data: Opcode = None  # Data being stored into the array
 
-@dataclass
+@dataclass(slots=True)
 class OpFilledNewArray(Opcode):
     """
     Contain a filled-new-array instruction's data.
@@ -193,7 +198,7 @@ class OpFilledNewArray(Opcode):
     ret_type: str = None     # The data type of the return value
     move_result: Opcode = None  # An object of the move-result immediately after this
 
-@dataclass
+@dataclass(slots=True)
 class OpArrayLength(Opcode):
     """
     Contain an array-length instruction's data.
@@ -209,7 +214,7 @@ class OpArrayLength(Opcode):
     destination_data_type: str = None # Destination data type
 
 
-@dataclass
+@dataclass(slots=True)
 class OpConst(Opcode):
     """
     Containt a const instruction's data.
@@ -223,7 +228,7 @@ class OpConst(Opcode):
     destination: str = None  # Destination register
     data_type: str = None    # Data type of the register
 
-@dataclass
+@dataclass(slots=True)
 class OpConstString(Opcode):
     """
     Containt a const-string instruction's data.
@@ -237,7 +242,7 @@ class OpConstString(Opcode):
     destination: str = None  # Destination register
     data_type: str = None    # Data type of the register
 
-@dataclass
+@dataclass(slots=True)
 class OpConstClass(Opcode):
     """
     Containt a const-class instruction's data.
@@ -252,7 +257,7 @@ class OpConstClass(Opcode):
     destination: str = None    # Destination register
     data_type: str = None      # Data type of the register
 
-@dataclass
+@dataclass(slots=True)
 class OpNewInstance(Opcode):
     """
     Contain a new-instance instruction's data.
@@ -266,7 +271,7 @@ class OpNewInstance(Opcode):
     initialized: bool = False  # Indicate whether the register is initialized.
                                # True if a constructor is called at the instruction.
 
-@dataclass
+@dataclass(slots=True)
 class OpInstanceOf(Opcode):
     """
     Contain an instance-of instruction's data.
@@ -283,7 +288,7 @@ class OpInstanceOf(Opcode):
 
     class_name: str = None
 
-@dataclass
+@dataclass(slots=True)
 class OpMove(Opcode):
     """
     Contain a move instruction's data.
@@ -295,7 +300,7 @@ class OpMove(Opcode):
     source: str = None
     destination: str = None
 
-@dataclass
+@dataclass(slots=True)
 class OpReturn(Opcode):
     """
     Contain a return instruction's data.
@@ -306,7 +311,7 @@ class OpReturn(Opcode):
     # Specification
     register: str = None      # Return value register
 
-@dataclass
+@dataclass(slots=True)
 class OpMonitorEnter(Opcode):
     """
     Contain a monitor-enter instruction's data.
@@ -317,7 +322,7 @@ class OpMonitorEnter(Opcode):
     # Specification
     register: str = None    # Register containing an object
 
-@dataclass
+@dataclass(slots=True)
 class OpMonitorExit(Opcode):
     """
     Contain a monitor-exit instruction's data.
@@ -328,7 +333,7 @@ class OpMonitorExit(Opcode):
     # Specification
     register: str = None    # Register containing an object
 
-@dataclass
+@dataclass(slots=True)
 class OpCheckCast(Opcode):
     """
     Contain a check-cast instruction's data.
@@ -348,7 +353,7 @@ class OpCheckCast(Opcode):
 # Setter and Getter instructions
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpIget(Opcode):
     """
     Contain an iget instruction's data.
@@ -372,7 +377,7 @@ class OpIget(Opcode):
 
     in_app: bool = False      # Indicate the field is implemented in the app
 
-@dataclass
+@dataclass(slots=True)
 class OpIput(Opcode):
     """
     Contain an iput instruction's data.
@@ -393,7 +398,7 @@ class OpIput(Opcode):
                               # Use class_name as a part of the field's name.
                               # Class name is also saved as the destination register's type
 
-@dataclass
+@dataclass(slots=True)
 class OpSget(Opcode):
     """
     Contain a sget instruction's data.
@@ -416,7 +421,7 @@ class OpSget(Opcode):
     in_app: bool = False      # Indicate the field is implemented in the app
     clinit_implemented: bool = False  # Indicate clinit is implemented in the class
 
-@dataclass
+@dataclass(slots=True)
 class OpSput(Opcode):
     """
     Contain a sput instruction's data.
@@ -439,7 +444,7 @@ class OpSput(Opcode):
 # Unary and Binary instructions
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpUnop(Opcode):
     """
     Contain an unop vA, vB instruction's data.
@@ -459,7 +464,7 @@ class OpUnop(Opcode):
 
     is_converter: bool = None  # Indicate the inst is a converter
 
-@dataclass
+@dataclass(slots=True)
 class OpBinop(Opcode):
     """
     Contain a binop vAA, vBB, vCC instruction's data.
@@ -476,7 +481,7 @@ class OpBinop(Opcode):
 
     expression: str = None   # Semantics to calculate the result
 
-@dataclass
+@dataclass(slots=True)
 class OpBinopLit8(Opcode):
     """
     Contain a binop/lit8 vAA, vBB, #+CC instruction's data.
@@ -493,7 +498,7 @@ class OpBinopLit8(Opcode):
 
     expression: str = None   # Semantics to calculate the result
 
-@dataclass
+@dataclass(slots=True)
 class OpBinop2addr(Opcode):
     """
     Contain a binop/2addr vA, vB instruction's data.
@@ -514,7 +519,7 @@ class OpBinop2addr(Opcode):
 # Cmp instructions
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpCmp(Opcode):
     """
     Contain a cmpkind vAA, vBB, vCC instruction's data.
@@ -536,7 +541,7 @@ class OpCmp(Opcode):
 # Control instructions
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpIf(Opcode):
     """
     Contain if-test instructions' data.
@@ -551,7 +556,7 @@ class OpIf(Opcode):
     label: str = None                # Branch's label
     destination: Opcode = None       # Branch's instruction data
 
-@dataclass
+@dataclass(slots=True)
 class OpIfz(Opcode):
     """
     Contain if-testz instructions' data.
@@ -567,7 +572,7 @@ class OpIfz(Opcode):
     label: str = None                # Branch's label
     destination: Opcode = None       # Branch's instruction data
 
-@dataclass
+@dataclass(slots=True)
 class OpGoto(Opcode):
     """
     Contain goto instruction's data.
@@ -579,7 +584,7 @@ class OpGoto(Opcode):
     label: str = None           # Branch's label
     destination: Opcode = None  # Branch's instruction data
 
-@dataclass
+@dataclass(slots=True)
 class OpSwitch(Opcode):
     """
     Contain switch instructions' data.
@@ -599,7 +604,7 @@ class OpSwitch(Opcode):
 # Group: label
 #
 
-@dataclass
+@dataclass(slots=True)
 class CondLabel(Opcode):
     """
     Contain :cond labels' data.
@@ -612,7 +617,7 @@ class CondLabel(Opcode):
     next_instruction: Opcode = None  # Instruction next to this label
     extra_trampoline: bool = False   # Extra trampoline for long-distance jumpers
 
-@dataclass
+@dataclass(slots=True)
 class GotoLabel(Opcode):
     """
     Contain :goto labels' data.
@@ -624,7 +629,7 @@ class GotoLabel(Opcode):
     label: str = None                # Name of label
     next_instruction: Opcode = None  # Instruction next to this label
 
-@dataclass
+@dataclass(slots=True)
 class SwitchLabel(Opcode):
     """
     Contain switch labels' data.
@@ -635,7 +640,7 @@ class SwitchLabel(Opcode):
     # Specification
     label: str = None                # Name of label
 
-@dataclass
+@dataclass(slots=True)
 class SwitchDataLabel(Opcode):
     """
     Contain switch data labels' data.
@@ -647,7 +652,7 @@ class SwitchDataLabel(Opcode):
     label: str = None                # Name of label
     targets: Dict[int, str] = field(default_factory=dict)  # Key: case value, Value: target label
 
-@dataclass
+@dataclass(slots=True)
 class ArrayLabel(Opcode):
     """
     Contain :array labels' data.
@@ -665,7 +670,7 @@ class ArrayLabel(Opcode):
 # Try and catch
 #
 
-@dataclass
+@dataclass(slots=True)
 class OpThrow(Opcode):
     """
     Contain throw instructions' data.
@@ -676,7 +681,7 @@ class OpThrow(Opcode):
     # Specification
     register: str = None                                      # register containing an Exception
 
-@dataclass
+@dataclass(slots=True)
 class OpMoveException(Opcode):
     """
     Contain move-exception instruction's data.
@@ -688,7 +693,7 @@ class OpMoveException(Opcode):
     destination: str = None   # Destination register
     destination_data_type: str = None  # Data type of the register
 
-@dataclass
+@dataclass(slots=True)
 class TryStartLabel(Opcode):
     """
     Contain :try_start_* labels' data.
@@ -701,7 +706,7 @@ class TryStartLabel(Opcode):
     try_end: Opcode = None           # Corresponding :try_end_* label data
     catch_data: Opcode = None        # Corresponding .catch data
 
-@dataclass
+@dataclass(slots=True)
 class TryEndLabel(Opcode):
     """
     Contain :try_end_* labels' data.
@@ -712,7 +717,7 @@ class TryEndLabel(Opcode):
     # Specification
     label: str = None                # Name of label
 
-@dataclass
+@dataclass(slots=True)
 class CatchData(Opcode):
     """
     Contain .catch data.
@@ -726,7 +731,7 @@ class CatchData(Opcode):
     try_end_label: str = None        # Corresponding :try_end_* label name
     target: str = None               # Target :catch_* label name
 
-@dataclass
+@dataclass(slots=True)
 class CatchLabel(Opcode):
     """
     Contain :catch_* labels' data.
@@ -0,0 +1,202 @@
+import os
+import re
+import pickle
+import hashlib
+import logging
+import dataclasses
+
+from smalien import structures
+from .opcode import structures as opcode_structures
+
+logger = logging.getLogger(name=__name__)
+
+
+# Class names appearing in smali code, such as invoked classes and fields' classes
+RE_CLASS_NAMES = re.compile(r'L[^;\s(]+;')
+
+
+class ParseCache:
+    """
+    Persistent cache of parsed classes keyed by SHA-256 of smali code.
+
+    An entry keeps a class parsed by all parsers.
+    Results of the class, field, and method parsers only depend on the smali code,
+    while results of the instruction parser also depend on other classes looked up by the parser and on taint definitions.
+    Hence, an entry also keeps a digest of them, called environment, and its instructions are reused only if the environment is unchanged.
+
+    Entries do not contain the location of the smali file (e.g., cid, path, and dex id).
+    Hence, a cache directory can be shared by multiple apps, for example, to reuse identical third-party libraries.
+    Least recently used entries are removed when the total size exceeds max_size.
+
+    Entries are also keyed by the version and the schema of the parsed data structures,
+    so entries pickled with other structures are not reused.
+    """
+
+    # Increment this when parsers change the parsed data without changing the structures' fields
+    VERSION = 2
+
+    def __init__(self, path, max_size, taint_sources, taint_sinks):
+        """
+        :param path:           Path to the cache directory.
+        :param max_size:       Maximum total size of entries in bytes.
+        :param taint_sources:  Definition of taint sources.
+        :param taint_sinks:    Definition of taint sinks.
+        """
+        logger.debug('initializing')
+
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+        self.max_size = max_size
+
+        # Entries depend on the parsers and the fields of the parsed data structures
+        self.schema_digest = self.get_digest(repr((self.VERSION, self.get_schema())))
+
+        # Taint definitions affect potential sources and sinks counted by the instruction parser
+        self.definition_digest = self.get_digest(repr((self.VERSION, taint_sources, taint_sinks)))
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_digest(text):
+        """
+        Return SHA-256 digest of the given text.
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def get_schema():
+        """
+        Return fields and slots of the dataclasses of the parsed app, classes, methods, and instructions.
+        """
+        schema = []
+        for module in [structures, opcode_structures]:
+            for name, obj in sorted(vars(module).items()):
+                if (dataclasses.is_dataclass(obj) and obj.__module__ == module.__name__):
+                    schema.append((name,
+                                   [ (f.name, str(f.type)) for f in dataclasses.fields(obj) ],
+                                   getattr(obj, '__slots__', ())))
+
+        return schema
+
+    @staticmethod
+    def find_referenced_classes(text):
+        """
+        Return names of classes referenced in the given smali code.
+        """
+        return sorted(set(RE_CLASS_NAMES.findall(text)))
+
+    def load_class(self, digest):
+        """
+        Load a class, its referenced class names, its environment, and its reference number.
+        Return None if the entry is not found.
+        """
+        return self.load(self.get_entry_path(digest))
+
+    def store_class(self, digest, app_class, references, environment, reference_num):
+        """
+        Store a class, its referenced class names, its environment, and its reference number.
+        """
+        # Remove data depending on the smali file's location and other classes
+        app_class = dataclasses.replace(app_class, cid=None, path=None, code=[],
+                                        dex_id=None, path_in_dex=None,
+                                        ignore=False, family=set(), reference_num=0)
+
+        self.store(self.get_entry_path(digest), (app_class, references, environment, reference_num))
+
+    def summarize_classes(self, classes):
+        """
+        Return digests of data that the instruction parser looks up in each class.
+        Fields are also looked up in the class's family members, so their digests are included.
+        """
+        digests = { name: self.get_digest(repr((clss.ignore,
+                                                clss.is_abstract,
+                                                clss.clinit_implemented,
+                                                [ (mname, m.implemented) for mname, m in clss.methods.items() ],
+                                                [ (kind, [ (key, f.default_value) for key, f in fields.items() ])
+                                                  for kind, fields in clss.fields.items() ])))
+                    for name, clss in classes.items() }
+
+        return { name: self.get_digest(repr((digests[name],
+                                             [ (member, digests.get(member)) for member in sorted(clss.family) ])))
+                 for name, clss in classes.items() }
+
+    def get_environment(self, references, summaries):
+        """
+        Return a digest of the referenced classes and the taint definitions.
+        """
+        return self.get_digest(repr((self.definition_digest,
+                                     [ (name, summaries.get(name)) for name in references ])))
+
+    def get_entry_path(self, digest):
+        """
+        Return path to the entry of the given digest.
+        """
+        return f'{self.path}/{digest[:2]}/{digest}-{self.schema_digest[:16]}.pickle'
+
+    def load(self, path):
+        """
+        Load an entry, and mark it as recently used.
+        """
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            # A broken entry is treated as not found
+            logger.warning(f'failed to load a parse cache entry {path = }, {e = }')
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+
+        return data
+
+    def store(self, path, data):
+        """
+        Store an entry.
+        The file is replaced atomically because the directory can be shared by multiple processes.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """
+        Remove least recently used entries until the total size is less than max_size.
+        """
+        logger.debug(f'{self.hits = }, {self.misses = }')
+
+        entries = []
+        for directory in os.scandir(self.path):
+            if (not directory.is_dir()):
+                continue
+            for entry in os.scandir(directory.path):
+                if (entry.name.endswith('.tmp')):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Removed by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total_size = sum([ size for _, size, _ in entries ])
+
+        for _, size, path in sorted(entries):
+            if (total_size <= self.max_size):
+                break
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+        logger.debug(f'parse cache size is {total_size} bytes')
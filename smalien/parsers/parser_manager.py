@@ -1,21 +1,87 @@
 import logging
 import pathlib
 import glob
+from concurrent.futures import ProcessPoolExecutor
 
 from .class_parser import ClassParser
 from .field_parser import FieldParser
 from .method_parser import MethodParser
 from .instruction_parser import InstructionParser
+from ..structures import AppClass, AppMethod
 
 logger = logging.getLogger(name=__name__)
 
 
+# Data shared with every parser worker process.
+# Set by init_parser_worker when the process pool starts a worker.
+worker_data = {}
+
+def init_parser_worker(root, classes, taint_sources, taint_sinks):
+    """
+    Initialize a parser worker process.
+
+    :param root:           Path to the unpackaged directory.
+    :param classes:        Class index used by the instruction parser (see ParserManager.create_class_index).
+    :param taint_sources:  Definition of taint sources.
+    :param taint_sinks:    Definition of taint sinks.
+    """
+    worker_data['root'] = root
+    worker_data['classes'] = classes
+    worker_data['taint_sources'] = taint_sources
+    worker_data['taint_sinks'] = taint_sinks
+
+def parse_class_in_worker(params):
+    """
+    Parse a class, its fields, and its methods in a worker process.
+    """
+    cid, path = params
+
+    # Dex IDs are collected by the main process
+    app_class = ClassParser(worker_data['root'], {}, set()).run(cid, path)
+
+    ParserManager.parse_fields(app_class)
+    ParserManager.parse_methods(app_class)
+
+    return app_class
+
+def parse_instructions_in_worker(params):
+    """
+    Parse instructions of a class's methods in a worker process.
+    Return the parsed methods and the class's reference number.
+    """
+    path, parent, methods = params
+
+    # Loading the code again is cheaper than sending it to the worker
+    code = ClassParser.load_code(path)
+
+    reference_num = 0
+    try:
+        for m in methods.values():
+            reference_num += InstructionParser(m,
+                                               code,
+                                               parent,
+                                               worker_data['classes'],
+                                               [],
+                                               worker_data['taint_sources'],
+                                               worker_data['taint_sinks']).run()
+    except Exception as e:
+        raise Exception(f'Instruction parser failed, {path = }') from e
+
+    return methods, reference_num
+
+
 class ParserManager():
     """
     Manage parsers of classes, fields, methods, and bytecode instructions in smali files.
     """
 
-    def __init__(self, app, ignore_list, target_packages, taint_sources, taint_sinks):
+    def __init__(self, app, ignore_list, target_packages, taint_sources, taint_sinks, workers=1, cache=None):
+        """
+        :param workers:  Number of worker processes parsing smali files.
+                         If 1, smali files are parsed in the current process.
+        :param cache:    ParseCache reusing parsed classes of unchanged smali files.
+                         If None, every smali file is parsed.
+        """
         logger.debug('initializing')
         self.app = app
         self.root = str(app.unpackaged)
@@ -23,6 +89,15 @@ class ParserManager():
         self.target_packages = target_packages
         self.taint_sources = taint_sources
         self.taint_sinks = taint_sinks
+        self.workers = workers
+        self.cache = cache
+
+        # Cache data of classes, indexed by cid
+        self.digests = {}
+        self.references = {}
+        self.environments = {}
+        self.summaries = None
+        self.cached = {}  # Cached classes' environments and reference numbers
 
         self.cparser = ClassParser(self.root, self.app.classes, app.dex_ids)
 
@@ -35,16 +110,15 @@ class ParserManager():
         logger.debug('running')
 
         # Search for smali files in the unpackaged directory
-        smali_paths = glob.iglob(self.root+'/**/*.smali', recursive=True)
+        smali_paths = self.find_smali_paths()
+
+        if (self.workers > 1):
+            self.run_in_parallel(smali_paths)
+            return
 
         # Parse classes in smali files.
-        cid = 0
-        for path in smali_paths:
-            if (path.find(self.root+'/smali_assets') < 0 and
-                path.find(self.root+'/assets') < 0
-               ):
-                self.parse_class(cid, path)
-                cid += 1
+        for cid, path in enumerate(smali_paths):
+            self.parse_class(cid, path)
 
         # Exit if no class is parsed
         if (len(self.app.classes.keys()) == 0):
@@ -54,14 +128,181 @@ class ParserManager():
         [self.cparser.find_families(clss) for clss in self.app.classes.values()]
 
         # Parse fields in classes
-        [self.parse_fields(clss) for clss in self.app.classes.values()]
+        [self.parse_fields(clss) for clss in self.app.classes.values() if clss.cid not in self.cached]
 
         # Parse methods in classes
-        [self.parse_methods(clss) for clss in self.app.classes.values()]
+        [self.parse_methods(clss) for clss in self.app.classes.values() if clss.cid not in self.cached]
 
         # Parse instructions in methods
         [self.parse_instructions(clss) for clss in self.app.classes.values()]
 
+        if (self.cache is not None):
+            self.cache.evict()
+
+    def run_in_parallel(self, smali_paths):
+        """
+        Execute the parsing with worker processes.
+        Per-file passes run in the workers, while cross-class passes run in this process
+        in the same order as the serial parsing so that the parsed app is identical.
+        """
+        logger.debug(f'running with {self.workers = }')
+
+        chunksize = max(1, len(smali_paths) // (self.workers * 4))
+
+        # Parse classes, fields, and methods in smali files.
+        # Cached classes are not sent to the workers, and all classes are registered in the order of cids.
+        app_classes = [ self.load_class_from_cache(cid, path)[0] for cid, path in enumerate(smali_paths) ]
+        params = [ (cid, path) for cid, path in enumerate(smali_paths) if app_classes[cid] is None ]
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=init_parser_worker,
+                                 initargs=(self.root, {}, self.taint_sources, self.taint_sinks)) as executor:
+            for app_class in executor.map(parse_class_in_worker, params, chunksize=chunksize):
+                app_classes[app_class.cid] = app_class
+
+        [self.register_class(app_class) for app_class in app_classes]
+
+        # Exit if no class is parsed
+        if (len(self.app.classes.keys()) == 0):
+            raise Exception('No class is parsed')
+
+        # Find classes' families
+        [self.cparser.find_families(clss) for clss in self.app.classes.values()]
+
+        # Parse instructions in methods.
+        # Workers look up other classes in the class index, which is sent once per worker.
+        classes = list(self.app.classes.values())
+        reused = [ self.reuse_cached_instructions(clss) for clss in classes ]
+        params = [ (clss.path, clss.parent, clss.methods) for clss, r in zip(classes, reused) if not r ]
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 initializer=init_parser_worker,
+                                 initargs=(self.root, self.create_class_index(), self.taint_sources, self.taint_sinks)) as executor:
+            parsed = executor.map(parse_instructions_in_worker, params, chunksize=chunksize)
+            for clss, r in zip(classes, reused):
+                if (not r):
+                    methods, reference_num = next(parsed)
+                    self.merge_instructions(clss, methods, reference_num)
+                    self.store_class_to_cache(clss, reference_num)
+
+        if (self.cache is not None):
+            self.cache.evict()
+
+    def find_smali_paths(self):
+        """
+        Return paths to smali files in the unpackaged directory.
+        The index of a path is used as the class's cid.
+        """
+        return [ path for path in glob.iglob(self.root+'/**/*.smali', recursive=True)
+                 if (path.find(self.root+'/smali_assets') < 0 and
+                     path.find(self.root+'/assets') < 0) ]
+
+    def create_class_index(self):
+        """
+        Create a light copy of app classes containing data that the instruction parser looks up in other classes.
+        """
+        index = {}
+        for name, clss in self.app.classes.items():
+            index[name] = AppClass(cid=clss.cid, name=clss.name,
+                                   is_abstract=clss.is_abstract,
+                                   parent=clss.parent,
+                                   family=clss.family,
+                                   fields=clss.fields,
+                                   methods={ mname: AppMethod(name=mname, implemented=m.implemented)
+                                             for mname, m in clss.methods.items() },
+                                   ignore=clss.ignore,
+                                   clinit_implemented=clss.clinit_implemented)
+        return index
+
+    def load_class_from_cache(self, cid, path):
+        """
+        Load the class in the given smali file from the cache.
+        Return the cached class (None if it is not cached) and the loaded code (None if the cache is disabled).
+        """
+        if (self.cache is None):
+            return None, None
+
+        with open(path, 'r') as f:
+            text = f.read()
+        code = text.split('\n')
+
+        digest = self.cache.get_digest(text)
+        self.digests[cid] = digest
+
+        cached = self.cache.load_class(digest)
+        if (cached is None):
+            self.references[cid] = self.cache.find_referenced_classes(text)
+            return None, code
+
+        app_class, self.references[cid], environment, reference_num = cached
+        self.cached[cid] = (environment, reference_num)
+
+        # Restore data depending on the smali file's location
+        app_class.cid = cid
+        app_class.path = path
+        app_class.code = code
+        app_class.dex_id = self.cparser.get_dex_id(path)
+        app_class.path_in_dex = self.cparser.get_path_in_dex(path)
+
+        return app_class, code
+
+    def reuse_cached_instructions(self, clss):
+        """
+        Reuse the cached class's instructions if the classes it refers to and taint definitions are unchanged.
+        Return True if reused.
+        """
+        if (self.cache is None):
+            return False
+
+        # Instructions depend on the other classes, which are summarized once all classes are parsed
+        if (self.summaries is None):
+            self.summaries = self.cache.summarize_classes(self.app.classes)
+
+        environment = self.cache.get_environment(self.references[clss.cid], self.summaries)
+        self.environments[clss.cid] = environment
+
+        if (clss.cid not in self.cached):
+            return False
+
+        cached_environment, reference_num = self.cached[clss.cid]
+        if (cached_environment == environment):
+            self.merge_instructions(clss, clss.methods, reference_num)
+            return True
+
+        # The cached instructions are outdated, so the methods are parsed again
+        clss.methods = {}
+        clss.onlowmemory = None
+        self.parse_methods(clss)
+
+        return False
+
+    def store_class_to_cache(self, clss, reference_num):
+        """
+        Store the class with parsed instructions to the cache.
+        """
+        if (self.cache is None):
+            return
+
+        self.cache.store_class(self.digests[clss.cid], clss,
+                               self.references[clss.cid], self.environments[clss.cid], reference_num)
+
+    def merge_instructions(self, clss, methods, reference_num):
+        """
+        Merge the parsed methods into the given class, and count its references and potential sources and sinks.
+        """
+        clss.methods = methods
+        if (clss.onlowmemory is not None):
+            clss.onlowmemory = methods[clss.onlowmemory.name]
+
+        clss.reference_num += reference_num
+
+        # Count potential sources and sinks
+        if (not clss.ignore):
+            for m in methods.values():
+                self.app.num_potential_sources += m.num_potential_sources
+                self.app.num_potential_sinks += m.num_potential_sinks
+
+        # Count total reference num
+        self.app.reference_num += clss.reference_num
+
     def check_ignore_list(self, path_in_dex):
         """
         Check if the given class is in the ignore list.
@@ -108,8 +349,19 @@ class ParserManager():
 #         if (not is_target):
 #             return
 
-        # Parse the class
-        app_class = self.cparser.run(cid, smali_path)
+        # Parse the class unless it is cached
+        app_class, code = self.load_class_from_cache(cid, smali_path)
+        if (app_class is None):
+            app_class = self.cparser.run(cid, smali_path, code)
+
+        self.register_class(app_class)
+
+    def register_class(self, app_class):
+        """
+        Register the parsed class to the app.
+        """
+        # Parsed in a worker process, so the dex id is not registered yet
+        self.app.dex_ids.add(app_class.dex_id)
 
         # Check if the class is in the ignore list
         app_class.ignore = self.check_ignore_list(app_class.path_in_dex)
@@ -117,7 +369,8 @@ class ParserManager():
         self.app.classes[app_class.name] = app_class
         self.app.cids[app_class.cid] = app_class
 
-    def parse_fields(self, clss):
+    @staticmethod
+    def parse_fields(clss):
         """
         Parse fields in the given class.
         """
@@ -127,7 +380,8 @@ class ParserManager():
         except Exception as e:
             raise Exception(f'Field parser failed, {clss.path = }') from e
 
-    def parse_methods(self, clss):
+    @staticmethod
+    def parse_methods(clss):
         """
         Parse methods in the given class.
         """
@@ -141,24 +395,23 @@ class ParserManager():
         """
         Parse instructions in the given method's body.
         """
+        if (self.reuse_cached_instructions(clss)):
+            return
+
+        reference_num = 0
         try:
             for m in clss.methods.values():
                 # The InstructionParser instance keeps data of a method
                 # Hence, a different instance should be used for a different method
-                clss.reference_num += InstructionParser(m,
-                                                        clss.code,
-                                                        clss.parent,
-                                                        self.app.classes,
-                                                        self.referenced_methods,
-                                                        self.taint_sources,
-                                                        self.taint_sinks).run()
-                # Count potential sources and sinks
-                if (not clss.ignore):
-                    self.app.num_potential_sources += m.num_potential_sources
-                    self.app.num_potential_sinks += m.num_potential_sinks
-
-            # Count total reference num
-            self.app.reference_num += clss.reference_num
-
+                reference_num += InstructionParser(m,
+                                                   clss.code,
+                                                   clss.parent,
+                                                   self.app.classes,
+                                                   self.referenced_methods,
+                                                   self.taint_sources,
+                                                   self.taint_sinks).run()
         except Exception as e:
             raise Exception(f'Instruction parser failed, {clss.path = }') from e
+
+        self.merge_instructions(clss, clss.methods, reference_num)
+        self.store_class_to_cache(clss, reference_num)
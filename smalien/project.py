@@ -1,3 +1,4 @@
+import time
 import logging
 import pathlib
 
@@ -7,14 +8,19 @@ from .definitions import SMALIEN_LOG
 from .utils.nops import NoMatch
 from .utils.apk_handler import ApkHandler
 from .utils.pickle_handler import PickleHandler
+from .utils.project_store import ProjectStore
 from .utils.pretty_printer import PrettyPrinter
 
+from .parsers.parse_cache import ParseCache
+
 from .instrumentator.instrumentator import Instrumentator
+from .instrumentator.injector.manifest_injector import ManifestInjector
 
 from .exerciser.exerciser import Exerciser
 from .exerciser.automatic_exerciser import AutomaticExerciser
 
 from .emulator.emulator import Emulator
+from .emulator.sharded_emulator import ShardedEmulator
 from .emulator.vm_manager.structures import VMOrder
 
 from .taint_definitions.sources import taint_sources
@@ -32,9 +38,11 @@ class Project:
     def __init__(self, target, ignore_list=[], target_packages=[],
                  rm_unpackaged=False, run_parser=True, device=None, apktool='apktool',
                  taint_source_definition=taint_sources, taint_sink_definition=taint_sinks,
-                 detect_reconstruction_failures=True):
+                 detect_reconstruction_failures=True, parse_workers=1,
+                 parse_cache_dir=None, parse_cache_size=4*1024**3, memory_budget=None, trial_build=True,
+                 adb='adb', log_compression=None, tool_worker=None):
         """
-        :param target:           Path to target, either *.apk or *.pickle
+        :param target:           Path to target, either *.apk, *.pickle, or *.sqlite
         :param ignore_list:      Listing package names skipped by the analysis.
                                  An item should not contain '/'.
         :param target_packages:  Listing package names targetted by the analysis.
@@ -47,6 +55,23 @@ class Project:
         :taint_sink_definition:    Definition of taint sinks.
         :param detect_reconstruction_failures:  If true, stop the reconstruction when a failure is detected.
                                                 If false, a failure is ignored.
+        :param parse_workers:   Number of worker processes parsing smali files.
+        :param parse_cache_dir:   Directory caching parsed smali files. If None, the cache is disabled.
+                                  The directory can be shared by multiple apps.
+        :param parse_cache_size:  Maximum size of the parse cache in bytes.
+        :param memory_budget:     Maximum RSS in bytes for the reconstruction with runtime logs.
+                                  If exceeded, unreachable instances are removed, and taint history is spilled to the workspace.
+                                  If None, memory usage is not bounded.
+        :param trial_build:       If true, build the apk at unpackaging to test if it is repackageable with decoding the resources.
+                                  If false, skip the test, and unpackage the apk again without decoding the resources
+                                  only when create_new_apk fails to build it.
+        :param adb:               adb command, either a command name or a list of arguments,
+                                  e.g., ['python', '-m', 'smalien.utils.adb_stub', '--root', <directory>].
+        :param log_compression:   Compressor of runtime logs transferred from the device, either None or gzip.
+                                  If gzip, logs are compressed on the device and decompressed while being read.
+        :param tool_worker:       ToolWorker running apktool, aapt, xml2axml, and signers, so that they do not start a new JVM per command.
+                                  Commands the worker does not run are run as subprocesses. The caller stops the worker.
+                                  If None, each command starts a new process.
         """
         logger.debug('initializing')
 
@@ -55,6 +80,10 @@ class Project:
 
         self.rm_unpackaged = rm_unpackaged
 
+        self.adb = adb
+        self.log_compression = log_compression
+        self.tool_worker = tool_worker
+
         # Check if the target exists
         self.target = pathlib.Path(target)
         assert self.target.exists(), 'The target does not exist.'
@@ -63,7 +92,12 @@ class Project:
         self.workspace = self.target.parent.resolve()
 
         # Initialize apk handler
-        self.apk_handler = ApkHandler(apktool=apktool)
+        self.apk_handler = ApkHandler(apktool=apktool, tool_worker=self.tool_worker)
+
+        # Initialize parse cache
+        self.parse_cache = None
+        if (parse_cache_dir is not None):
+            self.parse_cache = ParseCache(parse_cache_dir, parse_cache_size, self.taint_sources, self.taint_sinks)
 
         try:
             # Load the target data
@@ -76,7 +110,10 @@ class Project:
                                                                            smalien_log=SMALIEN_LOG,
                                                                            run_parser=run_parser,
                                                                            taint_sources=self.taint_sources,
-                                                                           taint_sinks=self.taint_sinks,)
+                                                                           taint_sinks=self.taint_sinks,
+                                                                           parse_workers=parse_workers,
+                                                                           parse_cache=self.parse_cache,
+                                                                           trial_build=trial_build,)
             logger.debug(f'{self.app.num_potential_sources = }')
             logger.debug(f'{self.app.num_potential_sinks = }')
         except Exception as e:
@@ -91,11 +128,12 @@ class Project:
                                  self.workspace,
                                  self.taint_sources,
                                  self.taint_sinks,
-                                 detect_failures=detect_reconstruction_failures)
+                                 detect_failures=detect_reconstruction_failures,
+                                 memory_budget=memory_budget)
         self.pprinter = PrettyPrinter(self.app)
 
         if (device is not None):
-            self.exerciser = Exerciser(self.app, self.workspace, device)
+            self.exerciser = Exerciser(self.app, self.workspace, device, self.adb, self.log_compression)
 
     def pprint(self, **kwargs):
         """
@@ -106,11 +144,18 @@ class Project:
         """
         self.pprinter.pprint_app(kwargs)
 
-    def save(self):
+    def save(self, project_store=False, compression='zlib'):
         """
         Save the app code to the pickle.
+
+        :param project_store:  If true, save the app code to a project store (*.sqlite) instead.
+                               Loading a project store is faster, because classes are loaded on first access.
+        :param compression:    Compressor of the project store, either none, zlib, bz2, lzma, lz4, or zstd.
         """
-        PickleHandler.store(self.app, self.app.pickled)
+        if (project_store):
+            ProjectStore.store(self.app, pathlib.Path(self.app.pickled).with_suffix('.sqlite'), compression)
+        else:
+            PickleHandler.store(self.app, self.app.pickled)
 
     def configure_keystore(self, **kwargs):
         """
@@ -123,7 +168,8 @@ class Project:
         """
         self.apk_handler.configure_keystore(kwargs)
 
-    def instrument(self, log_buff_size=0, register_reassignment=False, multi_dex=True, dummy_source_values=None):
+    def instrument(self, log_buff_size=0, register_reassignment=False, multi_dex=True, dummy_source_values=None, binary_log=False,
+                   selective=False, minimize=False, threaded_log=False, log_segment_size=0):
         """
         Launch static bytecode instrumentation.
 
@@ -131,11 +177,19 @@ class Project:
         :param register_reassignment:  Reassign registers
         :param multi_dex:              Enable multi dex
         :param dummy_source_values:    Dummy source values for the injection
+        :param binary_log:             Write runtime logs in the binary format instead of JSON
+        :param selective:              Instrument only methods reaching taint sources or sinks, and their callers
+        :param minimize:               Skip log points whose values and timings the emulator can recompute
+        :param threaded_log:           Buffer runtime logs per thread, and write them in a background thread
+        :param log_segment_size:       Roll runtime logs over to indexed segments of this number of characters, which requires threaded_log
         """
         logger.debug('instrumenting')
 
         try:
-            Instrumentator(self.app, log_buff_size, register_reassignment, multi_dex, self.taint_sources, dummy_source_values).run()
+            Instrumentator(self.app, log_buff_size, register_reassignment, multi_dex, self.taint_sources, dummy_source_values,
+                           binary_log=binary_log, taint_sinks=self.taint_sinks, selective=selective,
+                           minimize=minimize, threaded_log=threaded_log, log_segment_size=log_segment_size,
+                           tool_worker=self.tool_worker).run()
         except Exception as e:
             if (self.rm_unpackaged):
                 # Remove the unpackaged
@@ -152,7 +206,8 @@ class Project:
         logger.debug('creating a new apk')
 
         try:
-            self.apk_handler.package_and_sign(self.app.unpackaged, self.app.smaliened, signer)
+            self.package()
+            self.apk_handler.sign(self.app.smaliened, signer)
         except Exception as e:
             raise e
         finally:
@@ -160,6 +215,30 @@ class Project:
                 # Remove the unpackaged
                 self.apk_handler.rm_unpackaged(self.workspace/self.target.stem)
 
+    def package(self):
+        """
+        Repackage the instrumented app.
+        If the repackageability was not tested at unpackaging and the build fails,
+        unpackage the apk again without decoding the resources, and replay the manifest injection.
+        """
+        start = time.perf_counter()
+        try:
+            self.apk_handler.package(self.app.unpackaged, self.app.smaliened)
+        except Exception as e:
+            if (self.app.repackage_tested is not False or not self.app.resource_decoded):
+                raise e
+
+            logger.warning(f'failed to package with decoding the resources, so retry without decoding them: {e}')
+            self.apk_handler.redecode_without_resources(self.app.apk, self.app.unpackaged)
+            self.app.resource_decoded = False
+            ManifestInjector(self.app, tool_worker=self.tool_worker).run()
+
+            self.apk_handler.package(self.app.unpackaged, self.app.smaliened)
+        else:
+            if (self.app.repackage_tested is False):
+                # The trial build would have taken as long as this build
+                logger.info(f'saved a trial build of {time.perf_counter() - start:.1f} s')
+
     def remove_unpackaged(self):
         """
         Remove the unpackaged directory.
@@ -168,20 +247,23 @@ class Project:
 
         self.apk_handler.rm_unpackaged(self.app.unpackaged)
 
-    def exercise_automatically(self, devices, action_num_limit=None):
+    def exercise_automatically(self, devices, action_num_limit=None, live=False):
         """
         Automatically launch and exercise the app on an Android device to record runtime data.
         Returns the number of detected leaks.
 
         :param devices:    List of device on that the app is exercised.
         :param action_num_limit:  Limit of the number of actions the exerciser performs.
+        :param live:       Emulate the app with the runtime log streamed while performing actions,
+                           instead of collecting the log after performing them.
         """
         logger.debug('exercising the app automatically')
 
         automatic_exerciser = AutomaticExerciser(self.app, self.workspace,
                                                  self.taint_sources,
                                                  self.taint_sinks,
-                                                 devices, action_num_limit)
+                                                 devices, action_num_limit,
+                                                 self.adb, self.log_compression, live)
         return automatic_exerciser.run()
 
         # Replace the project's emulator with the actually-used emulator
@@ -193,24 +275,56 @@ class Project:
 
         :param clss:      App's class at that the emulation begins.
         :param method:    App's method at that the emulation begins.
+                          If None, the method containing the line is used.
         :param line:      App's line at that the emulation begins.
         """
         logger.debug('emulating')
 
+        if (method is None):
+            method = self.app.classes[clss].get_method_of_line(line)
+
         if (line is None):
             # Use the line number of the method head as a starting point
             line = self.app.classes[clss].methods[method].start_at
 
         self.emulator.run(VMOrder(clss=clss, method=method, line=line))
 
-    def emulate_with_runtime_logs(self):
+    def emulate_with_live_logs(self, stream=None, on_leak=None):
+        """
+        Emulate the app code with runtime data streamed while the app is being exercised.
+        The emulation finishes when the stream is closed.
+        Returns the number of detected leaks.
+
+        :param stream:   LiveLogStream of the runtime log. If None, the log on the project's device is streamed.
+        :param on_leak:  Function called with each leak as it is found.
+        """
+        logger.debug('emulating with live logs')
+
+        if (stream is None):
+            stream = self.exerciser.stream_log()
+
+        self.emulator.run_with_live_logs(stream, on_leak)
+
+        return self.emulator.get_num_leaks()
+
+    def emulate_with_runtime_logs(self, workers=1, decode_workers=1):
         """
         Emulate the app code with runtime data.
+
+        :param workers:  Number of worker processes.
+                         If more than 1, threads of the app (i.e., PTIDs) are emulated in parallel.
+        :param decode_workers:  Number of worker processes decoding segments of runtime logs.
         """
         logger.debug('emulating with runtime logs')
 
+        self.emulator.runtime_log_manager.decode_workers = decode_workers
+
         try:
-            self.emulator.run_with_runtime_logs()
+            if (workers > 1):
+                ShardedEmulator(self.emulator, self.workspace, self.taint_sources, self.taint_sinks,
+                                self.emulator.detect_failures, workers).run()
+            else:
+                self.emulator.run_with_runtime_logs()
         except Exception as e:
             raise e
         finally:
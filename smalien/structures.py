@@ -1,4 +1,5 @@
 from typing import Dict
+from bisect import bisect_right
 from collections import defaultdict
 from dataclasses import dataclass, field
 
@@ -47,6 +48,36 @@ class AppField:
     data_type: str = None
     default_value: str = None
 
+@dataclass
+class MethodIndex:
+    """
+    Sorted intervals of methods' lines for finding the method containing a line.
+    """
+    starts: list = field(default_factory=list)  # Line numbers of methods' heads in ascending order
+    ends: list = field(default_factory=list)    # Line numbers of methods' tails
+    names: list = field(default_factory=list)   # Names of methods
+
+    @staticmethod
+    def build(methods):
+        """
+        Build the index of the given methods.
+        """
+        index = MethodIndex()
+        for mdata in sorted(methods.values(), key=lambda m: m.start_at):
+            index.starts.append(mdata.start_at)
+            index.ends.append(mdata.end_at)
+            index.names.append(mdata.name)
+        return index
+
+    def find(self, line):
+        """
+        Return name of the method containing the line, or None if no method contains it.
+        """
+        i = bisect_right(self.starts, line) - 1
+        if (i >= 0 and line <= self.ends[i]):
+            return self.names[i]
+        return None
+
 @dataclass
 class AppClass:
     """
@@ -73,6 +104,7 @@ class AppClass:
     # Data
     fields: Dict[str, Dict] = field(default_factory=dict)
     methods: Dict[str, AppMethod] = field(default_factory=dict)
+    method_index: MethodIndex = None  # Index of methods' lines, built by the method parser
 
     # Instrumentation
     ignore: bool = False     # If true, the class is not instrumented, and its methods are considered as API
@@ -91,6 +123,19 @@ class AppClass:
     # Callback methods
     onlowmemory: AppMethod = None  # Save the class's overridden onLowMemory method.
 
+    def get_method_of_line(self, line):
+        """
+        Get method name containing the code of the line.
+        """
+        # Classes pickled before the index was introduced do not have it
+        if (self.method_index is None):
+            self.method_index = MethodIndex.build(self.methods)
+
+        method = self.method_index.find(line)
+        if (method is None):
+            raise Exception(f'Failed to find method of {line = } in {self.name = }')
+        return method
+
 @dataclass
 class App:
     """
@@ -105,7 +150,11 @@ class App:
     smalien_dex_id: str = None                  # ID of Dex writing smalien logging functions
     resource_decoded: bool = None               # Indicate whether resources are decoded
                                                 # Used when injecting permissions to AndroidManifest.xml
+    repackage_tested: bool = None               # Indicate whether the apk was tested to be repackageable at unpackaging
+                                                # If false, the apk is unpackaged again when the final build fails
     reference_num: int = 0                      # Number of method references in the app
+    log_format: str = 'json'                    # Format of runtime logs, either json, binary, or threaded
+    log_segment_size: int = 0                   # Size of runtime log segments in characters, or 0 if not segmented
 
     # App's information for exercising
     package: str = None           # App's package name
@@ -0,0 +1,156 @@
+import re
+import logging
+from collections import defaultdict
+
+logger = logging.getLogger(name=__name__)
+
+
+# Matchers compiled from taint definitions, keyed by the definition's id and the default rule.
+# The definition is kept with its matcher, so that the id is not reused while the entry exists.
+matchers = {}
+
+def get_matcher(definition, default_rule):
+    """
+    Return the matcher of the given definition, which is compiled if not yet.
+
+    :param definition:    Taint definition, a dict of class names and dicts of method patterns and values.
+    :param default_rule:  Rule of patterns without a marker, 'exact' or 'substring'.
+    """
+    entry = matchers.get((id(definition), default_rule))
+    if (entry is None or entry[0] is not definition):
+        logger.debug(f'compiling a taint definition, {len(definition) = }, {default_rule = }')
+        entry = matchers[(id(definition), default_rule)] = (definition, DefinitionMatcher(definition, default_rule))
+
+    return entry[1]
+
+
+class ClassRules:
+    """
+    Method patterns of a class, indexed by their rules.
+    """
+
+    def __init__(self):
+        # Exact patterns, keyed by the method signature
+        self.exact = defaultdict(list)
+
+        # Prefix patterns
+        self.prefixes = []
+
+        # Substring patterns of a whole signature, keyed by the argument part.
+        # A signature contains only one pair of parentheses, so such a pattern matches a method
+        # if the method name ends with the pattern's name, the arguments are the same, and the return type starts with the pattern's.
+        self.signatures = defaultdict(list)
+
+        # Other substring patterns, and a regular expression finding any of them
+        self.fragments = []
+        self.fragment_finder = None
+
+    def add(self, i, rule, pattern, value):
+        """
+        Add a pattern of the rule.
+
+        :param i:  Position of the pattern in the definition.
+        """
+        if (rule == 'exact'):
+            self.exact[pattern].append((i, value))
+        elif (rule == 'prefix'):
+            self.prefixes.append((i, pattern, value))
+        elif (pattern.count('(') == 1 and pattern.count(')') == 1 and pattern.find('(') < pattern.find(')')):
+            name, rest = pattern.split('(')
+            arguments, return_type = rest.split(')')
+            self.signatures[arguments].append((i, name, return_type, value))
+        else:
+            self.fragments.append((i, pattern, value))
+
+    def compile(self):
+        if (self.fragments):
+            self.fragment_finder = re.compile('|'.join( re.escape(pattern) for _, pattern, _ in self.fragments ))
+
+    def match(self, method):
+        """
+        Return positions and values of patterns matching the method.
+        """
+        matched = list(self.exact.get(method, []))
+
+        for i, pattern, value in self.prefixes:
+            if (method.startswith(pattern)):
+                matched.append((i, value))
+
+        if (self.signatures and '(' in method and ')' in method):
+            name, rest = method.split('(', 1)
+            arguments, return_type = rest.split(')', 1)
+            for i, pattern_name, pattern_return_type, value in self.signatures.get(arguments, []):
+                if (name.endswith(pattern_name) and return_type.startswith(pattern_return_type)):
+                    matched.append((i, value))
+
+        if (self.fragment_finder is not None and self.fragment_finder.search(method) is not None):
+            for i, pattern, value in self.fragments:
+                if (pattern in method):
+                    matched.append((i, value))
+
+        return matched
+
+
+class DefinitionMatcher:
+    """
+    Match invoked methods to a taint definition.
+
+    Method patterns of the definition follow one of the rules:
+      - exact:      '=' followed by the signature, e.g., '=getDeviceId()Ljava/lang/String;'
+      - prefix:     The prefix followed by '*', e.g., 'getDevice*'
+      - substring:  The substring enclosed by '*', e.g., '*DeviceId*'
+    Patterns without the markers follow the default rule.
+    Class names are matched exactly, and results are cached for each invoked method.
+    """
+
+    def __init__(self, definition, default_rule):
+        logger.debug('initializing')
+
+        self.classes = {}
+        for clss, patterns in definition.items():
+            rules = self.classes[clss] = ClassRules()
+            for i, (pattern, value) in enumerate(patterns.items()):
+                rule, pattern = self.parse_pattern(pattern, default_rule)
+                rules.add(i, rule, pattern, value)
+            rules.compile()
+
+        # Matched values, keyed by class names and method signatures
+        self.cache = {}
+
+    @staticmethod
+    def parse_pattern(pattern, default_rule):
+        """
+        Return the rule and the pattern without the markers.
+        """
+        if (pattern.startswith('=')):
+            return 'exact', pattern[1:]
+        if (len(pattern) > 1 and pattern.startswith('*') and pattern.endswith('*')):
+            return 'substring', pattern[1:-1]
+        if (pattern.endswith('*')):
+            return 'prefix', pattern[:-1]
+        return default_rule, pattern
+
+    def find_all(self, clss, method):
+        """
+        Return values of patterns matching the method, in the order of the definition.
+        """
+        key = (clss, method)
+        values = self.cache.get(key)
+        if (values is None):
+            rules = self.classes.get(clss)
+            if (rules is None):
+                values = ()
+            else:
+                values = tuple( value for _, value in sorted(rules.match(method), key=lambda m: m[0]) )
+            self.cache[key] = values
+
+        return values
+
+    def find(self, clss, method):
+        """
+        Return the value of the first pattern matching the method, or None.
+        """
+        values = self.find_all(clss, method)
+        if (values):
+            return values[0]
+        return None
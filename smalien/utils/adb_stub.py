@@ -0,0 +1,103 @@
+"""
+A stand-in of adb serving files of a local directory as the device's storage.
+It supports pull, exec-out, and shell, so that collecting runtime logs can be tested and benchmarked without a device.
+Device paths are mapped under the root directory, and transfers are throttled to the given bandwidth.
+
+Usage: python -m smalien.utils.adb_stub --root <directory> [--bandwidth <bytes/s>] [-s <device>] <command> [<args>...]
+"""
+import sys
+import time
+import signal
+import pathlib
+import argparse
+import subprocess
+
+
+def to_local(root, arg):
+    """
+    Map a device path to the path under the root.
+    """
+    return str(root) + arg if (arg.startswith('/')) else arg
+
+def transfer(src, dst, bandwidth, chunk_size=64*1024):
+    """
+    Copy the stream, sleeping not to exceed the bandwidth.
+    """
+    start = time.perf_counter()
+    sent = 0
+    while (True):
+        # Pass available bytes without waiting for a full chunk, so that streamed output is not delayed
+        chunk = src.read1(chunk_size)
+        if (len(chunk) == 0):
+            break
+
+        dst.write(chunk)
+        dst.flush()
+        sent += len(chunk)
+
+        if (bandwidth is not None):
+            delay = sent / bandwidth - (time.perf_counter() - start)
+            if (delay > 0):
+                time.sleep(delay)
+
+def pull(root, args, bandwidth):
+    remote, local = args[0], pathlib.Path(args[1])
+    if (local.is_dir()):
+        local = local / pathlib.PurePosixPath(remote).name
+
+    try:
+        src = open(to_local(root, remote), 'rb')
+    except OSError:
+        sys.stderr.write(f"adb: error: failed to stat remote object '{remote}': No such file or directory\n")
+        return 1
+
+    with src, open(local, 'wb') as dst:
+        transfer(src, dst, bandwidth)
+
+    return 0
+
+def exec_out(root, args, bandwidth):
+    # Like adb exec-out, the exit status of the command is not returned
+    process = subprocess.Popen([ to_local(root, arg) for arg in args ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        transfer(process.stdout, sys.stdout.buffer, bandwidth)
+        process.wait()
+    finally:
+        # Like the device when adb is killed, stop the command, e.g., tail following a log
+        process.kill()
+
+    return 0
+
+def shell(root, args):
+    # Like adb shell, the arguments are joined and run by sh, which expands globs
+    completed = subprocess.run(' '.join( to_local(root, arg) for arg in args ),
+                               shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    # Show device paths in the output
+    sys.stdout.write(completed.stdout.decode('utf-8', errors='replace').replace(str(root), ''))
+
+    return completed.returncode
+
+def run_adb_stub():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--root', required=True, help='Directory served as the device\'s storage.')
+    parser.add_argument('--bandwidth', type=float, default=None, help='Transfer rate in bytes per second.')
+    parser.add_argument('-s', dest='device', default=None, help='Serial number of the device, which is ignored.')
+    parser.add_argument('command', choices=['pull', 'exec-out', 'shell'])
+    parser.add_argument('args', nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+
+    root = pathlib.Path(args.root).resolve()
+
+    # Exit with the cleanup when terminated
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+    if (args.command == 'pull'):
+        return pull(root, args.args, args.bandwidth)
+    if (args.command == 'exec-out'):
+        return exec_out(root, args.args, args.bandwidth)
+
+    return shell(root, args.args)
+
+if __name__ == '__main__':
+    sys.exit(run_adb_stub())
@@ -12,14 +12,17 @@ class ApkHandler:
     This class processes the apk file.
     """
 
-    def __init__(self, apktool='apktool', aapt='aapt'):
+    def __init__(self, apktool='apktool', aapt='aapt', tool_worker=None):
         """
         :param apktool:          Command name or path of apktool
+        :param tool_worker:      ToolWorker running apktool, aapt, and signers, or None.
+                                 Commands the worker does not run are run as subprocesses.
         """
         logger.debug('initializing')
 
         self.apktool = apktool
         self.aapt = aapt
+        self.tool_worker = tool_worker
 
     def configure_keystore(self, kwargs):
         """
@@ -32,14 +35,23 @@ class ApkHandler:
         self.keypass = kwargs['keypass']
         self.alias = kwargs['alias']
 
-    def unpackage(self, apk, unpackaged, smaliened):
+    def unpackage(self, apk, unpackaged, smaliened, trial_build=True):
         """
         Extract the apk with apktool.
+
+        :param trial_build:  If true, test if the apk is repackageable with decoding the resources by building it.
+                             If false, the resources are decoded without the test,
+                             and the apk must be unpackaged again by redecode_without_resources if the final build fails.
         """
         logger.debug('unpackaging')
 
         resource_decoded = True
 
+        if (not trial_build):
+            self.unpackage_with_decoding_resources(apk, unpackaged)
+
+            return resource_decoded
+
         # Test if the apk is repackageable with decoding the resources
         try:
             # Unpackage
@@ -70,7 +82,7 @@ class ApkHandler:
                unpackaged]
 
         try:
-            CommandRunner.run(cmd)
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
         except Exception as e:
             raise Exception('failed to unpackage') from e
 
@@ -91,10 +103,38 @@ class ApkHandler:
                unpackaged]
 
         try:
-            CommandRunner.run(cmd)
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
         except Exception as e:
             raise Exception('failed to unpackage') from e
 
+    def redecode_without_resources(self, apk, unpackaged):
+        """
+        Unpackage the apk again without decoding the resources, keeping the instrumented smali files.
+        Smali files are disassembled in the same way regardless of the resources,
+        so only files other than them are replaced.
+        """
+        logger.debug('redecoding without resources')
+
+        unpackaged = pathlib.Path(unpackaged)
+        kept = unpackaged.parent / (unpackaged.name+'_smali')
+
+        # Move the instrumented smali directories aside
+        shutil.rmtree(kept, ignore_errors=True)
+        kept.mkdir()
+        for path in unpackaged.glob('smali*'):
+            shutil.move(path, kept / path.name)
+
+        try:
+            self.unpackage_without_decoding_resources(apk, unpackaged)
+
+            # Replace the smali directories with the instrumented ones
+            for path in unpackaged.glob('smali*'):
+                shutil.rmtree(path)
+            for path in kept.iterdir():
+                shutil.move(path, unpackaged / path.name)
+        finally:
+            shutil.rmtree(kept, ignore_errors=True)
+
     def package_and_sign(self, unpackaged, smaliened, signer):
         """
         Rebuild and sign the apk.
@@ -117,7 +157,7 @@ class ApkHandler:
                smaliened]
 
         try:
-            CommandRunner.run(cmd)
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
         except Exception as e:
             raise Exception('failed to package') from e
 
@@ -152,7 +192,7 @@ class ApkHandler:
             raise Exception(f'unsupported {signer = }')
 
         try:
-            CommandRunner.run(cmd)
+            CommandRunner.run(cmd, tool_worker=self.tool_worker)
         except Exception as e:
             # Handle some errors
             if (str(e).find('Use --min-sdk-version to override') > -1):
@@ -167,7 +207,7 @@ class ApkHandler:
                        'pass:'+self.storepass,
                        smaliened]
                 try:
-                    CommandRunner.run(cmd)
+                    CommandRunner.run(cmd, tool_worker=self.tool_worker)
                 except Exception as e:
                     raise Exception('failed to sign with --min-sdk-version') from e
 
@@ -198,7 +238,7 @@ class ApkHandler:
 
         try:
             try:
-                data = CommandRunner.run(cmd)
+                data = CommandRunner.run(cmd, tool_worker=self.tool_worker)
             except Exception as e:
                 # Find package name in the error message.
                 if (str(e).find("package: name=") > -1):
@@ -229,7 +269,7 @@ class ApkHandler:
                'AndroidManifest.xml']
 
         try:
-            data = CommandRunner.run(cmd)
+            data = CommandRunner.run(cmd, tool_worker=self.tool_worker)
         except Exception as e:
             # If it failed, simply return empty arrays to avoid stopping Smalien.
             return [], [], []
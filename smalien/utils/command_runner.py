@@ -2,6 +2,8 @@ import io
 import logging
 import subprocess
 
+from .tool_worker import ToolWorkerUnavailable
+
 logger = logging.getLogger(name=__name__)
 
 
@@ -9,16 +11,35 @@ class CommandRunner:
     """
     Run shell commands.
     """
+
     @staticmethod
-    def run(cmd, timeout=None):
+    def run(cmd, timeout=None, tool_worker=None):
         """
         Run the given command.
+
+        :param tool_worker:   ToolWorker to which the command is sent, or None.
+                              The command is run as a subprocess if the worker is unavailable or does not support it.
         """
         logger.debug('running command')
 
         # cmd might contain sensitive information
         #logger.debug(f'{cmd = }')
 
+        if (tool_worker is not None and tool_worker.handles(cmd)):
+            try:
+                output, returncode = tool_worker.run(cmd, timeout)
+            except ToolWorkerUnavailable as e:
+                logger.debug(f'running as a subprocess, {e}')
+            except subprocess.TimeoutExpired as e:
+                raise Exception(f'Timeout {cmd = }\n'
+                                f'{e.output.decode("utf-8") = }') from e
+            else:
+                if (returncode != 0):
+                    e = subprocess.CalledProcessError(returncode, cmd, output)
+                    raise Exception(f'{cmd = }\n'
+                                    f'{e.output.decode("utf-8") = }') from e
+                return output
+
         try:
             output = subprocess.check_output(cmd, timeout=timeout, stderr=subprocess.STDOUT)
         except subprocess.CalledProcessError as e:
@@ -30,6 +51,25 @@ class CommandRunner:
 
         return output
 
+    @staticmethod
+    def run_with_redirecting_to_file(cmd, output_path, timeout=None):
+        """
+        Run the given command, and stream its stdout to the file instead of buffering it.
+        The command always runs as a subprocess, since the tool worker returns buffered output.
+
+        :param output_path:    Path to output file.
+        """
+        logger.debug('running command with redirecting to file')
+
+        try:
+            with io.open(output_path, 'wb') as f:
+                subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, timeout=timeout, check=True)
+        except subprocess.CalledProcessError as e:
+            raise Exception(f'{cmd = }\n'
+                            f'{e.stderr.decode("utf-8") = }') from e
+        except subprocess.TimeoutExpired as e:
+            raise Exception(f'Timeout {cmd = }') from e
+
     @staticmethod
     def start_process(cmd):
         """
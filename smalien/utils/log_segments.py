@@ -0,0 +1,103 @@
+import json
+import heapq
+import logging
+import pathlib
+from dataclasses import dataclass
+
+logger = logging.getLogger(name=__name__)
+
+
+@dataclass
+class LogSegment:
+    """
+    Store a segment of a runtime log written by the per-thread writer.
+    """
+    pid: int = None    # PID of the process writing the segment
+    num: int = None    # Segment number in the process
+    path: str = None   # Path to the segment
+    index: dict = None  # Index of the segment, or None if the segment is not closed yet
+                        # Format: {'segment': <num>, 'first': <time>, 'last': <time>, 'ptids': [<pid>_<tid>, ...]}
+
+
+class LogSegments:
+    """
+    Name and list segments of runtime logs.
+    A segment is named <log path>.<pid>.<segment number>, and its index is named <segment path>.idx.
+    The index is written after the segment is closed, so a segment with the index is complete.
+    """
+
+    @staticmethod
+    def get_path(log, pid, num):
+        return f'{log}.{pid}.{num}'
+
+    @staticmethod
+    def get_index_path(log, pid, num):
+        return f'{log}.{pid}.{num}.idx'
+
+    @staticmethod
+    def parse_names(log, names):
+        """
+        Parse paths of segments and indexes of the log.
+        Return a dict keyed by PIDs and segment numbers, whose values indicate that the segments are indexed.
+        """
+        prefix = f'{log}.'
+
+        segments = {}
+        for name in names:
+            if (not name.startswith(prefix)):
+                continue
+
+            # A segment can be collected as a compressed copy
+            fields = name[len(prefix):].split('.')
+            if (len(fields) < 2 or
+                not fields[0].isdigit() or
+                not fields[1].isdigit() or
+                fields[2:] not in [[], ['idx'], ['gz']]):
+                continue
+
+            key = (int(fields[0]), int(fields[1]))
+            segments[key] = segments.get(key, False) or fields[2:] == ['idx']
+
+        return segments
+
+    @staticmethod
+    def list_local(log):
+        """
+        Return segments of the log on the server in the order of decoding.
+        """
+        log = pathlib.Path(log)
+        names = [ str(path) for path in log.parent.glob(f'{log.name}.*') ]
+
+        segments = []
+        for (pid, num), indexed in LogSegments.parse_names(log, names).items():
+            segment = LogSegment(pid=pid, num=num, path=LogSegments.get_path(log, pid, num))
+            if (indexed):
+                try:
+                    with open(LogSegments.get_index_path(log, pid, num), 'r') as f:
+                        segment.index = json.load(f)
+                except Exception as e:
+                    logger.warning(f'failed to read the index of {segment.path}: {e}')
+            segments.append(segment)
+
+        return LogSegments.order(segments)
+
+    @staticmethod
+    def order(segments):
+        """
+        Order segments for decoding.
+        Segments of a process are kept in the order of being written, so that records of each thread stay in order.
+        Among processes, the segment with the earliest first timestamp is taken next, and segments without indexes come last.
+        """
+        processes = {}
+        for segment in sorted(segments, key=lambda segment: (segment.pid, segment.num)):
+            processes.setdefault(segment.pid, []).append(segment)
+
+        # heapq.merge repeatedly takes the earliest of the processes' next segments
+        return list(heapq.merge(*processes.values(), key=LogSegments.get_first_time))
+
+    @staticmethod
+    def get_first_time(segment):
+        """
+        Return the lower bound of timestamps in the segment, which is infinite if the segment is not indexed.
+        """
+        return segment.index['first'] if (segment.index is not None) else float('inf')
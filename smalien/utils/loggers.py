@@ -30,6 +30,18 @@ class Loggers:
     def enable_root_logger(self):
         logging.root.addHandler(self.handler)
 
+class Trace:
+    """
+    Switch of logs emitted for every emulated instruction.
+    Formatting such logs costs more than the emulation itself, so the emulator's hot path checks this flag before calling loggers.
+    The flag is updated by the VM manager for every VM order, following the level of the smalien logger.
+    """
+    enabled = True
+
+    @staticmethod
+    def update():
+        Trace.enabled = logging.getLogger('smalien').isEnabledFor(logging.INFO)
+
 class CustomFormatter(logging.Formatter):
     """
     Format and colorize data of dataclasses and dictionaries.
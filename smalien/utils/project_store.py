@@ -0,0 +1,207 @@
+import io
+import bz2
+import lzma
+import zlib
+import pickle
+import logging
+import pathlib
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+
+logger = logging.getLogger(name=__name__)
+
+
+# Compressors of records, mapping a name to functions compressing and decompressing bytes
+compressors = {
+    'none': (bytes, bytes),
+    'zlib': (zlib.compress, zlib.decompress),
+    'bz2': (bz2.compress, bz2.decompress),
+    'lzma': (lzma.compress, lzma.decompress),
+}
+
+# Optional compressors
+try:
+    import lz4.frame
+    compressors['lz4'] = (lz4.frame.compress, lz4.frame.decompress)
+except ImportError:
+    pass
+
+try:
+    import zstandard
+    compressors['zstd'] = (zstandard.ZstdCompressor().compress, zstandard.ZstdDecompressor().decompress)
+except ImportError:
+    pass
+
+
+class LazyInstructions(MutableMapping):
+    """
+    Placeholder of a method's instructions, which are loaded from the project store on first access.
+    When loaded, every method of the class gets its actual instructions, so later accesses do not go through this.
+    """
+
+    def __init__(self, store, cid, method):
+        self.store = store
+        self.cid = cid
+        self.method = method
+        self.instructions = None
+
+    def load(self):
+        if (self.instructions is None):
+            self.instructions = self.store.load_instructions(self.cid)[self.method]
+        return self.instructions
+
+    def __getitem__(self, key):
+        return self.load()[key]
+
+    def __setitem__(self, key, value):
+        self.load()[key] = value
+
+    def __delitem__(self, key):
+        del self.load()[key]
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __reduce__(self):
+        # Pickled as the actual instructions
+        return (dict, (self.load(),))
+
+
+class IndexPickler(pickle.Pickler):
+    """
+    Pickle the app without instructions, which are stored in the class records.
+    """
+
+    def __init__(self, file, references):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.references = references
+
+    def persistent_id(self, obj):
+        return self.references.get(id(obj))
+
+
+class IndexUnpickler(pickle.Unpickler):
+    """
+    Unpickle the app with placeholders of instructions.
+    """
+
+    def __init__(self, file, store):
+        super().__init__(file)
+        self.store = store
+
+    def persistent_load(self, pid):
+        cid, method = pid
+        return LazyInstructions(self.store, cid, method)
+
+
+class ProjectStore:
+    """
+    This class processes project stores, an alternative to pickle files.
+
+    A project store is a SQLite database keeping an index of the app and a record per class.
+    The index contains the app's data except instructions, and it is loaded eagerly.
+    A record contains instructions of the class's methods, and it is loaded on first access.
+    Hence, the emulator only deserializes classes appearing in runtime logs.
+    """
+
+    # Increment this when the format changes
+    VERSION = 1
+
+    def __init__(self, path):
+        """
+        Open the project store, and load the app's index.
+        """
+        logger.debug(f'loading project store from {path = }')
+
+        self.connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self.lock = threading.Lock()
+
+        meta = dict(self.connection.execute('SELECT key, value FROM meta'))
+        if (meta['version'] != self.VERSION):
+            raise Exception(f'Unsupported project store, {meta["version"] = }')
+
+        self.compression = meta['compression']
+        if (self.compression not in compressors.keys()):
+            raise Exception(f'Compressor is not available, {self.compression = }')
+        self.decompress = compressors[self.compression][1]
+
+        self.app = IndexUnpickler(io.BytesIO(self.decompress(meta['app'])), self).load()
+
+    def load_instructions(self, cid):
+        """
+        Load instructions of the class's methods, and set them to the methods.
+        """
+        with self.lock:
+            row = self.connection.execute('SELECT data FROM classes WHERE cid = ?', (cid,)).fetchone()
+            instructions = pickle.loads(self.decompress(row[0]))
+
+            for method, data in instructions.items():
+                self.app.cids[cid].methods[method].instructions = data
+
+        return instructions
+
+    @staticmethod
+    def load(path):
+        """
+        Load the app code from the project store.
+        """
+        return ProjectStore(path).app
+
+    @staticmethod
+    def store(data, path, compression='zlib'):
+        """
+        Store the app code into a project store.
+
+        :param compression:  Compressor of records, either none, zlib, bz2, lzma, lz4, or zstd.
+                             lz4 and zstd require the lz4 and zstandard packages, respectively.
+        """
+        logger.debug(f'storing project store to {path = }, {compression = }')
+
+        if (compression not in compressors.keys()):
+            raise Exception(f'Compressor is not available, {compression = }')
+        compress = compressors[compression][0]
+
+        # The existing store is replaced after writing, because its classes might not be loaded yet
+        path = pathlib.Path(path)
+        tmp = path.with_name(path.name+'.tmp')
+        tmp.unlink(missing_ok=True)
+
+        connection = sqlite3.connect(tmp)
+        try:
+            with connection:
+                connection.execute('CREATE TABLE meta (key TEXT PRIMARY KEY, value)')
+                connection.execute('CREATE TABLE classes (cid INTEGER PRIMARY KEY, data BLOB)')
+
+                # Store a record per class.
+                # Instructions are referred to by the index with the class's cid and the method's name.
+                references = {}
+                for cid, clss in data.cids.items():
+                    # Load instructions remaining in the app's source store
+                    for mdata in clss.methods.values():
+                        if (isinstance(mdata.instructions, LazyInstructions)):
+                            mdata.instructions.load()
+
+                    instructions = {}
+                    for method, mdata in clss.methods.items():
+                        references[id(mdata.instructions)] = (cid, method)
+                        instructions[method] = mdata.instructions
+
+                    connection.execute('INSERT INTO classes VALUES (?, ?)',
+                                       (cid, compress(pickle.dumps(instructions, protocol=pickle.HIGHEST_PROTOCOL))))
+
+                # Store the index
+                index = io.BytesIO()
+                IndexPickler(index, references).dump(data)
+
+                connection.executemany('INSERT INTO meta VALUES (?, ?)',
+                                       [('version', ProjectStore.VERSION),
+                                        ('compression', compression),
+                                        ('app', compress(index.getvalue()))])
+        finally:
+            connection.close()
+
+        tmp.replace(path)
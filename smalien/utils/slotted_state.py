@@ -0,0 +1,78 @@
+import logging
+from dataclasses import fields, MISSING
+
+logger = logging.getLogger(name=__name__)
+
+
+class FieldNames(tuple):
+    """
+    Names of a slotted dataclass's fields, pickled with the values of each instance.
+    A single object is shared by the instances of a class, so that a pickle stores it only once and refers to it afterward.
+    """
+    __slots__ = ()
+
+
+# Field names and defaults of each slotted dataclass, in the order of the fields
+field_specs = {}
+
+def get_field_specs(cls):
+    """
+    Return names of the given dataclass's fields, and a dictionary mapping each name to its default factory.
+    """
+    specs = field_specs.get(cls)
+    if (specs is None):
+        defaults = {}
+        for f in fields(cls):
+            if (f.default_factory is not MISSING):
+                defaults[f.name] = f.default_factory
+            elif (f.default is not MISSING):
+                defaults[f.name] = lambda default=f.default: default
+            else:
+                defaults[f.name] = None
+        specs = field_specs[cls] = (FieldNames(defaults.keys()), defaults)
+
+    return specs
+
+
+class SlottedState:
+    """
+    Base class of slotted dataclasses, pickling the values of their fields with the names of the fields.
+
+    The state is mapped to the fields by name when unpickled, so pickles remain loadable after fields are added,
+    removed, or reordered in any class of a hierarchy. Fields missing in a pickle are set to their defaults.
+    Pickles created before the dataclasses were slotted contain a dictionary of fields, and they are migrated in the same way.
+    """
+    __slots__ = ()
+
+    def __getstate__(self):
+        names, _ = get_field_specs(type(self))
+
+        return (names, tuple( getattr(self, name) for name in names ))
+
+    def __setstate__(self, state):
+        names, defaults = get_field_specs(type(self))
+
+        if (isinstance(state, tuple) and len(state) == 2 and isinstance(state[0], FieldNames)):
+            state_names, values = state
+
+            if (state_names == names):
+                for name, value in zip(names, values):
+                    object.__setattr__(self, name, value)
+                return
+
+            state = dict(zip(state_names, values))
+
+        elif (isinstance(state, tuple)):
+            # Positional values pickled without names, whose fields were in the current order
+            state = dict(zip(names, state))
+
+        # Migrate a pickle of another layout
+        for name, default in defaults.items():
+            if (name in state.keys()):
+                object.__setattr__(self, name, state[name])
+            elif (default is not None):
+                object.__setattr__(self, name, default())
+
+        removed = state.keys() - defaults.keys()
+        if (removed):
+            logger.debug(f'ignoring removed fields of {type(self).__name__}, {removed = }')
@@ -0,0 +1,130 @@
+import json
+import select
+import logging
+import subprocess
+
+logger = logging.getLogger(name=__name__)
+
+
+class ToolWorkerUnavailable(Exception):
+    """
+    Raised when a job cannot be run by the worker, so it must be run as a subprocess.
+    """
+
+
+class ToolWorker:
+    """
+    Client of the protocol of a long-lived process running tool commands, such as apktool, aapt, xml2axml, and signers.
+    A worker keeping a JVM saves starting a JVM for each command, but no such worker is shipped with smalien.
+    The client is used only if it is given to Project, ApkHandler, ManifestInjector, or BatchProcessor,
+    which pass it to CommandRunner.run. Commands are run as subprocesses if the worker is unavailable or does not support them.
+    The owner stops the worker, e.g., by using the client as a context manager.
+
+    The worker reads jobs from stdin and writes results to stdout, one JSON object per line:
+      - job:     {"id": <int>, "argv": [<command>, <arguments>...]}
+      - result:  {"id": <int>, "returncode": <int>, "output": <str>}
+                 {"id": <int>, "unsupported": true} if the worker does not run the command
+    The output contains both stdout and stderr of the command, as CommandRunner.run does.
+    smalien.utils.tool_worker_stub is a worker running each job as a subprocess, for testing the protocol.
+    It starts a process for each job as CommandRunner does, so it does not make commands faster.
+    """
+
+    def __init__(self, cmd, tools=None):
+        """
+        :param cmd:    Command starting the worker.
+        :param tools:  Command names run by the worker. If None, every command is sent to the worker.
+        """
+        logger.debug('initializing')
+
+        self.cmd = [ str(arg) for arg in cmd ]
+        self.tools = None if (tools is None) else set( str(tool) for tool in tools )
+
+        self.process = None
+        self.next_id = 0
+
+        # Set when the worker failed to start, so that later jobs are not delayed by retrying
+        self.broken = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def handles(self, cmd):
+        """
+        Return True if the command is sent to the worker.
+        """
+        return (not self.broken and (self.tools is None or str(cmd[0]) in self.tools))
+
+    def start(self):
+        """
+        Start the worker if not running.
+        """
+        if (self.process is not None and self.process.poll() is None):
+            return
+
+        logger.debug('starting tool worker')
+
+        try:
+            self.process = subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1)
+        except OSError as e:
+            self.broken = True
+            raise ToolWorkerUnavailable(f'failed to start the tool worker {self.cmd = }') from e
+
+    def stop(self):
+        """
+        Stop the worker. It exits when its stdin is closed.
+        """
+        if (self.process is None):
+            return
+
+        logger.debug('stopping tool worker')
+
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        self.process = None
+
+    def run(self, cmd, timeout=None):
+        """
+        Run the command on the worker, and return its output and return code.
+        """
+        self.start()
+
+        self.next_id += 1
+        job = {'id': self.next_id, 'argv': [ str(arg) for arg in cmd ]}
+
+        try:
+            self.process.stdin.write(json.dumps(job) + '\n')
+            self.process.stdin.flush()
+
+            if (timeout is not None):
+                ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+                if (not ready):
+                    # The worker is stuck in the job, so restart it at the next job
+                    self.process.kill()
+                    self.process.wait()
+                    self.process = None
+                    raise subprocess.TimeoutExpired(cmd, timeout, output=b'')
+
+            line = self.process.stdout.readline()
+        except (OSError, ValueError) as e:
+            self.process = None
+            raise ToolWorkerUnavailable('the tool worker exited') from e
+
+        if (not line):
+            self.process = None
+            raise ToolWorkerUnavailable('the tool worker exited')
+
+        result = json.loads(line)
+        if (result['id'] != job['id']):
+            self.stop()
+            raise ToolWorkerUnavailable(f'the tool worker returned an unexpected result {result["id"] = }, {job["id"] = }')
+        if (result.get('unsupported', False)):
+            raise ToolWorkerUnavailable(f'the tool worker does not support {cmd[0] = }')
+
+        return result['output'].encode('utf-8'), result['returncode']
@@ -0,0 +1,35 @@
+"""
+A tool worker running each job as a subprocess.
+It speaks the protocol of smalien.utils.tool_worker.ToolWorker without keeping a JVM, so it is for testing the protocol, not for speed.
+
+Usage: python -m smalien.utils.tool_worker_stub [--tools <command>...]
+"""
+import sys
+import json
+import argparse
+import subprocess
+
+
+def run_tool_worker_stub():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tools', nargs='*', default=None, help='Commands run by the worker. Others are unsupported.')
+    args = parser.parse_args()
+
+    for line in sys.stdin:
+        job = json.loads(line)
+
+        if (args.tools is not None and job['argv'][0] not in args.tools):
+            result = {'id': job['id'], 'unsupported': True}
+        else:
+            try:
+                completed = subprocess.run(job['argv'], stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+                result = {'id': job['id'], 'returncode': completed.returncode,
+                          'output': completed.stdout.decode('utf-8', errors='replace')}
+            except OSError as e:
+                result = {'id': job['id'], 'returncode': 127, 'output': repr(e)}
+
+        sys.stdout.write(json.dumps(result) + '\n')
+        sys.stdout.flush()
+
+if __name__ == '__main__':
+    run_tool_worker_stub()